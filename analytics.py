@@ -0,0 +1,518 @@
+# analytics.py
+"""
+Analitik penjualan offline atas riwayat transaksi.
+
+Setiap transaksi yang selesai (event Dispensed) disimpan sebagai satu baris di
+penyimpanan kolumnar: file .npz per chunk berisi kolom waktu, mesin, combo
+(multiset item, dikodekan sebagai id kamus), total, uang masuk, dan kembalian.
+Setiap chunk juga menyimpan ringkasan hariannya sendiri per (hari, combo), dan
+ringkasan gabungan dipadatkan ke satu file sesekali, sehingga kueri dasbor per
+hari tidak perlu membaca ulang data mentah dan menulis chunk tidak menulis ulang
+seluruh ringkasan. Aplikasi kiosk menulis lewat SalesWriter (thread latar
+belakang), bukan dari thread GUI.
+
+Contoh:
+    python analytics.py generate data/penjualan --days 90 --per-day 3000
+    python analytics.py report data/penjualan --start 2026-01-01 --end 2026-04-01
+"""
+
+import argparse
+import datetime
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+import numpy as np
+
+import events
+from cart import format_items
+from compiled_dfa import CompiledVendingMachineDFA
+from replay import generate_transactions
+
+CHUNK_SIZE = 65536
+# Ringkasan gabungan ditulis ulang ke rollup_daily.npz setelah sekian chunk baru
+COMPACT_EVERY = 32
+COLUMNS = ('ts', 'machine', 'combo', 'total', 'inserted', 'change')
+_DTYPES = {'ts': np.int64, 'machine': np.int32, 'combo': np.int32,
+           'total': np.int64, 'inserted': np.int64, 'change': np.int64}
+ROLLUP_COLUMNS = ('day', 'combo', 'count', 'revenue', 'inserted', 'change')
+_KEY_SHIFT = np.int64(1 << 32)
+
+
+def local_utc_offset():
+    """Selisih zona waktu lokal terhadap UTC (detik), untuk menentukan jam dan hari."""
+    return time.localtime().tm_gmtoff
+
+
+def _day_number(value):
+    """Nomor hari (hari sejak 1970-01-01 waktu lokal) dari date/'YYYY-MM-DD'/None."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.date.fromisoformat(value)
+    return (value - datetime.date(1970, 1, 1)).days
+
+
+def _group_sum(keys, *weights):
+    """Group-by vektor: kunci unik beserta jumlah tiap kolom bobot (dan jumlah baris)."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    sums = [np.bincount(inverse, weights=w, minlength=len(unique)).astype(np.int64) for w in weights]
+    counts = np.bincount(inverse, minlength=len(unique)).astype(np.int64)
+    return unique, counts, sums
+
+
+class SalesStore:
+    """
+    Penyimpanan kolumnar di satu direktori:
+        meta.json              kamus combo dan mesin, daftar chunk (jumlah baris, ts min/maks)
+        chunk-000001.npz ...   kolom data mentah, ditambah ringkasan chunk itu sendiri (kolom r_*)
+        rollup_daily.npz       ringkasan per (hari, combo) untuk N chunk pertama, beserta N
+    Baris ditampung di memori dan ditulis sebagai chunk saat buffer berisi
+    chunk_size baris, saat baris tertua sudah menunggu max_age detik (jika
+    diisi), atau saat flush().
+
+    flush() hanya menulis chunk baru dan meta.json; ringkasan chunk itu ikut di
+    file chunk. Ringkasan gabungan = rollup_daily.npz + ringkasan chunk sesudah N,
+    dan dipadatkan kembali ke rollup_daily.npz setiap COMPACT_EVERY chunk. meta.json
+    hanya menyebut chunk yang sudah ada di disk; rollup_daily.npz yang mencakup
+    lebih banyak chunk dari meta (atau file lama) dibangun ulang dari chunk.
+    """
+
+    def __init__(self, directory, chunk_size=CHUNK_SIZE, utc_offset=None, max_age=None):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.max_age = max_age
+        self.utc_offset = local_utc_offset() if utc_offset is None else utc_offset
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as f:
+                meta = json.load(f)
+        else:
+            meta = {'combos': [], 'machines': [], 'chunks': [], 'utc_offset': self.utc_offset}
+        self.utc_offset = meta.get('utc_offset', self.utc_offset)
+        self.combos = [tuple((name, count) for name, count in combo) for combo in meta['combos']]
+        self.machines = list(meta['machines'])
+        self.chunks = list(meta['chunks'])
+        self._combo_ids = {combo: i for i, combo in enumerate(self.combos)}
+        self._machine_ids = {name: i for i, name in enumerate(self.machines)}
+        self._buffer = {name: [] for name in COLUMNS}
+        self._buffer_started = None  # time.monotonic() saat baris tertua di buffer ditambahkan
+        self._rollup = None
+        self._compacted = 0  # jumlah chunk yang tercakup rollup_daily.npz
+        self._pending_parts = []  # ringkasan chunk baru yang belum digabung ke self._rollup
+
+    # --- Penulisan ---
+
+    def combo_id(self, items):
+        combo = tuple(sorted((name, int(count)) for name, count in items))
+        combo_id = self._combo_ids.get(combo)
+        if combo_id is None:
+            combo_id = self._combo_ids[combo] = len(self.combos)
+            self.combos.append(combo)
+        return combo_id
+
+    def append(self, items, total, inserted, change, timestamp=None, machine=None):
+        """Menambahkan satu transaksi; `items` berupa pasangan (nama produk, jumlah)."""
+        machine_id = -1
+        if machine is not None:
+            machine_id = self._machine_ids.get(machine)
+            if machine_id is None:
+                machine_id = self._machine_ids[machine] = len(self.machines)
+                self.machines.append(machine)
+        buffer = self._buffer
+        if not buffer['ts']:
+            self._buffer_started = time.monotonic()
+        buffer['ts'].append(int(time.time() if timestamp is None else timestamp))
+        buffer['machine'].append(machine_id)
+        buffer['combo'].append(self.combo_id(items))
+        buffer['total'].append(total)
+        buffer['inserted'].append(inserted)
+        buffer['change'].append(change)
+        if len(buffer['ts']) >= self.chunk_size or self.expired():
+            self.flush()
+
+    def expired(self):
+        """True jika baris tertua di buffer sudah menunggu lebih dari max_age detik."""
+        return (self.max_age is not None and self._buffer_started is not None
+                and time.monotonic() - self._buffer_started >= self.max_age)
+
+    def record(self, event, timestamp=None, machine=None):
+        """Menambahkan transaksi dari event Dispensed."""
+        self.append(event.items, event.total, event.inserted, event.change, timestamp, machine)
+
+    def flush(self):
+        """Menulis baris yang masih di buffer sebagai chunk baru beserta ringkasan hariannya."""
+        if not self._buffer['ts']:
+            return
+        columns = {name: np.asarray(values, dtype=_DTYPES[name]) for name, values in self._buffer.items()}
+        self._buffer = {name: [] for name in COLUMNS}
+        self._buffer_started = None
+        part = self._merge_rollup(self._empty_rollup(), columns)
+        name = f"chunk-{len(self.chunks) + 1:06d}.npz"
+        self._atomic_savez(name, dict(columns, **{'r_' + key: values for key, values in part.items()}))
+        self.chunks.append({'file': name, 'rows': int(len(columns['ts'])),
+                            'ts_min': int(columns['ts'].min()), 'ts_max': int(columns['ts'].max())})
+        self._write_meta()
+        if self._rollup is not None:
+            self._pending_parts.append(part)
+            if len(self.chunks) - self._compacted >= COMPACT_EVERY:
+                self.rollup()
+        elif len(self.chunks) % COMPACT_EVERY == 0:
+            # Ringkasan belum pernah dimuat di proses ini: dimuat sekali agar pemadatan tetap berjalan
+            self.rollup()
+
+    def _atomic_savez(self, name, arrays):
+        path = os.path.join(self.directory, name)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self):
+        meta = {'combos': [list(map(list, combo)) for combo in self.combos], 'machines': self.machines,
+                'chunks': self.chunks, 'utc_offset': self.utc_offset}
+        path = os.path.join(self.directory, 'meta.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
+
+    # --- Ringkasan harian ---
+
+    def _day(self, ts):
+        return (ts + self.utc_offset) // 86400
+
+    def _merge_rollup(self, rollup, columns):
+        """Ringkasan `rollup` ditambah baris `columns` (belum ditulis ke disk)."""
+        day = self._day(columns['ts'])
+        keys = day * _KEY_SHIFT + columns['combo']
+
+        if len(rollup['day']):
+            old_keys = rollup['day'].astype(np.int64) * _KEY_SHIFT + rollup['combo']
+            keys = np.concatenate([old_keys, keys])
+            counts_in = np.concatenate([rollup['count'], np.ones(len(day), dtype=np.int64)])
+            revenue = np.concatenate([rollup['revenue'], columns['total']])
+            inserted = np.concatenate([rollup['inserted'], columns['inserted']])
+            change = np.concatenate([rollup['change'], columns['change']])
+        else:
+            counts_in = np.ones(len(day), dtype=np.int64)
+            revenue, inserted, change = columns['total'], columns['inserted'], columns['change']
+
+        unique, _, (count, revenue, inserted, change) = _group_sum(keys, counts_in, revenue, inserted, change)
+        return {
+            'day': (unique // _KEY_SHIFT).astype(np.int32),
+            'combo': (unique % _KEY_SHIFT).astype(np.int32),
+            'count': count, 'revenue': revenue, 'inserted': inserted, 'change': change,
+        }
+
+    def _merge_parts(self, parts):
+        """Menggabungkan beberapa ringkasan (hari, combo) menjadi satu dengan satu group-by."""
+        parts = [part for part in parts if len(part['day'])]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return self._empty_rollup()
+        keys = np.concatenate([part['day'].astype(np.int64) * _KEY_SHIFT + part['combo'] for part in parts])
+        unique, _, sums = _group_sum(keys, *(np.concatenate([part[name] for part in parts])
+                                             for name in ('count', 'revenue', 'inserted', 'change')))
+        return dict(zip(ROLLUP_COLUMNS, [(unique // _KEY_SHIFT).astype(np.int32),
+                                         (unique % _KEY_SHIFT).astype(np.int32), *sums]))
+
+    def _chunk_rollup(self, chunk):
+        """Ringkasan satu chunk dari kolom r_*; chunk lama tanpa kolom itu dirangkum dari data mentah."""
+        with np.load(os.path.join(self.directory, chunk['file'])) as data:
+            if 'r_day' in data:
+                return {name: data['r_' + name] for name in ROLLUP_COLUMNS}
+            columns = {name: data[name] for name in ('ts', 'combo', 'total', 'inserted', 'change')}
+        return self._merge_rollup(self._empty_rollup(), columns)
+
+    def _save_rollup(self, rollup):
+        """Memadatkan ringkasan semua chunk terdaftar ke rollup_daily.npz."""
+        self._rollup = rollup
+        self._compacted = len(self.chunks)
+        self._atomic_savez('rollup_daily.npz', dict(rollup, chunks=np.int64(self._compacted)))
+
+    def _empty_rollup(self):
+        return {name: np.zeros(0, dtype=np.int64) for name in ROLLUP_COLUMNS}
+
+    def rollup(self):
+        """Ringkasan per (hari, combo): kolom day, combo, count, revenue, inserted, change."""
+        if self._rollup is None:
+            path = os.path.join(self.directory, 'rollup_daily.npz')
+            rollup, covered = self._empty_rollup(), 0
+            if os.path.exists(path):
+                with np.load(path) as data:
+                    rollup = {name: data[name] for name in ROLLUP_COLUMNS}
+                    covered = int(data['chunks']) if 'chunks' in data else -1
+            if not 0 <= covered <= len(self.chunks):
+                # Ringkasan dari penyimpanan lain atau format lama: dihitung ulang dari semua chunk
+                rollup, covered = self._empty_rollup(), -1
+            self._compacted = covered
+            self._rollup = rollup
+            self._pending_parts = [self._chunk_rollup(chunk) for chunk in self.chunks[max(covered, 0):]]
+        if self._pending_parts:
+            self._rollup = self._merge_parts([self._rollup] + self._pending_parts)
+            self._pending_parts = []
+        if self._compacted < 0 or len(self.chunks) - self._compacted >= COMPACT_EVERY:
+            self._save_rollup(self._rollup)
+        return self._rollup
+
+    # --- Pembacaan data mentah ---
+
+    def scan(self, columns=COLUMNS, start=None, end=None):
+        """
+        Kolom data mentah untuk hari [start, end) digabung dari semua chunk yang
+        relevan; chunk di luar rentang waktu dilewati tanpa dibaca.
+        """
+        start_day, end_day = _day_number(start), _day_number(end)
+        ts_min = None if start_day is None else start_day * 86400 - self.utc_offset
+        ts_max = None if end_day is None else end_day * 86400 - self.utc_offset
+        wanted = set(columns) | {'ts'}
+        parts = {name: [] for name in wanted}
+        for chunk in self.chunks:
+            if ts_min is not None and chunk['ts_max'] < ts_min:
+                continue
+            if ts_max is not None and chunk['ts_min'] >= ts_max:
+                continue
+            with np.load(os.path.join(self.directory, chunk['file'])) as data:
+                arrays = {name: data[name] for name in wanted}
+            mask = None
+            if ts_min is not None:
+                mask = arrays['ts'] >= ts_min
+            if ts_max is not None:
+                upper = arrays['ts'] < ts_max
+                mask = upper if mask is None else mask & upper
+            for name in wanted:
+                parts[name].append(arrays[name] if mask is None else arrays[name][mask])
+        if self._buffer['ts']:
+            pending = {name: np.asarray(self._buffer[name], dtype=_DTYPES[name]) for name in wanted}
+            mask = np.ones(len(pending['ts']), dtype=bool)
+            if ts_min is not None:
+                mask &= pending['ts'] >= ts_min
+            if ts_max is not None:
+                mask &= pending['ts'] < ts_max
+            for name in wanted:
+                parts[name].append(pending[name][mask])
+        return {name: np.concatenate(parts[name]) if parts[name] else np.zeros(0, dtype=_DTYPES[name])
+                for name in columns}
+
+    def rows(self):
+        return sum(chunk['rows'] for chunk in self.chunks) + len(self._buffer['ts'])
+
+
+class SalesWriter:
+    """
+    Penulis SalesStore di thread latar belakang: record() hanya memasukkan event ke
+    antrian (aman dipanggil dari thread mana pun, mis. thread controller), lalu thread
+    penulis menampung baris dan menulis chunk saat buffer penuh atau baris tertua
+    sudah menunggu max_age detik. Hanya thread penulis yang menyentuh `store`
+    sampai close() selesai.
+
+    Imbal baliknya ketahanan: penjualan yang masih di buffer (paling banyak
+    chunk_size baris atau max_age detik) hilang jika proses crash, sedangkan
+    close() menulis semuanya.
+    """
+
+    def __init__(self, store, poll_interval=60.0):
+        self.store = store
+        self.poll_interval = poll_interval
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="sales-writer", daemon=True)
+        self._worker.start()
+
+    def record(self, event, timestamp=None, machine=None):
+        """Mencatat event Dispensed tanpa memblokir; waktu diambil saat dipanggil."""
+        self._queue.put((event, time.time() if timestamp is None else timestamp, machine))
+
+    def _run(self):
+        store = self.store
+        while True:
+            try:
+                item = self._queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                item = ()
+            try:
+                if item is None:
+                    store.flush()
+                    return
+                if item:
+                    event, timestamp, machine = item
+                    store.record(event, timestamp=timestamp, machine=machine)
+                elif store.expired():
+                    store.flush()
+            except OSError as e:
+                print(f"Error writing sales data: {e}")
+
+    def close(self, timeout=10.0):
+        """Menulis sisa buffer lalu menghentikan thread. Mengembalikan False jika tidak selesai tepat waktu."""
+        self._queue.put(None)
+        self._worker.join(timeout)
+        return not self._worker.is_alive()
+
+
+# --- Kueri ---
+
+def _rollup_range(store, start, end):
+    rollup = store.rollup()
+    mask = np.ones(len(rollup['day']), dtype=bool)
+    start_day, end_day = _day_number(start), _day_number(end)
+    if start_day is not None:
+        mask &= rollup['day'] >= start_day
+    if end_day is not None:
+        mask &= rollup['day'] < end_day
+    return {name: values[mask] for name, values in rollup.items()}
+
+
+def top_combos(store, start=None, end=None, limit=10):
+    """Combo terlaris dari ringkasan harian: list (teks combo, jumlah, pendapatan)."""
+    rollup = _rollup_range(store, start, end)
+    combos, _, (count, revenue) = _group_sum(rollup['combo'], rollup['count'], rollup['revenue'])
+    order = np.argsort(-count, kind='stable')[:limit]
+    return [(format_items(store.combos[combos[i]]), int(count[i]), int(revenue[i])) for i in order]
+
+
+def product_units(store, start=None, end=None):
+    """Jumlah unit terjual per produk: jumlah per combo x matriks isi combo."""
+    rollup = _rollup_range(store, start, end)
+    combos, _, (count,) = _group_sum(rollup['combo'], rollup['count'])
+    names = sorted({name for combo in store.combos for name, _ in combo})
+    index = {name: i for i, name in enumerate(names)}
+    matrix = np.zeros((len(store.combos), len(names)), dtype=np.int64)
+    for combo_id, combo in enumerate(store.combos):
+        for name, units in combo:
+            matrix[combo_id, index[name]] = units
+    units = count @ matrix[combos] if len(combos) else np.zeros(len(names), dtype=np.int64)
+    return dict(zip(names, (int(u) for u in units)))
+
+
+def daily_totals(store, start=None, end=None):
+    """Per hari: (tanggal, transaksi, pendapatan, kembalian dibayar) dari ringkasan harian."""
+    rollup = _rollup_range(store, start, end)
+    days, _, (count, revenue, change) = _group_sum(rollup['day'], rollup['count'], rollup['revenue'], rollup['change'])
+    epoch = datetime.date(1970, 1, 1)
+    return [((epoch + datetime.timedelta(days=int(d))).isoformat(), int(c), int(r), int(ch))
+            for d, c, r, ch in zip(days, count, revenue, change)]
+
+
+def change_summary(store, start=None, end=None):
+    """Total dan rata-rata kembalian, serta porsi transaksi yang mendapat kembalian (data mentah)."""
+    data = store.scan(('change',), start, end)
+    change = data['change']
+    if not len(change):
+        return {'transactions': 0, 'change_total': 0, 'change_mean': 0.0, 'with_change_ratio': 0.0}
+    return {
+        'transactions': int(len(change)),
+        'change_total': int(change.sum()),
+        'change_mean': round(float(change.mean()), 1),
+        'with_change_ratio': round(float((change > 0).mean()), 4),
+    }
+
+
+def hourly_sales(store, start=None, end=None):
+    """Jumlah transaksi, pendapatan dan kembalian per jam (0-23, waktu lokal toko)."""
+    data = store.scan(('ts', 'total', 'change'), start, end)
+    hour = ((data['ts'] + store.utc_offset) // 3600) % 24
+    return {
+        'count': np.bincount(hour, minlength=24).astype(np.int64).tolist(),
+        'revenue': np.bincount(hour, weights=data['total'], minlength=24).astype(np.int64).tolist(),
+        'change': np.bincount(hour, weights=data['change'], minlength=24).astype(np.int64).tolist(),
+    }
+
+
+def combo_hours(store, start=None, end=None, limit=5):
+    """Untuk combo terlaris: jumlah transaksi per jam, sebagai list (teks combo, [24 angka])."""
+    data = store.scan(('ts', 'combo'), start, end)
+    hour = ((data['ts'] + store.utc_offset) // 3600) % 24
+    combos, counts, _ = _group_sum(data['combo'])
+    top = combos[np.argsort(-counts, kind='stable')[:limit]]
+    result = []
+    for combo_id in top:
+        mask = data['combo'] == combo_id
+        result.append((format_items(store.combos[combo_id]), np.bincount(hour[mask], minlength=24).tolist()))
+    return result
+
+
+# --- CLI ---
+
+def generate(directory, days, per_day, seed=0, start='2026-01-01', chunk_size=CHUNK_SIZE):
+    """Mengisi penyimpanan dengan transaksi sintetis hasil replay lewat DFA."""
+    rng = random.Random(seed)
+    store = SalesStore(directory, chunk_size=chunk_size, utc_offset=0)
+    dfa = CompiledVendingMachineDFA()
+    first_day = _day_number(start)
+    target = days * per_day
+    written = rounds = 0
+    while written < target:
+        # Sebagian transaksi sintetis tidak selesai (batal atau uang kurang), jadi transaksi
+        # dibangkitkan per putaran (seed turunan) sampai tepat `target` penjualan tertulis
+        for machine, symbols in generate_transactions(2 * (target - written), seed + rounds * 1000003):
+            dfa.reset()
+            for symbol in symbols:
+                dfa.step(symbol)
+            event = dfa.finish()
+            if not isinstance(event, events.Dispensed):
+                continue
+            # per_day penjualan per hari, berurutan dari hari pertama sampai hari terakhir
+            day = first_day + written // per_day
+            # Jam ramai siang dan sore
+            hour = min(23, max(8, int(rng.gauss(15, 3))))
+            ts = day * 86400 + hour * 3600 + rng.randrange(3600)
+            store.record(event, timestamp=ts, machine=machine)
+            written += 1
+            if written == target:
+                break
+        rounds += 1
+    store.flush()
+    return store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analitik penjualan kolumnar untuk vending machine.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help="Mengisi penyimpanan dengan data sintetis.")
+    gen.add_argument('directory')
+    gen.add_argument('--days', type=int, default=30)
+    gen.add_argument('--per-day', type=int, default=2000)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('--start', default='2026-01-01')
+
+    report = sub.add_parser('report', help="Ringkasan penjualan.")
+    report.add_argument('directory')
+    report.add_argument('--start')
+    report.add_argument('--end')
+    report.add_argument('--limit', type=int, default=10)
+
+    args = parser.parse_args(argv)
+    if args.command == 'generate':
+        started = time.perf_counter()
+        store = generate(args.directory, args.days, args.per_day, args.seed, args.start)
+        print(f"{store.rows()} transaksi ditulis dalam {time.perf_counter() - started:.2f} dtk.")
+        return
+
+    store = SalesStore(args.directory)
+    timings = {}
+
+    def timed(name, func, *func_args, **kwargs):
+        started = time.perf_counter()
+        result = func(store, *func_args, **kwargs)
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    results = {
+        'rows': store.rows(),
+        'top_combos': timed('top_combos', top_combos, args.start, args.end, args.limit),
+        'product_units': timed('product_units', product_units, args.start, args.end),
+        'change': timed('change_summary', change_summary, args.start, args.end),
+        'hourly': timed('hourly_sales', hourly_sales, args.start, args.end),
+        'combo_hours': timed('combo_hours', combo_hours, args.start, args.end, 3),
+        'daily': timed('daily_totals', daily_totals, args.start, args.end)[-7:],
+    }
+    results['query_ms'] = timings
+    print(json.dumps(results, indent=1))
+
+
+if __name__ == "__main__":
+    main()
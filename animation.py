@@ -0,0 +1,117 @@
+# animation.py
+
+import time
+from collections import deque
+
+
+class Tween:
+    """Pergerakan satu item canvas dari y0 ke y1 (berbasis waktu, bukan jumlah langkah)."""
+    __slots__ = ('item', 'x', 'y0', 'y1', 'width', 'height', 'start', 'duration', 'on_done')
+
+    def __init__(self, item, x, y0, y1, width, height, start, duration, on_done):
+        self.item = item
+        self.x = x
+        self.y0 = y0
+        self.y1 = y1
+        self.width = width
+        self.height = height
+        self.start = start
+        self.duration = duration
+        self.on_done = on_done
+
+
+class AnimationScheduler:
+    """
+    Penjadwal animasi untuk satu canvas: satu tick dengan laju tetap memproses
+    semua tween aktif sekaligus, dan item canvas (oval) dipakai ulang dari pool
+    antar transaksi alih-alih dibuat baru setiap kali.
+    """
+
+    def __init__(self, widget, canvas, fps=60):
+        self.widget = widget  # widget Tk untuk after()
+        self.canvas = canvas
+        self.interval_ms = max(1, int(1000 / fps))
+        self.active = deque()
+        self.timers = deque()  # (waktu, callback)
+        self.frame_times = deque(maxlen=240)  # durasi pemrosesan per frame (detik)
+        self.frame_observer = None  # callback(durasi) opsional, mis. histogram metrik
+        # Jam animasi (detik); bisa diganti jam yang dipercepat, mis. oleh soak.py
+        self.clock = time.perf_counter
+        self._job = None
+        self._free = []
+        self._used = []
+
+    def acquire(self, color):
+        """Mengambil oval dari pool (atau membuat baru) dengan warna `color`."""
+        if self._free:
+            item = self._free.pop()
+            self.canvas.itemconfigure(item, fill=color, outline=color, state="normal")
+        else:
+            item = self.canvas.create_oval(0, 0, 0, 0, fill=color, outline=color, tags=("pooled",))
+        self._used.append(item)
+        return item
+
+    def release_all(self):
+        """Menyembunyikan semua oval yang dipakai dan mengembalikannya ke pool."""
+        self.active.clear()
+        self.timers.clear()
+        for item in self._used:
+            self.canvas.itemconfigure(item, state="hidden")
+        self._free.extend(self._used)
+        self._used = []
+
+    def move(self, item, x, y0, y1, width, height, duration, delay=0.0, on_done=None):
+        """Menggerakkan item dari (x, y0) ke (x, y1) dalam `duration` detik setelah `delay` detik."""
+        start = self.clock() + delay
+        self.canvas.coords(item, x, y0, x + width, y0 + height)
+        self.active.append(Tween(item, x, y0, y1, width, height, start, duration, on_done))
+        self._ensure_running()
+
+    def call_later(self, delay, callback):
+        """Menjalankan callback setelah `delay` detik memakai tick yang sama."""
+        self.timers.append((self.clock() + delay, callback))
+        self._ensure_running()
+
+    def _ensure_running(self):
+        if self._job is None:
+            self._job = self.widget.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self._job = None
+        frame_start = time.perf_counter()
+        now = self.clock()
+        coords = self.canvas.coords
+        finished = []
+
+        still_active = deque()
+        for tween in self.active:
+            t = (now - tween.start) / tween.duration if tween.duration > 0 else 1.0
+            if t <= 0:
+                still_active.append(tween)
+                continue
+            if t >= 1:
+                t = 1.0
+                finished.append(tween)
+            else:
+                still_active.append(tween)
+            # Percepatan seperti jatuh bebas (ease-in)
+            y = tween.y0 + (tween.y1 - tween.y0) * t * t
+            coords(tween.item, tween.x, y, tween.x + tween.width, y + tween.height)
+        self.active = still_active
+
+        due = [callback for when, callback in self.timers if when <= now]
+        if due:
+            self.timers = deque((when, callback) for when, callback in self.timers if when > now)
+
+        for tween in finished:
+            if tween.on_done is not None:
+                tween.on_done()
+        for callback in due:
+            callback()
+
+        frame_time = time.perf_counter() - frame_start
+        self.frame_times.append(frame_time)
+        if self.frame_observer is not None:
+            self.frame_observer(frame_time)
+        if self.active or self.timers:
+            self._ensure_running()
@@ -0,0 +1,137 @@
+# assets.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import customtkinter as ctk
+from PIL import Image
+
+
+class AssetManager:
+    """
+    Memuat gambar secara lazy (saat pertama dipakai) dengan cache di disk berupa
+    PNG yang sudah diskalakan ke ukuran piksel CTkImage (ukuran x skala widget),
+    dikunci dengan hash path lengkap dan mtime file asli. Entri lama dari file
+    asli yang sama dihapus saat versi barunya ditulis. Gambar yang belum
+    dibutuhkan bisa di-prefetch di thread latar belakang.
+
+    Gambar di memori (PIL dan CTkImage) disimpan dalam LRU berukuran `max_images`
+    per jenis (None = tanpa batas), sehingga katalog besar yang di-scroll tidak
+    menumpuk semua gambar; gambar yang dibuang dimuat lagi dari cache disk saat
+    dibutuhkan.
+    """
+
+    def __init__(self, cache_dir=".asset_cache", widget=None, max_images=64):
+        self.cache_dir = cache_dir
+        self.widget = widget  # sumber skala DPI; None = skala 1
+        self.max_images = max_images
+        self.timings = {}  # path@ukuran -> detik yang dibutuhkan untuk memuat
+        self._scaled = OrderedDict()  # (path, ukuran) -> PIL.Image yang sudah diskalakan, urutan LRU
+        self._ctk_images = OrderedDict()  # (path, ukuran logis) -> CTkImage, urutan LRU (thread GUI)
+        self.stats = {'hits': 0, 'loads': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._prefetch_thread = None
+
+    def _pixel_size(self, size):
+        """Ukuran piksel yang akan digambar CTkImage untuk ukuran logis `size`."""
+        if self.widget is None:
+            return size
+        scaling = ctk.ScalingTracker.get_widget_scaling(self.widget)
+        return round(size[0] * scaling), round(size[1] * scaling)
+
+    def _source_key(self, path):
+        return hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:20]
+
+    def _cache_path(self, path, size):
+        mtime = os.stat(path).st_mtime_ns
+        return os.path.join(self.cache_dir, f"{self._source_key(path)}_{size[0]}x{size[1]}_{mtime}.png")
+
+    def _prune(self, path, cache_path):
+        """Menghapus entri cache milik file asli yang sama dengan mtime berbeda (versi lama)."""
+        prefix = self._source_key(path) + "_"
+        current_mtime = cache_path[cache_path.rindex("_"):]
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith(".png") \
+                            and not entry.name.endswith(current_mtime):
+                        os.remove(entry.path)
+        except OSError as e:
+            print(f"Error pruning asset cache for {path}: {e}")
+
+    def _load_scaled(self, path, size):
+        """Membaca gambar berukuran piksel `size` dari cache disk, atau membuat dan menyimpannya."""
+        key = (path, size)
+        with self._lock:
+            image = self._scaled.get(key)
+            if image is not None:
+                self._scaled.move_to_end(key)
+        if image is not None:
+            return image
+
+        start = time.perf_counter()
+        cache_path = self._cache_path(path, size)
+        if os.path.exists(cache_path):
+            image = Image.open(cache_path)
+            image.load()
+        else:
+            with Image.open(path) as original:
+                image = original.convert("RGBA").resize(size, Image.LANCZOS)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Tulis ke file sementara dulu agar cache tidak pernah berisi file setengah jadi
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            image.save(tmp_path, format="PNG")
+            os.replace(tmp_path, cache_path)
+            self._prune(path, cache_path)
+
+        with self._lock:
+            image = self._scaled.setdefault(key, image)
+            self._evict(self._scaled)
+            self.timings.setdefault(f"{path}@{size[0]}x{size[1]}", time.perf_counter() - start)
+            return image
+
+    def _evict(self, cache):
+        """Membuang entri yang paling lama tidak dipakai sampai `cache` muat dalam max_images."""
+        while self.max_images is not None and len(cache) > self.max_images:
+            cache.popitem(last=False)
+            self.stats['evicted'] += 1
+
+    def image(self, path, size):
+        """CTkImage untuk `path` pada ukuran `size`; dimuat saat pertama kali diminta."""
+        key = (path, size)
+        ctk_image = self._ctk_images.get(key)
+        if ctk_image is None:
+            # Sumber sudah seukuran piksel tujuan, jadi CTkImage tidak perlu memperbesarnya lagi
+            ctk_image = ctk.CTkImage(self._load_scaled(path, self._pixel_size(size)), size=size)
+            self._ctk_images[key] = ctk_image
+            with self._lock:
+                self.stats['loads'] += 1
+                self._evict(self._ctk_images)
+        else:
+            self._ctk_images.move_to_end(key)
+            self.stats['hits'] += 1
+        return ctk_image
+
+    def prefetch(self, requests):
+        """Memuat daftar (path, ukuran) di thread latar belakang tanpa memblokir GUI."""
+        # Skala dibaca di thread pemanggil (GUI), bukan di thread latar belakang
+        requests = [(path, self._pixel_size(size)) for path, size in requests]
+
+        def run():
+            for path, size in requests:
+                try:
+                    self._load_scaled(path, size)
+                except Exception as e:
+                    print(f"Error prefetching asset {path}: {e}")
+
+        self._prefetch_thread = threading.Thread(target=run, name="asset-prefetch", daemon=True)
+        self._prefetch_thread.start()
+
+    def report(self):
+        """Ringkasan waktu muat per aset (paling lama di atas)."""
+        with self._lock:
+            timings = sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
+        return "\n".join(f"  {seconds * 1000:7.1f} ms  {name}" for name, seconds in timings)
@@ -0,0 +1,82 @@
+# audio.py
+
+import queue
+import threading
+import time
+
+import simpleaudio as sa
+
+
+class AudioEngine:
+    """
+    Pemutar suara bersama: satu thread pekerja yang hidup selama aplikasi berjalan,
+    antrian perintah berukuran terbatas, dan WaveObject yang sudah didekode sekali.
+    Permintaan yang terlalu rapat untuk suara yang sama digabung (dibuang), begitu
+    pula permintaan saat antrian penuh.
+    """
+
+    def __init__(self, sounds, queue_size=8, min_interval=0.05, max_voices=4):
+        self.sounds = dict(sounds)
+        # Jarak minimum antar pemutaran per suara (detik); bisa berupa angka atau dict per nama
+        self.min_interval = min_interval
+        self.max_voices = max_voices
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._last_request = {}
+        self._voices = []
+        self.stats = {'requested': 0, 'played': 0, 'coalesced': 0, 'dropped_full': 0, 'max_depth': 0}
+        self._worker = threading.Thread(target=self._run, name="audio-engine", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def from_files(cls, paths, **kwargs):
+        """Mendekode semua file WAV sekali di awal: {nama: path}."""
+        return cls({name: sa.WaveObject.from_wave_file(path) for name, path in paths.items()}, **kwargs)
+
+    def _interval_for(self, name):
+        if isinstance(self.min_interval, dict):
+            return self.min_interval.get(name, 0)
+        return self.min_interval
+
+    def play(self, name):
+        """Meminta suara `name` diputar tanpa memblokir pemanggil. Mengembalikan False jika dibuang."""
+        if name not in self.sounds:
+            return False
+        self.stats['requested'] += 1
+        now = time.monotonic()
+        last = self._last_request.get(name)
+        if last is not None and now - last < self._interval_for(name):
+            self.stats['coalesced'] += 1
+            return False
+        try:
+            self._queue.put_nowait(name)
+        except queue.Full:
+            self.stats['dropped_full'] += 1
+            return False
+        self._last_request[name] = now
+        self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        return True
+
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            name = self._queue.get()
+            if name is None:
+                break
+            # Batasi jumlah suara yang tumpang tindih: hentikan yang paling lama
+            self._voices = [voice for voice in self._voices if voice.is_playing()]
+            while len(self._voices) >= self.max_voices:
+                self._voices.pop(0).stop()
+            try:
+                self._voices.append(self.sounds[name].play())
+                self.stats['played'] += 1
+            except Exception as e:
+                print(f"Error playing sound '{name}': {e}")
+
+    def close(self):
+        """Menghentikan thread pekerja dan semua suara yang sedang diputar."""
+        self._queue.put(None)
+        self._worker.join(timeout=1)
+        for voice in self._voices:
+            voice.stop()
@@ -0,0 +1,278 @@
+# audit_replay.py
+"""
+Audit harian: memutar ulang log transaksi lewat VendingMachineDFA di beberapa
+proses sekaligus dan merangkum pendapatan per produk, tingkat pembatalan, dan
+kekurangan kembalian.
+
+Proses utama hanya membaca log secara streaming dan membagi record mentah ke
+worker berdasarkan mesin (crc32 nama mesin), sehingga parsing JSON dan
+eksekusi DFA berjalan paralel dan urutan transaksi per mesin tetap terjaga.
+
+Record JSONL boleh berisi field opsional "collected" (uang yang benar-benar
+tercatat masuk untuk transaksi tersebut) untuk dicocokkan dengan hasil DFA.
+Record yang rusak dilewati dan dihitung di `malformed`; worker yang mati
+membuat audit gagal dengan pesan, bukan menggantung.
+
+Contoh:
+    python audit_replay.py transaksi.jsonl --workers 8
+    python audit_replay.py --generate 200000 --workers 4
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import re
+import sys
+import tempfile
+import time
+import zlib
+
+import events
+from change_maker import make_change
+from compiled_dfa import CompiledVendingMachineDFA
+from replay import generate_transactions, iter_binary_records, read_binary_table, write_jsonl
+
+CHUNK_SIZE = 1000  # record per pesan antar proses
+QUEUE_CHUNKS = 4   # chunk yang boleh menunggu per worker (batas memori)
+POLL_SECONDS = 1.0  # interval memeriksa apakah worker masih hidup saat menunggu antrean
+
+# Ekstraksi nama mesin tanpa json.loads penuh di proses utama
+_MACHINE_RE = re.compile(r'"machine"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def empty_totals():
+    return {
+        'transactions': 0,
+        'completed': 0,
+        'cancelled': 0,
+        'incomplete': 0,
+        'revenue': 0,
+        'revenue_by_product': {},
+        'items_by_product': {},
+        'change_paid': 0,
+        'change_shortfall': 0,
+        'shortfall_transactions': 0,
+        'collected_checked': 0,
+        'collected_discrepancy': 0,
+        'mismatched_transactions': 0,
+        'malformed': 0,
+    }
+
+
+def merge_totals(total, part):
+    """Menggabungkan hasil satu worker ke `total` (in-place)."""
+    for key, value in part.items():
+        if isinstance(value, dict):
+            bucket = total[key]
+            for name, amount in value.items():
+                bucket[name] = bucket.get(name, 0) + amount
+        else:
+            total[key] += value
+    return total
+
+
+class _Auditor:
+    """Satu DFA yang dipakai ulang (reset per transaksi) beserta akumulatornya."""
+
+    def __init__(self):
+        self.dfa = CompiledVendingMachineDFA()
+        self.prices = self.dfa.menu_prices
+        self.denominations = sorted(s for s in self.dfa.alphabet if isinstance(s, int))
+        self.totals = empty_totals()
+
+    def audit(self, symbols, collected=None):
+        dfa = self.dfa
+        step = dfa.step
+        totals = self.totals
+        dfa.reset()
+        expected = 0
+        outcome = 'incomplete'
+        for symbol in symbols:
+            event = step(symbol)
+            if event.__class__ is events.Dispensed:
+                expected += self._dispensed(event)
+                outcome = 'completed'
+            elif isinstance(event, (events.OrderCancelled, events.PaymentCancelled)):
+                outcome = 'cancelled'
+        event = dfa.finish()
+        if event is not None:
+            expected += self._dispensed(event)
+            outcome = 'completed'
+
+        totals['transactions'] += 1
+        totals[outcome] += 1
+        if collected is not None:
+            totals['collected_checked'] += 1
+            if collected != expected:
+                totals['collected_discrepancy'] += collected - expected
+                totals['mismatched_transactions'] += 1
+
+    def _dispensed(self, event):
+        totals = self.totals
+        revenue = totals['revenue_by_product']
+        counts = totals['items_by_product']
+        prices = self.prices
+        for name, count in event.items:
+            revenue[name] = revenue.get(name, 0) + prices[name] * count
+            counts[name] = counts.get(name, 0) + count
+        totals['revenue'] += event.total
+        if event.change > 0:
+            # Kembalian yang tidak bisa dibayar pas dengan pecahan mesin
+            if make_change(event.change, self.denominations) is None:
+                paid = 0
+                for bill in reversed(self.denominations):
+                    paid += (event.change - paid) // bill * bill
+                totals['change_shortfall'] += event.change - paid
+                totals['shortfall_transactions'] += 1
+                totals['change_paid'] += paid
+            else:
+                totals['change_paid'] += event.change
+        return event.total
+
+
+def _audit_line(auditor, line):
+    record = json.loads(line)
+    if isinstance(record, list):
+        auditor.audit(record)
+    else:
+        auditor.audit(record['symbols'], record.get('collected'))
+
+
+def _worker(tasks, results, binary_table):
+    auditor = _Auditor()
+    totals = auditor.totals
+    symbols = binary_table['symbols'] if binary_table else None
+    while True:
+        chunk = tasks.get()
+        if chunk is None:
+            break
+        for record in chunk:
+            # Satu record rusak tidak boleh menghentikan worker (dan audit seluruh log)
+            try:
+                if symbols is not None:
+                    auditor.audit([symbols[code] for code in record])
+                else:
+                    _audit_line(auditor, record)
+            except (ValueError, KeyError, TypeError, AttributeError, IndexError):
+                totals['malformed'] += 1
+    results.put(totals)
+
+
+def _check_alive(workers):
+    for i, worker in enumerate(workers):
+        if not worker.is_alive() and worker.exitcode != 0:
+            raise RuntimeError(f"Worker audit {i} berhenti tak terduga (exit code {worker.exitcode}).")
+
+
+def _put(tasks, chunk, worker, workers):
+    """put() yang menunggu worker tertinggal, tapi gagal jika worker tujuan sudah mati."""
+    while True:
+        try:
+            tasks.put(chunk, timeout=POLL_SECONDS)
+            return
+        except queue.Full:
+            if not worker.is_alive():
+                _check_alive(workers)
+                raise RuntimeError("Worker audit berhenti sebelum menerima semua record.")
+
+
+def _iter_sharded(path, n_workers):
+    """Menghasilkan (indeks worker, record mentah) dari log secara streaming."""
+    if path.endswith('.jsonl') or path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                match = _MACHINE_RE.search(line)
+                key = match.group(1).encode('utf-8') if match else b''
+                yield zlib.crc32(key) % n_workers, line
+    else:
+        machines = read_binary_table(path)['machines']
+        shard_of = [zlib.crc32(name.encode('utf-8')) % n_workers for name in machines]
+        for machine_id, codes in iter_binary_records(path):
+            yield shard_of[machine_id], codes
+
+
+def audit_log(path, n_workers=None, chunk_size=CHUNK_SIZE):
+    """Menjalankan audit atas satu file log (.jsonl atau biner VMR1) dengan n_workers proses."""
+    n_workers = n_workers or os.cpu_count() or 1
+    binary_table = None
+    if not (path.endswith('.jsonl') or path.endswith('.json')):
+        binary_table = read_binary_table(path)
+
+    results = mp.Queue()
+    queues = [mp.Queue(maxsize=QUEUE_CHUNKS) for _ in range(n_workers)]
+    workers = [mp.Process(target=_worker, args=(q, results, binary_table), daemon=True) for q in queues]
+    for worker in workers:
+        worker.start()
+
+    start = time.perf_counter()
+    buffers = [[] for _ in range(n_workers)]
+    try:
+        for shard, record in _iter_sharded(path, n_workers):
+            buffer = buffers[shard]
+            buffer.append(record)
+            if len(buffer) >= chunk_size:
+                # put() menunggu jika worker tertinggal, jadi log tidak menumpuk di memori
+                _put(queues[shard], buffer, workers[shard], workers)
+                buffers[shard] = []
+        for shard, buffer in enumerate(buffers):
+            if buffer:
+                _put(queues[shard], buffer, workers[shard], workers)
+        for shard, q in enumerate(queues):
+            _put(q, None, workers[shard], workers)
+
+        totals = empty_totals()
+        received = 0
+        while received < len(workers):
+            try:
+                part = results.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                _check_alive(workers)
+                continue
+            merge_totals(totals, part)
+            received += 1
+    finally:
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+    elapsed = time.perf_counter() - start
+
+    totals['cancel_rate'] = round(totals['cancelled'] / totals['transactions'], 4) if totals['transactions'] else 0.0
+    totals['workers'] = n_workers
+    totals['seconds'] = round(elapsed, 3)
+    totals['transactions_per_sec'] = round(totals['transactions'] / elapsed, 1) if elapsed else 0.0
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit paralel log transaksi VendingMachineDFA.")
+    parser.add_argument('path', nargs='?', help="File log .jsonl atau biner VMR1.")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: jumlah core).")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--generate', type=int, metavar='N', help="Mengaudit N transaksi sintetis.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.path is None and not args.generate:
+        parser.error("path atau --generate wajib diisi")
+    try:
+        if args.generate:
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, 'transaksi.jsonl')
+                write_jsonl(path, generate_transactions(args.generate, args.seed))
+                results = audit_log(path, args.workers, args.chunk_size)
+        else:
+            results = audit_log(args.path, args.workers, args.chunk_size)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+# benchmarks/bench_cassette.py
+# Jalankan dari root repo: python -m benchmarks.bench_cassette
+
+import random
+import time
+
+from cassette import CassetteInventory, _bounded_change
+
+DENOMINATIONS = (20000, 10000, 5000, 2000)
+
+
+def bench(label, func, amounts):
+    start = time.perf_counter()
+    for amount in amounts:
+        func(amount)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<45} {elapsed / len(amounts) * 1e6:10.1f} us/panggilan")
+
+
+def main(seed=0, n_calls=2000):
+    rng = random.Random(seed)
+    # Jumlah kembalian realistis (di bawah 100rb) dan refund besar (sampai 2 juta)
+    small = [rng.randrange(0, 100_001, 1000) for _ in range(n_calls)]
+    large = [rng.randrange(0, 2_000_001, 1000) for _ in range(n_calls // 10)]
+
+    for size in (1000, 5000, 20000):
+        full = CassetteInventory({d: size for d in DENOMINATIONS})
+        # Kaset 20rb/10rb hampir kosong memaksa jalur DP terbatas
+        skewed = CassetteInventory({20000: 3, 10000: 2, 5000: size, 2000: size})
+        counts = skewed.available()
+
+        bench(f"kaset {size}: penuh, kembalian kecil", full.make_change, small)
+        bench(f"kaset {size}: penuh, refund besar", full.make_change, large)
+        bench(f"kaset {size}: timpang, kembalian kecil", skewed.make_change, small)
+        bench(f"kaset {size}: DP terbatas langsung, refund besar",
+              lambda a: _bounded_change(a, DENOMINATIONS, counts), large)
+        bench(f"kaset {size}: can_accept (20rb untuk total 2rb)",
+              lambda a: skewed.can_accept(20000, 0, 2000), small)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bench_dfa.py
+# Jalankan dari root repo: python -m benchmarks.bench_dfa
+#
+# Membandingkan CompiledVendingMachineDFA dengan VendingMachineDFA pada replay
+# transaksi sintetis. Putaran pendek kedua engine dijalankan bergantian dan yang
+# dibandingkan adalah median rasio waktu per pasangan, sehingga gangguan mesin
+# yang berlangsung beberapa detik mengenai keduanya. Keluar dengan kode 1 jika
+# step versi tabel tidak lebih cepat dari kelas dasar.
+
+import statistics
+import sys
+import time
+
+from replay import ENGINES, generate_transactions, replay
+
+N_TRANSACTIONS = 300
+PAIRS = 2000
+
+
+def paired_ratio(transactions, api, pairs=PAIRS):
+    """Median (waktu base / waktu compiled) dari putaran berpasangan; > 1 berarti compiled lebih cepat."""
+    base, compiled = ENGINES['base'](), ENGINES['compiled']()
+    clock = time.perf_counter
+    ratios = []
+    for i in range(pairs):
+        # Urutan dibalik setiap pasangan agar efek cache/pemanasan tidak berpihak
+        first, second = (base, compiled) if i % 2 else (compiled, base)
+        start = clock()
+        replay(transactions, first, api)
+        middle = clock()
+        replay(transactions, second, api)
+        end = clock()
+        elapsed = {id(first): middle - start, id(second): end - middle}
+        ratios.append(elapsed[id(base)] / elapsed[id(compiled)])
+    return statistics.median(ratios)
+
+
+def main(seed=0):
+    transactions = list(generate_transactions(N_TRANSACTIONS, seed))
+    print(f"{N_TRANSACTIONS} transaksi x {PAIRS} pasangan putaran")
+    failed = False
+    for api in ('step', 'delta'):
+        ratio = paired_ratio(transactions, api)
+        print(f"  {api:<5} compiled {ratio:.3f}x kecepatan base")
+        failed |= api == 'step' and ratio <= 1.0
+    if failed:
+        print("GAGAL: step versi tabel tidak lebih cepat dari VendingMachineDFA.step", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
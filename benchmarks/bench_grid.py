@@ -0,0 +1,139 @@
+# benchmarks/bench_grid.py
+# Jalankan dari root repo: python -m benchmarks.bench_grid
+# Bagian grid membutuhkan display (mis. xvfb-run python -m benchmarks.bench_grid);
+# bagian gambar (LRU AssetManager) berjalan juga tanpa display.
+#
+# Setiap item punya gambar sendiri (PNG sintetis di direktori sementara), jadi
+# scroll acak di katalog besar benar-benar memuat, membuang dan memuat ulang
+# gambar lewat AssetManager seperti _bind_product_cell di main.py.
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+import customtkinter as ctk
+from PIL import Image
+
+from assets import AssetManager
+from replay import percentile
+from virtual_grid import VirtualGrid
+
+SIZES = (50, 500, 5000)
+IMAGE_SIZE = (100, 80)
+ROW_HEIGHT = 150
+COLUMNS = 2
+VISIBLE_CELLS = (700 // ROW_HEIGHT + 2) * COLUMNS  # baris terlihat + overscan di jendela 600x700
+CACHE_SIZES = (64, None)  # LRU seperti main.py, dan tanpa batas sebagai pembanding
+
+
+def make_images(directory, n_items):
+    """n_items PNG 200x160 berwarna berbeda; mengembalikan daftar path."""
+    paths = []
+    for i in range(n_items):
+        path = os.path.join(directory, f"produk-{i:05d}.png")
+        if not os.path.exists(path):
+            Image.new("RGBA", (200, 160), (i % 256, i // 256 % 256, 128, 255)).save(path)
+        paths.append(path)
+    return paths
+
+
+def held_images(assets):
+    """Jumlah gambar PIL yang ditahan AssetManager (langsung atau lewat CTkImage) dan ukurannya (RGBA, MB)."""
+    images = {id(image): image for image in assets._scaled.values()}
+    for ctk_image in assets._ctk_images.values():
+        image = ctk_image.cget('light_image')
+        images[id(image)] = image
+    images = list(images.values())
+    return len(images), sum(image.width * image.height * 4 for image in images) / 1e6
+
+
+def bench_images(cache_dir, paths, max_images, n_scrolls=200, seed=0):
+    """Tanpa Tk: setiap scroll acak mengikat VISIBLE_CELLS gambar berurutan seperti bind_cell."""
+    rng = random.Random(seed)
+    assets = AssetManager(cache_dir, max_images=max_images)
+    samples = []
+    for _ in range(n_scrolls):
+        first = rng.randrange(max(1, len(paths) - VISIBLE_CELLS + 1))
+        start = time.perf_counter_ns()
+        for path in paths[first:first + VISIBLE_CELLS]:
+            assets.image(path, IMAGE_SIZE)
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    held, megabytes = held_images(assets)
+    label = "tanpa batas" if max_images is None else f"LRU {max_images}"
+    print(f"{len(paths):>6} item  {label:<11}  bind per scroll p50 {percentile(samples, 50) / 1e6:6.2f} ms  "
+          f"p99 {percentile(samples, 99) / 1e6:6.2f} ms  hit {assets.stats['hits']:5d}  muat {assets.stats['loads']:4d}  "
+          f"dibuang {assets.stats['evicted']:4d}  ditahan {held:4d} gambar ({megabytes:.1f} MB)")
+
+
+def bench_grid(root, cache_dir, paths, n_scrolls=200, seed=0):
+    rng = random.Random(seed)
+    assets = AssetManager(cache_dir, widget=root)
+    items = [(f"Produk {i}", 1000 * (i % 20 + 1), path) for i, path in enumerate(paths)]
+
+    def make_cell(parent):
+        return ctk.CTkButton(parent, text="", compound="top", fg_color="#1E1E1E", hover_color="#4A4A4A")
+
+    def bind_cell(button, item):
+        name, price, path = item
+        button.configure(text=f"{name}\nRp{price}", image=assets.image(path, IMAGE_SIZE))
+
+    grid = VirtualGrid(root, make_cell, bind_cell, columns=COLUMNS, row_height=ROW_HEIGHT,
+                       label_text=f"{len(items)} item")
+    grid.pack(fill="both", expand=True)
+    root.update()
+
+    start = time.perf_counter()
+    grid.set_items(items)
+    root.update_idletasks()
+    set_items_ms = (time.perf_counter() - start) * 1000
+
+    samples = []
+    for _ in range(n_scrolls):
+        start = time.perf_counter_ns()
+        grid.scroll_to(rng.random())
+        root.update_idletasks()
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+
+    widgets = len(grid.canvas.winfo_children())
+    held, megabytes = held_images(assets)
+    print(f"{len(items):>6} item  set_items {set_items_ms:7.1f} ms  "
+          f"scroll p50 {percentile(samples, 50) / 1e6:6.2f} ms  p99 {percentile(samples, 99) / 1e6:6.2f} ms  "
+          f"widget sel {widgets:3d}  bind {grid.stats['binds']}  ditahan {held} gambar ({megabytes:.1f} MB)")
+    grid.destroy()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        cache_dir = os.path.join(directory, "cache")
+        all_paths = make_images(directory, max(SIZES))
+        # Cache disk diisi dulu: yang diukur adalah muat ulang gambar yang dibuang LRU, bukan skala pertama
+        warm = AssetManager(cache_dir, max_images=0)
+        for path in all_paths:
+            warm.image(path, IMAGE_SIZE)
+
+        print(f"Gambar per scroll: {VISIBLE_CELLS} sel")
+        for n_items in SIZES:
+            for max_images in CACHE_SIZES:
+                bench_images(cache_dir, all_paths[:n_items], max_images)
+
+        try:
+            root = ctk.CTk()
+        except tk.TclError as e:
+            print(f"Tidak ada display untuk Tk ({e}); bagian grid dilewati. Jalankan dengan xvfb-run atau di desktop.")
+            return 0
+        root.geometry("600x700")
+        try:
+            for n_items in SIZES:
+                bench_grid(root, cache_dir, all_paths[:n_items])
+        finally:
+            root.destroy()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
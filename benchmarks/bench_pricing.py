@@ -0,0 +1,86 @@
+# benchmarks/bench_pricing.py
+# Jalankan dari root repo: python -m benchmarks.bench_pricing
+#
+# Latensi menghitung ulang total setelah setiap item ditambahkan: Pricer
+# (inkremental, lewat indeks produk -> term) dibanding PricingEngine.price
+# (semua aturan dievaluasi ulang terhadap seluruh keranjang).
+
+import random
+import time
+
+from catalog import Catalog, Product
+from pricing import ComboDiscount, HappyHour, PricingEngine, ToppingCap
+from replay import percentile
+
+N_PRODUCTS = 200
+N_CATEGORIES = 10
+RULE_COUNTS = (10, 100, 500)
+CART_SIZES = (10, 100, 1000)
+
+
+def make_catalog():
+    return Catalog(Product(f"Produk {i}", f"kategori-{i % N_CATEGORIES}", 1000 * (i % 15 + 1))
+                   for i in range(N_PRODUCTS))
+
+
+def make_rules(catalog, n_rules, rng):
+    categories = catalog.categories
+    products = [product.name for product in catalog.products]
+    rules = []
+    for i in range(n_rules):
+        kind = i % 3
+        if kind == 0:
+            selectors = rng.sample(categories, 2) if rng.random() < 0.5 else rng.sample(products, 2)
+            rules.append(ComboDiscount(f"combo-{i}", {s: rng.randint(1, 3) for s in selectors}, 1000 * rng.randint(1, 5)))
+        elif kind == 1:
+            start = rng.randrange(24)
+            rules.append(HappyHour(f"happy-{i}", rng.choice(categories + tuple(products)), rng.choice((10, 20, 50)),
+                                   start, (start + rng.randint(1, 6)) % 24))
+        else:
+            rules.append(ToppingCap(f"cap-{i}", rng.choice(products), rng.randint(1, 5)))
+    return rules
+
+
+def bench(engine, cart_size, hour, rng, repeat=3):
+    incremental, full = [], []
+    ids = [rng.randrange(len(engine.products)) for _ in range(cart_size)]
+    pricer = engine.pricer()
+    for _ in range(repeat):
+        pricer.reset(hour)
+        counts = [0] * len(engine.products)
+        for product_id in ids:
+            start = time.perf_counter_ns()
+            total = pricer.add(product_id)
+            incremental.append(time.perf_counter_ns() - start)
+
+            counts[product_id] += 1
+            # Keranjang besar: pembanding penuh cukup disampel agar benchmark tetap singkat
+            if len(full) < 2000:
+                start = time.perf_counter_ns()
+                expected = engine.price(counts, hour)
+                full.append(time.perf_counter_ns() - start)
+                assert total == expected, (total, expected)
+    incremental.sort()
+    full.sort()
+    return incremental, full
+
+
+def main(seed=0, hour=15):
+    rng = random.Random(seed)
+    catalog = make_catalog()
+    print(f"{N_PRODUCTS} produk, {N_CATEGORIES} kategori, jam {hour}")
+    for n_rules in RULE_COUNTS:
+        start = time.perf_counter()
+        engine = PricingEngine(make_rules(catalog, n_rules, rng), catalog)
+        engine.index(hour)
+        compile_ms = (time.perf_counter() - start) * 1000
+        print(f"{n_rules:>4} aturan ({len(engine.terms)} term, {engine.n_groups} grup), kompilasi {compile_ms:.1f} ms")
+        for cart_size in CART_SIZES:
+            incremental, full = bench(engine, cart_size, hour, rng)
+            print(f"      keranjang {cart_size:>5} item  "
+                  f"inkremental p50 {percentile(incremental, 50) / 1000:6.2f} us  p99 {percentile(incremental, 99) / 1000:6.2f} us  |  "
+                  f"penuh p50 {percentile(full, 50) / 1000:8.2f} us  p99 {percentile(full, 99) / 1000:8.2f} us")
+
+
+if __name__ == "__main__":
+    main()
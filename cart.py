@@ -0,0 +1,98 @@
+# cart.py
+
+from array import array
+from functools import lru_cache
+from operator import itemgetter
+
+_count = itemgetter(1)
+
+
+class Cart:
+    """
+    Keranjang belanja: jumlah per produk (diindeks id produk). Total, daftar
+    pesanan dan teks pengeluaran cukup O(jumlah produk berbeda), bukan O(jumlah item).
+
+    Log urutan id produk (hanya ditambah, untuk animasi dispenser) hanya disimpan
+    jika ada pembacanya (order_log=True, mis. GUI lewat MachineController); replay
+    dan audit tidak membayar satu append per item. Tanpa log, `order` bernilai None.
+
+    clear() mengosongkan counts dan order di tempat (objeknya tetap sama) agar
+    reset tidak mengalokasi ulang dan jalur panas boleh mengikat keduanya sekali.
+    Jalur panas yang menambah counts langsung juga harus menyetel `filled`;
+    `generation` bertambah setiap kali keranjang yang berisi dikosongkan.
+    """
+    __slots__ = ('products', 'product_ids', 'counts', 'order', 'filled', 'generation', '_zeros')
+
+    def __init__(self, products, order_log=False):
+        self.products = tuple(products)
+        self.product_ids = {name: i for i, name in enumerate(self.products)}
+        self._zeros = (0,) * len(self.products)
+        self.counts = list(self._zeros)
+        # 'H' = unsigned short: 2 byte per item, cukup untuk 65535 produk
+        self.order = array('H') if order_log else None
+        self.filled = False
+        self.generation = 0
+
+    def add(self, name):
+        """Menambahkan satu produk berdasarkan nama dan mengembalikan id-nya."""
+        product_id = self.product_ids[name]
+        self.counts[product_id] += 1
+        if self.order is not None:
+            self.order.append(product_id)
+        self.filled = True
+        return product_id
+
+    def clear(self):
+        if self.filled:
+            self.counts[:] = self._zeros
+            if self.order is not None:
+                del self.order[:]
+            self.filled = False
+            self.generation += 1
+
+    def load(self, counts):
+        """Mengisi keranjang dari jumlah per produk (urutan log mengikuti id produk)."""
+        self.clear()
+        self.counts[:] = counts
+        if self.order is not None:
+            self.order.extend(product_id for product_id, count in enumerate(counts) for _ in range(count))
+        self.filled = any(counts)
+
+    def __len__(self):
+        return sum(self.counts)
+
+    def __bool__(self):
+        return self.filled
+
+    def items(self):
+        """Pasangan (nama produk, jumlah) untuk produk yang ada di keranjang."""
+        return tuple(filter(_count, zip(self.products, self.counts)))
+
+    def names(self):
+        """
+        Nama produk sesuai urutan dipilih (O(jumlah item), untuk animasi). Tanpa
+        log urutan, nama dikelompokkan per produk mengikuti id produk.
+        """
+        products = self.products
+        if self.order is not None:
+            return [products[product_id] for product_id in self.order]
+        return [name for name, count in self.items() for _ in range(count)]
+
+
+def format_items(items):
+    """Teks ringkas seperti 'Vanilla Scoop x2, Caramel' dari pasangan (nama, jumlah)."""
+    return ", ".join(name if count == 1 else f"{name} x{count}" for name, count in items)
+
+
+@lru_cache(maxsize=1024)
+def format_counts(products, counts):
+    """
+    Seperti format_items, langsung dari jumlah per produk (tuple) tanpa membuat
+    pasangan dulu. Dipakai teks Dispensed; isi keranjang yang sama sering berulang,
+    jadi hasilnya disimpan di cache berukuran tetap.
+    """
+    parts = []
+    for name, count in zip(products, counts):
+        if count:
+            parts.append(name if count == 1 else f"{name} x{count}")
+    return ", ".join(parts)
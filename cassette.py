@@ -0,0 +1,139 @@
+# cassette.py
+
+from collections import deque
+from functools import reduce
+from math import gcd
+
+from change_maker import make_change
+
+
+class CassetteInventory:
+    """
+    Persediaan uang di dalam mesin: jumlah lembar per pecahan (kaset).
+    Uang yang dimasukkan pelanggan ditahan di escrow sampai transaksi selesai,
+    lalu masuk ke kaset dan bisa dipakai untuk kembalian.
+    """
+
+    def __init__(self, counts, capacity=None):
+        self.counts = {int(d): int(n) for d, n in counts.items()}
+        self.denominations = tuple(sorted(self.counts, reverse=True))
+        self.unit = reduce(gcd, self.denominations)
+        self.capacity = capacity
+        self.escrow = []
+
+    def copy(self):
+        """Salinan independen (kaset, escrow dan kapasitas), mis. untuk dibaca thread lain."""
+        clone = CassetteInventory(self.counts, self.capacity)
+        clone.escrow = list(self.escrow)
+        return clone
+
+    def available(self):
+        """Jumlah lembar yang bisa dipakai untuk kembalian (kaset + escrow)."""
+        counts = dict(self.counts)
+        for bill in self.escrow:
+            counts[bill] = counts.get(bill, 0) + 1
+        return counts
+
+    def make_change(self, amount, counts=None):
+        """
+        Kombinasi kembalian dengan lembar paling sedikit yang tidak melebihi
+        persediaan `counts` (default: kaset + escrow). None jika tidak mungkin.
+        """
+        if counts is None:
+            counts = self.available()
+        if amount == 0:
+            return []
+        denominations = tuple(sorted((d for d, n in counts.items() if n > 0), reverse=True))
+        if not denominations:
+            return None
+
+        # Jalur cepat: solusi tanpa batas persediaan sering kali sudah cukup
+        bills = make_change(amount, denominations)
+        if bills is None:
+            return None
+        if all(bills.count(d) <= counts[d] for d in denominations):
+            return bills
+        return _bounded_change(amount, denominations, counts)
+
+    def can_accept(self, bill, money_inserted, total_price):
+        """Apakah uang `bill` boleh diterima tanpa membuat kembalian pas menjadi mustahil."""
+        if self.capacity is not None:
+            held = self.counts.get(bill, 0) + self.escrow.count(bill)
+            if held >= self.capacity:
+                return False
+        change = money_inserted + bill - total_price
+        if change <= 0:
+            return True
+        counts = self.available()
+        counts[bill] = counts.get(bill, 0) + 1
+        return self.make_change(change, counts) is not None
+
+    def hold(self, bill):
+        """Menahan uang pelanggan di escrow."""
+        self.escrow.append(bill)
+
+    def release(self):
+        """Mengembalikan semua uang di escrow (pembayaran dibatalkan)."""
+        bills, self.escrow = sorted(self.escrow, reverse=True), []
+        return bills
+
+    def settle(self, change):
+        """Memasukkan escrow ke kaset lalu mengeluarkan lembar kembalian."""
+        bills = self.make_change(change)
+        if bills is None:
+            raise ValueError(f"Kembalian Rp {change} tidak dapat diberikan dari persediaan.")
+        for bill in self.escrow:
+            self.counts[bill] = self.counts.get(bill, 0) + 1
+        self.escrow = []
+        for bill in bills:
+            self.counts[bill] -= 1
+        return bills
+
+
+def _bounded_change(amount, denominations, counts):
+    """
+    DP kembalian minimal dengan batas jumlah lembar per pecahan. Untuk setiap
+    pecahan, minimum di jendela geser per kelas sisa dihitung dengan deque
+    monoton, sehingga biayanya O(jumlah x banyak pecahan) berapa pun isi kaset.
+    """
+    unit = reduce(gcd, denominations)
+    if amount % unit:
+        return None
+    size = amount // unit + 1
+    impossible = size + 1
+    best = [0] + [impossible] * (size - 1)
+    used = []
+
+    for d in denominations:
+        step = d // unit
+        limit = min(counts[d], amount // d)
+        new = best[:]
+        taken = [0] * size
+        if limit:
+            for residue in range(min(step, size)):
+                # best[i] - k dengan i = residue + k*step, jendela berisi paling banyak limit+1 elemen
+                window = deque()
+                for k, i in enumerate(range(residue, size, step)):
+                    value = best[i] - k
+                    while window and window[-1][1] >= value:
+                        window.pop()
+                    window.append((k, value))
+                    if window[0][0] < k - limit:
+                        window.popleft()
+                    start, low = window[0]
+                    if low + k < new[i]:
+                        new[i] = low + k
+                        taken[i] = k - start
+        used.append(taken)
+        best = new
+
+    if best[amount // unit] >= impossible:
+        return None
+    bills = []
+    i = amount // unit
+    for d, taken in zip(reversed(denominations), reversed(used)):
+        k = taken[i]
+        bills.extend([d] * k)
+        i -= k * (d // unit)
+    bills.sort(reverse=True)
+    return bills
@@ -0,0 +1,78 @@
+# catalog.py
+
+import csv
+import json
+import os
+from functools import lru_cache
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+
+
+class Product:
+    __slots__ = ('name', 'category', 'price', 'color', 'image')
+
+    def __init__(self, name, category, price, color='gray', image=None):
+        self.name = name
+        self.category = category
+        self.price = int(price)
+        self.color = color or 'gray'
+        self.image = image or f"assets/images/{name}.png"
+
+
+class Catalog:
+    """
+    Daftar produk yang dimuat sekali dari file (JSON atau CSV) dan dipakai
+    bersama oleh DFA dan GUI. Indeks per kategori dihitung di awal sehingga
+    menampilkan satu kategori cukup O(jumlah produk di kategori itu).
+    """
+
+    def __init__(self, products):
+        self.products = tuple(products)
+        self.by_name = {}
+        self.by_category = {}
+        for product in self.products:
+            if product.name in self.by_name:
+                raise ValueError(f"Produk '{product.name}' muncul lebih dari sekali di katalog.")
+            self.by_name[product.name] = product
+            self.by_category.setdefault(product.category, []).append(product.name)
+        self.by_category = {category: tuple(names) for category, names in self.by_category.items()}
+        # Bentuk yang dipakai VendingMachineDFA (urutan = urutan katalog = id produk di Cart)
+        self.prices = {p.name: p.price for p in self.products}
+        self.types = {p.name: p.category for p in self.products}
+        self.colors = {p.name: p.color for p in self.products}
+
+    @property
+    def categories(self):
+        return tuple(self.by_category)
+
+    def category(self, name):
+        """Nama produk dalam kategori `name` (tuple kosong jika tidak ada)."""
+        return self.by_category.get(name, ())
+
+    def __len__(self):
+        return len(self.products)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    @classmethod
+    def load(cls, path):
+        """Memuat katalog dari .json ({"products": [...]}) atau .csv (kolom name, category, price, color, image)."""
+        if path.endswith('.csv'):
+            with open(path, newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        else:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            rows = data['products'] if isinstance(data, dict) else data
+        try:
+            return cls(Product(row['name'], row['category'], row['price'], row.get('color'), row.get('image'))
+                       for row in rows)
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Katalog {path} tidak valid: {e}") from e
+
+
+@lru_cache(maxsize=None)
+def default_catalog(path=DEFAULT_PATH):
+    """Katalog bersama yang dimuat sekali per proses."""
+    return Catalog.load(path)
@@ -0,0 +1,84 @@
+# change_maker.py
+
+from functools import lru_cache, reduce
+from math import gcd
+
+
+class ChangeMaker:
+    """
+    Menghitung kombinasi uang kembalian dengan jumlah lembar paling sedikit.
+    Tabel DP dibangun sekali (bottom-up, dalam satuan FPB semua pecahan) dan
+    dibatasi sampai jumlah tertentu; jumlah yang lebih besar dikurangi dulu
+    dengan pecahan terbesar.
+    """
+
+    def __init__(self, denominations):
+        self.denominations = tuple(sorted(set(denominations), reverse=True))
+        if not self.denominations or self.denominations[-1] <= 0:
+            raise ValueError("Pecahan uang harus bilangan positif.")
+        self.unit = reduce(gcd, self.denominations)
+        self.largest = self.denominations[0]
+
+        # Pada solusi minimal, pecahan d < terbesar dipakai kurang dari lcm(d, terbesar) / d kali
+        # (selebihnya bisa ditukar dengan lebih sedikit lembar pecahan terbesar). Jadi jumlah
+        # pecahan kecil dibatasi, dan tabel cukup sampai batas itu.
+        bound = sum((d * self.largest // gcd(d, self.largest) // d - 1) * d for d in self.denominations[1:])
+        self.limit = max(bound, self.largest)
+        self._build_table()
+
+    def _build_table(self):
+        size = self.limit // self.unit + 1
+        steps = [d // self.unit for d in self.denominations]
+        impossible = size + 1
+        # best[i] = jumlah lembar minimal untuk i satuan, last[i] = pecahan terakhir yang dipakai
+        self._best = best = [0] + [impossible] * (size - 1)
+        self._last = last = [0] * size
+        for i in range(1, size):
+            for d, step in zip(self.denominations, steps):
+                if step <= i and best[i - step] + 1 < best[i]:
+                    best[i] = best[i - step] + 1
+                    last[i] = d
+        self._impossible = impossible
+
+    def make_change(self, amount):
+        """
+        Mengembalikan list pecahan (urut dari terbesar) dengan lembar paling sedikit
+        yang jumlahnya tepat `amount`, atau None jika tidak ada kombinasi yang pas.
+        """
+        if amount < 0 or amount % self.unit:
+            return None
+        large_count = 0
+        if amount > self.limit:
+            large_count = -(-(amount - self.limit) // self.largest)
+            amount -= large_count * self.largest
+
+        i = amount // self.unit
+        if self._best[i] >= self._impossible:
+            return None
+        bills = [self.largest] * large_count
+        while i:
+            d = self._last[i]
+            bills.append(d)
+            i -= d // self.unit
+        bills.sort(reverse=True)
+        return bills
+
+
+@lru_cache(maxsize=16)
+def _change_maker(denominations):
+    return ChangeMaker(denominations)
+
+
+@lru_cache(maxsize=4096)
+def _cached_change(amount, denominations):
+    bills = _change_maker(denominations).make_change(amount)
+    return None if bills is None else tuple(bills)
+
+
+def make_change(amount, denominations):
+    """
+    Kombinasi kembalian minimal untuk `amount` dengan pecahan `denominations`.
+    Hasil disimpan dalam cache LRU berdasarkan (amount, pecahan).
+    """
+    bills = _cached_change(amount, tuple(sorted(set(denominations), reverse=True)))
+    return None if bills is None else list(bills)
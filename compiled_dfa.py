@@ -0,0 +1,315 @@
+# compiled_dfa.py
+
+import random
+
+import events
+from cassette import CassetteInventory
+from catalog import default_catalog
+from pricing import ComboDiscount, PricingEngine, ToppingCap
+from vending_machine_dfa import VendingMachineDFA
+
+# Kode aksi untuk tabel transisi. Urutan dipakai step: kode <= A_ADD adalah pesan
+# atau tambah item (aksi yang paling sering), sisanya diuji satu per satu.
+A_NOOP = 0
+A_MESSAGE = 1
+A_ADD_FIRST = 2
+A_ADD = 3
+A_CHECKOUT = 4
+A_CANCEL_ORDER = 5
+A_PAY = 6
+A_REFUND = 7
+A_DISPENSE = 8
+
+
+class CompiledVendingMachineDFA(VendingMachineDFA):
+    """
+    Versi VendingMachineDFA yang memakai tabel transisi berindeks integer
+    (id state x id simbol -> state berikutnya + kode aksi).
+    Output-nya identik dengan VendingMachineDFA.delta.
+
+    State saat ini disimpan sebagai offset baris tabel (integer) di dalam closure
+    step/delta; nama state baru dibuat saat current_state dibaca atau diubah dari luar.
+    """
+    __slots__ = (
+        'step', 'delta', 'reset', 'finish', '_get_state', '_set_state', '_state_names', '_state_ids', '_products',
+        '_prices', '_symbol_ids', '_money_col', '_other_col', '_n_cols', '_next', '_action', '_message',
+        '_row_offsets'
+    )
+
+    # Menggantikan slot current_state kelas dasar; hanya dipakai di batas API
+    current_state = property(lambda self: self._get_state(), lambda self, name: self._set_state(name))
+
+    def __init__(self, inventory=None, catalog=None, pricing=None, order_log=False):
+        # __init__ kelas dasar memanggil reset(); reset versi tabel baru ada setelah compile()
+        self.reset = _not_compiled
+        super().__init__(inventory, catalog, pricing, order_log)
+        self.compile()
+        self.reset()
+
+    def compile(self):
+        """Menyusun tabel transisi dari states, alphabet, item_types dan menu_prices."""
+        # State saat ini dipertahankan jika tabel disusun ulang
+        state = getattr(self, '_get_state', lambda: 'Idle')()
+        self._state_names = sorted(self.states)
+        self._state_ids = {name: i for i, name in enumerate(self._state_names)}
+
+        # Kolom simbol: satu per produk, lalu tombol aksi, lalu uang dan 'lainnya'
+        self._products = list(self.menu_prices)
+        self._prices = [self.menu_prices[name] for name in self._products]
+        self._symbol_ids = {name: i for i, name in enumerate(self._products)}
+        for name in ('Next', 'Checkout', 'Cancel'):
+            self._symbol_ids[name] = len(self._symbol_ids)
+        self._money_col = len(self._symbol_ids)
+        self._other_col = self._money_col + 1
+        self._n_cols = self._other_col + 1
+
+        size = len(self._state_names) * self._n_cols
+        self._next = [None] * size
+        self._action = [A_NOOP] * size
+        self._message = [events.IGNORED] * size
+
+        for state_name, sid in self._state_ids.items():
+            for col in range(self._n_cols):
+                next_state, action, message = self._rule(state_name, col)
+                i = sid * self._n_cols + col
+                self._next[i] = self._state_names[self._state_ids.get(next_state, sid)]
+                self._action[i] = action
+                self._message[i] = message
+
+        # Offset baris per state: state disimpan sebagai offset ini, sel tabel = offset + kolom
+        self._row_offsets = {name: sid * self._n_cols for name, sid in self._state_ids.items()}
+        # step, delta, reset dan finish versi tabel menggantikan method milik kelas dasar
+        self._build(self._row_offsets[state])
+
+    def _rule(self, state, col):
+        """Aturan transisi untuk satu sel tabel, mengikuti logika VendingMachineDFA.step."""
+        item_type = self.item_types.get(self._products[col]) if col < len(self._products) else None
+        ids = self._symbol_ids
+
+        if state == 'Idle':
+            if item_type == 'scoop':
+                return 'IceCreamSelection', A_ADD_FIRST, events.IGNORED
+            return state, A_MESSAGE, events.CHOOSE_ICE_CREAM_FIRST
+
+        if state == 'IceCreamSelection':
+            if item_type == 'scoop':
+                return state, A_ADD, events.IGNORED
+            if col == ids['Next']:
+                return 'ToppingSelection', A_MESSAGE, events.CHOOSE_TOPPING
+            if col == ids['Cancel']:
+                return 'Idle', A_CANCEL_ORDER, events.IGNORED
+            return state, A_MESSAGE, events.INVALID_SCOOP_INPUT
+
+        if state == 'ToppingSelection':
+            if item_type == 'topping':
+                return state, A_ADD, events.IGNORED
+            if col == ids['Checkout']:
+                return state, A_CHECKOUT, events.IGNORED
+            if col == ids['Cancel']:
+                return 'Idle', A_CANCEL_ORDER, events.IGNORED
+            return state, A_MESSAGE, events.INVALID_TOPPING_INPUT
+
+        if state == 'WaitingForPayment':
+            if col == self._money_col:
+                return state, A_PAY, events.IGNORED
+            if col == ids['Cancel']:
+                return 'ReturningChange', A_REFUND, events.IGNORED
+            return state, A_NOOP, events.IGNORED
+
+        if state == 'DispensingItem':
+            return 'ReturningChange', A_DISPENSE, events.IGNORED
+
+        return state, A_NOOP, events.IGNORED
+
+    def _build(self, row):
+        """
+        Membuat step, delta, reset dan finish yang berbagi satu variabel `row` (offset baris
+        state saat ini) lewat closure, dengan tabel terikat sebagai variabel lokal.
+        current_state hanya menerjemahkan row ke nama state dan sebaliknya.
+        """
+        symbol_ids = self._symbol_ids
+        money_col, other_col = self._money_col, self._other_col
+        row_offsets = self._row_offsets
+        row_names = {offset: name for name, offset in row_offsets.items()}
+        next_rows = [row_offsets[name] for name in self._next]
+        actions, messages = self._action, self._message
+        texts = [str(message) for message in messages]
+        idle_row = row_offsets['Idle']
+        waiting_row = row_offsets['WaitingForPayment']
+        dispensing_row = row_offsets['DispensingItem']
+        prices = self._prices
+        item_added, item_added_text = events.ItemAdded, events.item_added_text
+        payment_received, dispensed = events.PaymentReceived, events.Dispensed
+        # Cart.clear mengosongkan di tempat, jadi counts dan log boleh diikat sekali di sini
+        # (kolom produk = id produk di Cart; keduanya mengikuti urutan menu_prices)
+        cart, counts, products = self.cart, self.cart.counts, self.cart.products
+        append_order = cart.order.append if cart.order is not None else None
+        pricer = self.pricer
+        inventory = self.inventory
+
+        def get_state():
+            return row_names[row]
+
+        def set_state(name):
+            nonlocal row
+            row = row_offsets[name]
+
+        def reset():
+            # Sama dengan VendingMachineDFA.reset, tetapi state diset langsung sebagai offset baris
+            nonlocal row
+            row = idle_row
+            cart.clear()
+            if pricer is not None:
+                pricer.reset()
+            self.total_price = 0
+            self.money_inserted = 0
+            self.change_to_return = 0
+            self.change_bills = []
+
+        def step(input_symbol):
+            nonlocal row
+            # Simbol string dicari di tabel; uang dikenali dari tipenya seperti pada delta asli
+            col = symbol_ids.get(input_symbol)
+            if col is None:
+                col = money_col if isinstance(input_symbol, int) else other_col
+
+            i = row + col
+            row = next_rows[i]
+            action = actions[i]
+
+            # Semua aksi ditangani di sini tanpa pemanggilan handler; kode aksi diuji
+            # bertingkat (pesan/tambah item dulu) agar aksi yang sering cukup dua perbandingan
+            if action <= A_ADD:
+                if action <= A_MESSAGE:
+                    return messages[i]
+                counts[col] += 1
+                if append_order is not None:
+                    append_order(col)
+                cart.filled = True
+                if pricer is None:
+                    self.total_price += prices[col]
+                else:
+                    self.total_price = pricer.add(col)
+                return item_added(input_symbol, self.total_price, action == A_ADD_FIRST)
+            if action == A_PAY:
+                inserted, total = self.money_inserted, self.total_price
+                if inventory is not None:
+                    if not inventory.can_accept(input_symbol, inserted, total):
+                        return events.PaymentRejected(input_symbol)
+                    inventory.hold(input_symbol)
+                inserted += input_symbol
+                self.money_inserted = inserted
+                if inserted >= total:
+                    row = dispensing_row
+                return payment_received(input_symbol, inserted, total)
+            if action == A_DISPENSE:
+                inserted, total = self.money_inserted, self.total_price
+                change = self.change_to_return = inserted - total
+                if inventory is not None:
+                    self.change_bills = inventory.settle(change)
+                return dispensed(products, tuple(counts), total, inserted, change)
+            if action == A_CHECKOUT:
+                if not cart.filled:
+                    reset()
+                    return events.EMPTY_CART_CANCELLED
+                row = waiting_row
+                return events.OrderConfirmed(self.total_price)
+            if action == A_CANCEL_ORDER:
+                reset()
+                return events.ORDER_CANCELLED
+            # A_REFUND
+            self.change_to_return = self.money_inserted
+            if inventory is not None:
+                self.change_bills = inventory.release()
+            return events.PaymentCancelled(self.change_to_return)
+
+        def delta(input_symbol):
+            # Pesan tetap dan tambah item langsung mengembalikan teks dari tabel teks yang
+            # dirender sekali; aksi lain memakai step lalu str() seperti kelas dasar
+            nonlocal row
+            col = symbol_ids.get(input_symbol)
+            if col is None:
+                col = money_col if isinstance(input_symbol, int) else other_col
+
+            i = row + col
+            action = actions[i]
+            if action <= A_MESSAGE:
+                row = next_rows[i]
+                return texts[i]
+            if action == A_ADD:
+                row = next_rows[i]
+                counts[col] += 1
+                if append_order is not None:
+                    append_order(col)
+                cart.filled = True
+                if pricer is None:
+                    self.total_price += prices[col]
+                else:
+                    self.total_price = pricer.add(col)
+                return item_added_text(input_symbol, self.total_price)
+            return str(step(input_symbol))
+
+        def finish():
+            # Seperti VendingMachineDFA.finish, tanpa menerjemahkan row ke nama state
+            if row == dispensing_row:
+                return step(None)
+            return None
+
+        self._get_state, self._set_state = get_state, set_state
+        self.reset, self.step, self.delta, self.finish = reset, step, delta, finish
+
+
+def _not_compiled():
+    """Pengganti reset() selama __init__ kelas dasar berjalan, sebelum tabel disusun."""
+
+
+def check_parity(n_sequences=2000, max_length=40, seed=0, cassette_counts=None, pricing=None, api='delta',
+                 order_log=False):
+    """
+    Menjalankan urutan simbol acak ke VendingMachineDFA dan CompiledVendingMachineDFA
+    lalu memastikan output dan state keduanya selalu sama. Jika cassette_counts
+    diberikan, kedua mesin memakai CassetteInventory dengan isi yang sama; pricing
+    (PricingEngine) opsional dipakai keduanya. api='step' membandingkan event
+    (jenis dan teks) dari step, bukan teks dari delta. order_log=True juga
+    membandingkan urutan pilihan dari log keranjang.
+    """
+    rng = random.Random(seed)
+    reference = VendingMachineDFA(CassetteInventory(cassette_counts) if cassette_counts else None, pricing=pricing,
+                                  order_log=order_log)
+    compiled = CompiledVendingMachineDFA(CassetteInventory(cassette_counts) if cassette_counts else None,
+                                         pricing=pricing, order_log=order_log)
+    # Termasuk simbol di luar alphabet untuk menguji cabang 'input tidak valid'.
+    # Diurutkan agar urutan tidak bergantung pada hash seed dan kegagalan bisa diulang.
+    symbols = sorted(reference.alphabet, key=lambda s: (isinstance(s, int), str(s)))
+    symbols += [None, 'Unknown', 3000, 2000.0]
+
+    for _ in range(n_sequences):
+        reference.reset()
+        compiled.reset()
+        for _ in range(rng.randint(1, max_length)):
+            symbol = rng.choice(symbols)
+            if api == 'step':
+                expected_event, actual_event = reference.step(symbol), compiled.step(symbol)
+                expected = (type(expected_event), str(expected_event))
+                actual = (type(actual_event), str(actual_event))
+            else:
+                expected = reference.delta(symbol)
+                actual = compiled.delta(symbol)
+            state = (reference.current_state, reference.selected_items, reference.total_price,
+                     reference.money_inserted, reference.change_to_return, reference.change_bills)
+            compiled_state = (compiled.current_state, compiled.selected_items, compiled.total_price,
+                              compiled.money_inserted, compiled.change_to_return, compiled.change_bills)
+            if expected != actual or state != compiled_state:
+                raise AssertionError(f"Hasil berbeda untuk simbol {symbol!r}: {expected!r} != {actual!r}")
+
+
+if __name__ == "__main__":
+    check_parity()
+    check_parity(api='step')
+    check_parity(order_log=True)
+    check_parity(cassette_counts={2000: 3, 5000: 1, 10000: 1, 20000: 0})
+    check_parity(pricing=PricingEngine([
+        ComboDiscount("Paket Duo", {'scoop': 2, 'topping': 1}, 3000),
+        ToppingCap("Topping Puas", 'topping', 2),
+    ], default_catalog()))
+    print("Parity OK: CompiledVendingMachineDFA identik dengan VendingMachineDFA.")
@@ -0,0 +1,196 @@
+# controller.py
+
+import queue
+import threading
+import time
+from array import array
+from collections import deque, namedtuple
+
+import events
+
+# Keadaan mesin yang dipublikasikan ke GUI setelah setiap perintah. Tidak pernah
+# diubah setelah dibuat, jadi aman dibaca dari thread Tk tanpa lock. Pengecualian:
+# `order` adalah log milik controller yang hanya ditambah selama satu generasi
+# keranjang; pembaca hanya boleh memakai order[:order_length].
+Snapshot = namedtuple('Snapshot', (
+    'version', 'state', 'total_price', 'money_inserted', 'change_to_return', 'change_bills',
+    'cart_generation', 'order', 'order_length', 'products', 'held', 'discounts', 'inventory',
+))
+
+_INPUT, _FINISH, _TAKE_CHANGE, _STOP = range(4)
+
+
+class MachineController:
+    """
+    Menjalankan VendingMachineDFA di thread pekerja. GUI hanya mengirim perintah
+    (submit, finish, take_change) ke antrian, lalu secara berkala mengambil
+    snapshot terbaru beserta pesan yang terkumpul lewat take(); snapshot yang
+    terlewat di antara dua polling otomatis digabung.
+
+    Input yang datang saat DispensingItem tidak dibuang, melainkan ditahan
+    (maksimal HOLD_LIMIT) dan diproses setelah transaksi selesai dan mesin
+    kembali ke Idle.
+    """
+
+    HOLD_LIMIT = 16
+
+    def __init__(self, dfa, journal=None):
+        if dfa.cart.order is None:
+            raise ValueError("MachineController membutuhkan DFA dengan order_log=True (log urutan untuk GUI).")
+        self.dfa = dfa
+        self.journal = journal
+        # callback(state asal, state tujuan, durasi detik) opsional untuk metrik; dipanggil di thread pekerja
+        self.step_observer = None
+        # callback(event Dispensed) opsional, mis. untuk mencatat penjualan; dipanggil di thread pekerja
+        self.dispense_observer = None
+        self.stats = {'commands': 0, 'steps': 0, 'held': 0, 'dropped': 0, 'max_depth': 0}
+        self._commands = queue.Queue()
+        self._held = deque()
+        self._lock = threading.Lock()
+        self._messages = []
+        self._version = 0
+        self._order_log = array('H')
+        self._order_generation = dfa.cart.generation
+        self._snapshot = self._make_snapshot()
+        self._worker = threading.Thread(target=self._run, name="machine-controller", daemon=True)
+        self._worker.start()
+
+    # --- Dipanggil dari thread GUI ---
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def submit(self, symbol):
+        self._put((_INPUT, symbol))
+
+    def finish(self):
+        """Menyelesaikan DispensingItem (dipanggil setelah animasi selesai)."""
+        self._put((_FINISH, None))
+
+    def take_change(self):
+        """Kembalian diambil: transaksi ditutup dan mesin kembali ke Idle."""
+        self._put((_TAKE_CHANGE, None))
+
+    def take(self):
+        """Snapshot terbaru dan semua pesan sejak pemanggilan sebelumnya."""
+        with self._lock:
+            messages, self._messages = self._messages, []
+            return self._snapshot, messages
+
+    def queue_depth(self):
+        return self._commands.qsize()
+
+    def wait_idle(self, timeout=1.0):
+        """Menunggu sampai semua perintah yang sudah dikirim selesai diproses (untuk tes/skrip)."""
+        deadline = time.monotonic() + timeout
+        while self._commands.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.001)
+        return not self._commands.unfinished_tasks
+
+    def close(self, timeout=5.0):
+        """
+        Menghentikan thread pekerja setelah semua perintah yang sudah diantrekan
+        diproses. True jika thread benar-benar berhenti dalam `timeout` detik;
+        sebelum itu observer (mis. dispense_observer) masih bisa dipanggil.
+        """
+        self._commands.put((_STOP, None))
+        self._worker.join(timeout=timeout)
+        return not self._worker.is_alive()
+
+    def _put(self, command):
+        self._commands.put(command)
+        self.stats['commands'] += 1
+        self.stats['max_depth'] = max(self.stats['max_depth'], self._commands.qsize())
+
+    # --- Thread pekerja ---
+
+    def _run(self):
+        while True:
+            command, symbol = self._commands.get()
+            try:
+                if command == _STOP:
+                    break
+                messages = []
+                if command == _INPUT:
+                    self._input(symbol, messages)
+                elif command == _FINISH:
+                    if self.dfa.current_state == 'DispensingItem':
+                        messages.append(str(self._step(None)))
+                elif command == _TAKE_CHANGE:
+                    self.dfa.reset()
+                    if self.journal is not None:
+                        self.journal.end()
+                    # Input yang ditahan selama pengeluaran diproses untuk transaksi berikutnya
+                    while self._held and self.dfa.current_state != 'DispensingItem':
+                        self._input(self._held.popleft(), messages)
+                self._publish(messages)
+            except Exception as e:
+                self._publish([f"ERROR: {e}"])
+            finally:
+                self._commands.task_done()
+
+    def _input(self, symbol, messages):
+        if self.dfa.current_state == 'DispensingItem':
+            if len(self._held) >= self.HOLD_LIMIT:
+                self.stats['dropped'] += 1
+            else:
+                self._held.append(symbol)
+                self.stats['held'] += 1
+            return
+        messages.append(str(self._step(symbol)))
+
+    def _step(self, symbol):
+        dfa = self.dfa
+        observer = self.step_observer
+        if observer is None:
+            event = dfa.step(symbol)
+        else:
+            from_state = dfa.current_state
+            start = time.perf_counter()
+            event = dfa.step(symbol)
+            observer(from_state, dfa.current_state, time.perf_counter() - start)
+        if self.journal is not None:
+            self.journal.record(symbol, dfa, event)
+        if self.dispense_observer is not None and event.__class__ is events.Dispensed:
+            self.dispense_observer(event)
+        self.stats['steps'] += 1
+        return event
+
+    def _make_snapshot(self):
+        dfa = self.dfa
+        cart = dfa.cart
+        pricer = dfa.pricer
+        inventory = dfa.inventory if dfa.current_state == 'WaitingForPayment' else None
+        log = self._order_log
+        if cart.generation != self._order_generation:
+            # Log baru per generasi; log lama tetap utuh untuk snapshot yang masih dipegang GUI
+            self._order_generation = cart.generation
+            log = self._order_log = array('H')
+        if len(cart.order) > len(log):
+            log.extend(cart.order[len(log):])  # hanya item yang ditambahkan sejak snapshot sebelumnya
+        return Snapshot(
+            version=self._version,
+            state=dfa.current_state,
+            total_price=dfa.total_price,
+            money_inserted=dfa.money_inserted,
+            change_to_return=dfa.change_to_return,
+            change_bills=tuple(dfa.change_bills),
+            # Berganti setiap cart.clear(); memberi tahu GUI untuk menggambar ulang list pesanan
+            cart_generation=cart.generation,
+            order=log,
+            order_length=len(log),
+            products=cart.products,
+            held=len(self._held),
+            # (nama aturan, potongan) dari Pricer; dihitung hanya jika ada potongan
+            discounts=pricer.applied() if pricer is not None and pricer.adjustment else (),
+            # Salinan kaset kembalian selama menunggu pembayaran (untuk menyaring saran uang di GUI)
+            inventory=inventory.copy() if inventory is not None else None,
+        )
+
+    def _publish(self, messages):
+        self._version += 1
+        snapshot = self._make_snapshot()
+        with self._lock:
+            self._snapshot = snapshot
+            self._messages.extend(message for message in messages if message)
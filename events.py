@@ -0,0 +1,139 @@
+# events.py
+"""
+Event hasil transisi VendingMachineDFA.step. Setiap event hanya menyimpan
+field numerik/referensi; teks berbahasa Indonesia baru dibuat saat str(event)
+dipanggil (misalnya oleh GUI lewat delta).
+"""
+
+from operator import itemgetter
+
+from cart import format_counts
+
+_count = itemgetter(1)
+
+
+class Event:
+    __slots__ = ()
+
+    def __str__(self):
+        return ""
+
+
+class Message(Event):
+    """Event dengan teks tetap (petunjuk, input tidak valid, input diabaikan)."""
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __str__(self):
+        return self.text
+
+
+class OrderCancelled(Message):
+    """Pesanan dibatalkan sebelum pembayaran (keranjang dikosongkan)."""
+    __slots__ = ()
+
+
+class ItemAdded(Event):
+    __slots__ = ('item', 'total', 'first')
+
+    def __init__(self, item, total, first):
+        self.item = item
+        self.total = total
+        self.first = first
+
+    def __str__(self):
+        if self.first:
+            return f"'{self.item}' ditambahkan. Pilih scoop lagi atau tekan 'Next'."
+        return item_added_text(self.item, self.total)
+
+
+def item_added_text(item, total):
+    """Teks ItemAdded untuk item kedua dan seterusnya (dipakai langsung oleh delta versi tabel)."""
+    return f"'{item}' ditambahkan. Total: Rp {total}."
+
+
+class OrderConfirmed(Event):
+    __slots__ = ('total',)
+
+    def __init__(self, total):
+        self.total = total
+
+    def __str__(self):
+        return f"Pesanan dikonfirmasi. Total: Rp {self.total}. Silakan masukkan uang."
+
+
+class PaymentReceived(Event):
+    __slots__ = ('amount', 'inserted', 'total')
+
+    def __init__(self, amount, inserted, total):
+        self.amount = amount
+        self.inserted = inserted
+        self.total = total
+
+    @property
+    def paid(self):
+        return self.inserted >= self.total
+
+    def __str__(self):
+        output = f"Uang Rp {self.amount} diterima. Total dimasukkan: Rp {self.inserted}."
+        if self.paid:
+            return output + "\nPembayaran cukup. Memproses pesanan..."
+        return output + f" Masih kurang Rp {self.total - self.inserted}."
+
+
+class PaymentRejected(Event):
+    """Uang ditolak karena kembalian pas tidak bisa diberikan dari kaset."""
+    __slots__ = ('amount',)
+
+    def __init__(self, amount):
+        self.amount = amount
+
+    def __str__(self):
+        return f"Uang Rp {self.amount} ditolak. Kembalian pas tidak tersedia, silakan gunakan pecahan lain."
+
+
+class PaymentCancelled(Event):
+    __slots__ = ('refund',)
+
+    def __init__(self, refund):
+        self.refund = refund
+
+    def __str__(self):
+        return f"Pembayaran dibatalkan. Uang Anda sebesar Rp {self.refund} dikembalikan."
+
+
+class Dispensed(Event):
+    """
+    Pesanan dikeluarkan. Menyimpan salinan jumlah per produk; pasangan
+    (nama produk, jumlah) di `items` baru dibuat saat dibaca.
+    """
+    __slots__ = ('products', 'counts', 'total', 'inserted', 'change')
+
+    def __init__(self, products, counts, total, inserted, change):
+        self.products = products
+        self.counts = counts
+        self.total = total
+        self.inserted = inserted
+        self.change = change
+
+    @property
+    def items(self):
+        return tuple(filter(_count, zip(self.products, self.counts)))
+
+    def __str__(self):
+        output = f"Mengeluarkan [{format_counts(self.products, self.counts)}].\n"
+        if self.change > 0:
+            return output + f"Silakan ambil kembalian Anda: Rp {self.change}.\nTerima Kasih"
+        return output + "Tidak ada kembalian."
+
+
+# Event tetap dipakai ulang agar transisi tanpa data tidak mengalokasikan objek baru
+IGNORED = Message("")
+CHOOSE_ICE_CREAM_FIRST = Message("Silakan pilih es krim terlebih dahulu.")
+CHOOSE_TOPPING = Message("Pilih topping atau langsung 'Checkout'.")
+INVALID_SCOOP_INPUT = Message("Input tidak valid. Pilih scoop, 'Next', atau 'Cancel'.")
+INVALID_TOPPING_INPUT = Message("Input tidak valid. Pilih topping, 'Checkout', atau 'Cancel'.")
+ORDER_CANCELLED = OrderCancelled("Pesanan dibatalkan.")
+EMPTY_CART_CANCELLED = OrderCancelled("Keranjang kosong. Pesanan dibatalkan.")
@@ -0,0 +1,219 @@
+# fleet.py
+
+import random
+import time
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+from replay import generate_transactions
+from compiled_dfa import (
+    CompiledVendingMachineDFA, A_NOOP, A_ADD_FIRST, A_ADD, A_CHECKOUT,
+    A_CANCEL_ORDER, A_PAY, A_REFUND, A_DISPENSE
+)
+
+# Kode simbol untuk kolom yang sudah habis (urutan yang lebih pendek)
+PAD = -1
+CODE_DTYPE = np.int32
+_PLAIN_TYPES = {str, int, type(None)}
+
+FleetResult = namedtuple('FleetResult', ['states', 'change_to_return', 'total_price', 'money_inserted'])
+
+
+class VendingMachineFleet:
+    """
+    Simulasi N mesin sekaligus. State setiap mesin disimpan dalam array NumPy
+    (kode state, total harga, uang masuk, jumlah per produk) dan semua mesin
+    dimajukan satu kolom simbol per langkah memakai tabel CompiledVendingMachineDFA.
+    """
+
+    def __init__(self, n_machines, dfa=None):
+        if dfa is not None and (dfa.pricer is not None or dfa.inventory is not None):
+            # Tabel fleet hanya memuat harga katalog dan kembalian tak terbatas
+            raise ValueError("VendingMachineFleet tidak mendukung DFA dengan aturan harga (pricing) "
+                             "atau kaset kembalian (inventory).")
+        self.dfa = dfa if dfa is not None else CompiledVendingMachineDFA()
+        self.n_machines = n_machines
+        self._compile_tables()
+        self.reset()
+
+    def _compile_tables(self):
+        dfa = self.dfa
+        self.state_names = tuple(dfa._state_names)
+        self._n_cols = dfa._n_cols
+        self._idle = dfa._state_ids['Idle']
+        self._waiting = dfa._state_ids['WaitingForPayment']
+        self._dispensing = dfa._state_ids['DispensingItem']
+
+        self._next = np.array([dfa._state_ids[name] for name in dfa._next], dtype=np.int8)
+        self._action = np.array(dfa._action, dtype=np.int8)
+        self._prices = np.array(dfa._prices, dtype=np.int64)
+        self.products = tuple(dfa._products)
+
+        # Kode simbol: kolom string mengikuti tabel DFA, lalu satu kode INVALID untuk semua
+        # simbol tak dikenal. Uang dikodekan lewat nominalnya: money_base + nominal.
+        self._codes = dict(dfa._symbol_ids)
+        self._other_code = len(self._codes)
+        self._money_base = self._other_code + 1
+        self._money_col = dfa._money_col
+        self._max_amount = np.iinfo(CODE_DTYPE).max - self._money_base
+        col_of = [dfa._symbol_ids[name] for name in sorted(dfa._symbol_ids, key=dfa._symbol_ids.get)]
+        self._col_of = np.array(col_of + [dfa._other_col], dtype=np.int64)
+
+    def _code(self, symbol):
+        """Kode satu simbol, mengikuti cara step mengenali simbol (isinstance int = uang)."""
+        code = self._codes.get(symbol) if isinstance(symbol, str) else None
+        if code is not None:
+            return code
+        if isinstance(symbol, int) and 0 <= symbol <= self._max_amount:
+            # Nominal di luar alphabet tetap diterima seperti pada delta
+            return self._money_base + symbol
+        return self._other_code
+
+    def _columns(self, codes):
+        """Kolom tabel DFA dan nominal uang untuk array kode (tanpa PAD)."""
+        money = codes >= self._money_base
+        col = np.where(money, self._money_col, self._col_of[np.minimum(codes, self._other_code)])
+        return col, np.where(money, codes - self._money_base, 0)
+
+    def reset(self):
+        """Mengembalikan semua mesin ke kondisi awal."""
+        n = self.n_machines
+        self.states = np.full(n, self._idle, dtype=np.int8)
+        self.total_price = np.zeros(n, dtype=np.int64)
+        self.money_inserted = np.zeros(n, dtype=np.int64)
+        self.change_to_return = np.zeros(n, dtype=np.int64)
+        self.item_counts = np.zeros((n, len(self.products)), dtype=np.int32)
+
+    def encode(self, sequences):
+        """
+        Mengubah daftar urutan simbol (satu urutan per mesin) menjadi matriks kode
+        berukuran (n_mesin, panjang_maksimum). Urutan yang lebih pendek diisi PAD.
+
+        Simbol diratakan menjadi satu list, kodenya dihitung sekali per simbol
+        berbeda, lalu disebar ke matriks dengan mask panjang. Semua simbol tak
+        dikenal berbagi satu kode INVALID; nominal uang di luar rentang kode
+        (negatif atau melebihi int32) juga dianggap INVALID.
+        """
+        lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+        width = int(lengths.max()) if len(sequences) else 0
+        codes = np.full((len(sequences), width), PAD, dtype=CODE_DTYPE)
+        flat = list(chain.from_iterable(sequences))
+        if not flat:
+            return codes
+        if set(map(type, flat)) <= _PLAIN_TYPES:
+            keys = flat
+            table = {symbol: self._code(symbol) for symbol in dict.fromkeys(flat)}
+        else:
+            # Ada tipe yang bisa sama dengan int sebagai kunci dict (2000.0, True):
+            # sertakan tipenya agar 2000.0 tidak ikut memakai kode 2000
+            keys = list(zip(map(type, flat), flat))
+            table = {key: self._code(key[1]) for key in dict.fromkeys(keys)}
+        codes[np.arange(width) < lengths[:, None]] = np.fromiter(
+            map(table.__getitem__, keys), dtype=CODE_DTYPE, count=len(keys))
+        return codes
+
+    def step(self, column):
+        """Memajukan semua mesin dengan satu kolom kode simbol."""
+        column = np.asarray(column)
+        active = column != PAD
+        col, value = self._columns(np.where(active, column, self._other_code))
+        cell = self.states.astype(np.int64) * self._n_cols + col
+        action = np.where(active, self._action[cell], A_NOOP)
+        next_state = np.where(active, self._next[cell], self.states)
+
+        adding = (action == A_ADD) | (action == A_ADD_FIRST)
+        if adding.any():
+            rows = np.nonzero(adding)[0]
+            self.item_counts[rows, col[rows]] += 1
+            self.total_price[rows] += self._prices[col[rows]]
+
+        paying = action == A_PAY
+        if paying.any():
+            self.money_inserted[paying] += value[paying]
+            paid = paying & (self.money_inserted >= self.total_price)
+            next_state[paid] = self._dispensing
+
+        refunding = action == A_REFUND
+        self.change_to_return[refunding] = self.money_inserted[refunding]
+
+        dispensing = action == A_DISPENSE
+        self.change_to_return[dispensing] = self.money_inserted[dispensing] - self.total_price[dispensing]
+
+        checkout = action == A_CHECKOUT
+        if checkout.any():
+            empty = checkout & (self.item_counts.sum(axis=1) == 0)
+            next_state[checkout & ~empty] = self._waiting
+            resetting = (action == A_CANCEL_ORDER) | empty
+        else:
+            resetting = action == A_CANCEL_ORDER
+        if resetting.any():
+            next_state[resetting] = self._idle
+            self.total_price[resetting] = 0
+            self.money_inserted[resetting] = 0
+            self.change_to_return[resetting] = 0
+            self.item_counts[resetting] = 0
+
+        self.states = next_state.astype(np.int8)
+
+    def run(self, codes, finish=True):
+        """
+        Menjalankan matriks kode kolom demi kolom. Jika finish=True, mesin yang
+        berakhir di 'DispensingItem' diselesaikan seperti App.finish_transaction.
+        """
+        for column in np.asarray(codes).T:
+            self.step(column)
+        if finish:
+            dispensing = self.states == self._dispensing
+            if dispensing.any():
+                self.step(np.where(dispensing, self._other_code, PAD))
+        return FleetResult(self.states.copy(), self.change_to_return.copy(),
+                           self.total_price.copy(), self.money_inserted.copy())
+
+    @classmethod
+    def run_batch(cls, sequences, finish=True):
+        """Mensimulasikan satu transaksi per urutan simbol dan mengembalikan hasil akhirnya."""
+        fleet = cls(len(sequences))
+        return fleet.run(fleet.encode(sequences), finish=finish)
+
+
+def check_parity(n=5000, seed=1, unknown_run=70000):
+    """
+    Membandingkan hasil VendingMachineFleet dengan menjalankan CompiledVendingMachineDFA satu per satu.
+    unknown_run adalah panjang satu urutan berisi simbol tak dikenal yang semuanya berbeda.
+    """
+    rng = random.Random(seed)
+    dfa = CompiledVendingMachineDFA()
+    symbols = sorted(dfa.alphabet, key=lambda s: (isinstance(s, int), str(s))) + [None, 'Unknown', 3000, 2000.0, True]
+    sequences = [seq for _, seq in generate_transactions(n, seed)] + [
+        [rng.choice(symbols) for _ in range(rng.randint(1, 20))] for _ in range(n)
+    ]
+    # Banyak simbol tak dikenal yang berbeda tidak boleh menghabiskan ruang kode
+    sequences.append(['Vanilla Scoop'] + [f"tidak-dikenal-{i}" for i in range(unknown_run)] + ['Next', 'Checkout', 40000 + 1000])
+    fleet = VendingMachineFleet(len(sequences))
+    result = fleet.run(fleet.encode(sequences))
+    for i, seq in enumerate(sequences):
+        dfa.reset()
+        for symbol in seq:
+            dfa.delta(symbol)
+        if dfa.current_state == 'DispensingItem':
+            dfa.delta(None)
+        actual = (fleet.state_names[result.states[i]], int(result.change_to_return[i]),
+                  int(result.total_price[i]), int(result.money_inserted[i]))
+        expected = (dfa.current_state, dfa.change_to_return, dfa.total_price, dfa.money_inserted)
+        if actual != expected:
+            raise AssertionError(f"Mesin {i} berbeda: {actual} != {expected} untuk {seq}")
+
+
+if __name__ == "__main__":
+    check_parity()
+    customers = [seq for _, seq in generate_transactions(1_000_000)]
+    start = time.perf_counter()
+    fleet = VendingMachineFleet(len(customers))
+    codes = fleet.encode(customers)
+    encoded = time.perf_counter()
+    result = fleet.run(codes)
+    done = time.perf_counter()
+    print(f"Parity OK. {len(customers)} pelanggan: encode {encoded - start:.2f} dtk, "
+          f"simulasi {done - encoded:.2f} dtk, total kembalian Rp {int(result.change_to_return.sum())}")
@@ -0,0 +1,308 @@
+# journal.py
+"""
+Jurnal transaksi (write-ahead) di file yang dipetakan ke memori (mmap).
+
+Setiap simbol yang diproses DFA ditulis sebagai record biner berukuran tetap
+16 byte ke file yang sudah dialokasikan di awal, sehingga satu append hanya
+berupa penulisan ke memori. Data baru di-flush (msync) ke disk pada event
+pembayaran dan saat transaksi selesai.
+
+Saat aplikasi dijalankan ulang, transaksi terakhir yang belum selesai
+dibangun kembali: isi kaset dan jam harga di awal transaksi dipulihkan dari
+jurnal, lalu simbolnya diputar ulang lewat DFA. State, uang masuk, dan hasil
+setiap uang (diterima / ditolak) dibandingkan dengan yang tercatat per
+langkah; jika ada yang berbeda, pemulihan ditolak (ValueError) alih-alih
+melanjutkan transaksi dengan uang yang salah.
+
+Tata letak file:
+    header (HEADER_SIZE byte): magic, versi, ukuran record, kapasitas, head,
+        awal transaksi terbuka, id transaksi berikutnya
+    record: id transaksi (uint32), jenis (uint8), state setelah transisi (uint8),
+        kode simbol (uint16), nominal uang (int32), money_inserted (int32)
+
+Jenis record selain simbol:
+    CASSETTE  isi kaset di awal transaksi, satu record per pecahan
+              (nominal = pecahan, money_inserted = jumlah lembar)
+    PRICING   jam yang dikunci Pricer untuk transaksi ini (nominal = jam), agar
+              pemulihan tidak menghitung ulang harga happy hour dengan jam restart
+    SYMTAB    definisi kode simbol: nama UTF-8 dalam potongan 8 byte
+              (id transaksi = urutan potongan, state = jumlah potongan).
+              Tabel simbol tumbuh bersama aliran record dan ditulis ulang di
+              awal area setiap kali penulisan kembali ke awal (wrap), sehingga
+              semua definisi selalu ada di antara record 0 dan head.
+"""
+
+import mmap
+import os
+import struct
+
+import events
+
+MAGIC = b'VMJ1'
+VERSION = 2
+HEADER_SIZE = 4096
+_HEADER = struct.Struct('<4sHHIQqI')
+_UINT32 = struct.Struct('<I')
+_HEAD = struct.Struct('<Q')
+_OPEN = struct.Struct('<q')
+_CAPACITY_OFFSET = 8
+_HEAD_OFFSET = 12
+_OPEN_OFFSET = 20
+_NEXT_TXN_OFFSET = 28
+RECORD = struct.Struct('<IBBHii')
+# Tata letak yang sama dengan RECORD, tapi 8 byte terakhir berisi potongan nama simbol
+_SYMTAB_RECORD = struct.Struct('<IBBH8s')
+_SYMTAB_CHUNK = 8
+
+BEGIN, SYMBOL, END, REJECTED, CASSETTE, SYMTAB, PRICING = 1, 2, 3, 4, 5, 6, 7
+MONEY_SYMBOL = 0xFFFF    # simbol berupa uang; nominal ada di field uang
+AUTO_SYMBOL = 0xFFFE     # transisi otomatis (delta(None))
+INVALID_CODE = 0xFFFD    # simbol di luar alfabet DFA; semuanya diperlakukan sama oleh DFA
+MAX_SYMBOL_CODE = 0xFFFC
+
+# Pengganti simbol di luar alfabet saat diputar ulang (tidak pernah sama dengan produk mana pun)
+INVALID_SYMBOL = object()
+
+STATES = ('Idle', 'IceCreamSelection', 'ToppingSelection', 'WaitingForPayment',
+          'DispensingItem', 'ReturningChange')
+_STATE_CODES = {name: code for code, name in enumerate(STATES)}
+
+# Event yang memicu flush ke disk: setiap perubahan pada uang pelanggan
+_DURABLE_EVENTS = (events.PaymentReceived, events.PaymentCancelled, events.Dispensed)
+
+
+class Journal:
+    """
+    Jurnal append-only untuk satu mesin. Jika ruang tersisa tidak cukup saat
+    transaksi baru dimulai, penulisan kembali ke awal area record (transaksi
+    lama sudah selesai sehingga aman ditimpa); jika satu transaksi yang sedang
+    berjalan memenuhi file, file diperbesar dua kali lipat.
+    """
+
+    # Ruang minimum (record) yang harus tersisa untuk memulai transaksi tanpa wrap
+    WRAP_RESERVE = 256
+
+    def __init__(self, path, capacity=65536):
+        self.path = path
+        self.stats = {'appends': 0, 'flushes': 0, 'wraps': 0, 'grows': 0}
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE
+        self._file = open(path, 'r+b' if exists else 'w+b')
+        if not exists:
+            self._file.truncate(HEADER_SIZE + capacity * RECORD.size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+        if exists:
+            magic, version, record_size, capacity, head, open_start, next_txn = _HEADER.unpack_from(self._mm, 0)
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                raise ValueError(f"{path} bukan file jurnal yang valid.")
+        else:
+            head, open_start, next_txn = 0, -1, 1
+            _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, RECORD.size, capacity, head, open_start, next_txn)
+            self._mm.flush()
+
+        self.capacity = capacity
+        self.head = head
+        self.open_start = open_start
+        self.next_txn = next_txn
+        self.symbols = self._read_symbol_table()
+        self._symbol_codes = {symbol: code for code, symbol in enumerate(self.symbols) if symbol is not None}
+        self._txn = next_txn - 1 if open_start >= 0 else 0
+
+    def _read_symbol_table(self):
+        """Kode -> nama dari record SYMTAB di antara record 0 dan head (None = definisi tidak lengkap)."""
+        chunks = {}
+        area = memoryview(self._mm)[HEADER_SIZE:HEADER_SIZE + self.head * RECORD.size]
+        try:
+            for index, kind, n_chunks, code, data in _SYMTAB_RECORD.iter_unpack(area):
+                if kind == SYMTAB:
+                    parts = chunks.setdefault(code, [None] * n_chunks)
+                    if index < len(parts):
+                        parts[index] = data
+        finally:
+            area.release()
+        symbols = [None] * (max(chunks) + 1 if chunks else 0)
+        for code, parts in chunks.items():
+            if None not in parts:
+                symbols[code] = b''.join(parts).rstrip(b'\0').decode('utf-8')
+        return symbols
+
+    # --- Penulisan ---
+
+    def _write_symbol(self, code, symbol):
+        data = symbol.encode('utf-8')
+        n_chunks = max(-(-len(data) // _SYMTAB_CHUNK), 1)
+        if n_chunks > 0xFF:
+            raise ValueError(f"Nama simbol terlalu panjang untuk jurnal: {symbol[:40]!r}...")
+        for index in range(n_chunks):
+            if self.head >= self.capacity:
+                self._grow()
+            _SYMTAB_RECORD.pack_into(self._mm, HEADER_SIZE + self.head * RECORD.size, index, SYMTAB, n_chunks,
+                                     code, data[index * _SYMTAB_CHUNK:(index + 1) * _SYMTAB_CHUNK])
+            self.head += 1
+        _HEAD.pack_into(self._mm, _HEAD_OFFSET, self.head)
+
+    def _symbol_code(self, symbol, dfa):
+        if symbol is None:
+            return AUTO_SYMBOL, 0
+        if isinstance(symbol, int):
+            return MONEY_SYMBOL, symbol
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            if symbol not in dfa.alphabet:
+                return INVALID_CODE, 0  # tabel hanya memuat alfabet, bukan input sembarang
+            # Simbol baru jarang muncul; definisinya ikut aliran record
+            code = len(self.symbols)
+            if code > MAX_SYMBOL_CODE:
+                raise ValueError("Tabel simbol jurnal penuh.")
+            self._symbol_codes[symbol] = code
+            self.symbols.append(symbol)
+            self._write_symbol(code, symbol)
+        return code, 0
+
+    def _append(self, kind, state, symbol_code, amount, money_inserted):
+        if self.head >= self.capacity:
+            self._grow()
+        RECORD.pack_into(self._mm, HEADER_SIZE + self.head * RECORD.size,
+                         self._txn, kind, _STATE_CODES.get(state, 0xFF), symbol_code, amount, money_inserted)
+        self.head += 1
+        _HEAD.pack_into(self._mm, _HEAD_OFFSET, self.head)
+        self.stats['appends'] += 1
+
+    def _grow(self):
+        self._mm.flush()
+        self._mm.close()
+        self.capacity *= 2
+        self._file.truncate(HEADER_SIZE + self.capacity * RECORD.size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        _UINT32.pack_into(self._mm, _CAPACITY_OFFSET, self.capacity)
+        self.stats['grows'] += 1
+
+    def _begin(self, state, dfa):
+        if self.head + self.WRAP_RESERVE > self.capacity:
+            self.head = 0
+            self.stats['wraps'] += 1
+            # Definisi lama akan tertimpa; tulis ulang di awal agar tetap ada sebelum head
+            for code, symbol in enumerate(self.symbols):
+                if symbol is not None:
+                    self._write_symbol(code, symbol)
+        self._txn = self.next_txn
+        self.next_txn += 1
+        self.open_start = self.head
+        _UINT32.pack_into(self._mm, _NEXT_TXN_OFFSET, self.next_txn)
+        _OPEN.pack_into(self._mm, _OPEN_OFFSET, self.open_start)
+        self._append(BEGIN, state, 0, 0, 0)
+        if dfa.inventory is not None:
+            # Isi kaset menentukan uang mana yang diterima; tanpa ini pemulihan bisa menerima uang yang tadinya ditolak
+            for bill, count in dfa.inventory.counts.items():
+                self._append(CASSETTE, state, 0, bill, count)
+        if dfa.pricer is not None:
+            # Dipanggil setelah item pertama, jadi jam Pricer sudah terkunci untuk transaksi ini
+            self._append(PRICING, state, 0, dfa.pricer.hour, 0)
+
+    def record(self, symbol, dfa, event):
+        """Mencatat satu simbol yang sudah diproses dfa.step beserta state dan hasilnya."""
+        if self.open_start < 0:
+            if dfa.current_state == 'Idle':
+                return  # input yang diabaikan di Idle tidak membuka transaksi
+            self._begin('Idle', dfa)
+        code, amount = self._symbol_code(symbol, dfa)
+        kind = REJECTED if event.__class__ is events.PaymentRejected else SYMBOL
+        self._append(kind, dfa.current_state, code, amount, dfa.money_inserted)
+        if dfa.current_state == 'Idle':
+            self.end()  # dibatalkan sebelum pembayaran
+        elif isinstance(event, _DURABLE_EVENTS):
+            self.flush()
+
+    def end(self):
+        """Menandai transaksi yang sedang terbuka sebagai selesai dan mem-flush jurnal."""
+        if self.open_start < 0:
+            return
+        self._append(END, 'Idle', 0, 0, 0)
+        self.open_start = -1
+        _OPEN.pack_into(self._mm, _OPEN_OFFSET, -1)
+        self.flush()
+
+    def flush(self):
+        self._mm.flush()
+        self.stats['flushes'] += 1
+
+    def close(self):
+        if self._mm.closed:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+    # --- Pemulihan ---
+
+    def open_transaction(self):
+        """
+        Transaksi yang belum selesai: (isi kaset di awalnya atau None, jam harga
+        atau None, daftar langkah (simbol, state, money_inserted, ditolak)).
+        """
+        if self.open_start < 0:
+            return None, None, []
+        cassette = None
+        hour = None
+        steps = []
+        for index in range(self.open_start, self.head):
+            txn, kind, state, code, amount, money_inserted = RECORD.unpack_from(
+                self._mm, HEADER_SIZE + index * RECORD.size)
+            if txn != self._txn:
+                continue
+            if kind == CASSETTE:
+                cassette = cassette or {}
+                cassette[amount] = money_inserted
+                continue
+            if kind == PRICING:
+                hour = amount
+                continue
+            if kind != SYMBOL and kind != REJECTED:
+                continue
+            if code == MONEY_SYMBOL:
+                symbol = amount
+            elif code == AUTO_SYMBOL:
+                symbol = None
+            elif code < len(self.symbols) and self.symbols[code] is not None:
+                symbol = self.symbols[code]
+            else:
+                symbol = INVALID_SYMBOL
+            steps.append((symbol, STATES[state] if state < len(STATES) else None, money_inserted, kind == REJECTED))
+        return cassette, hour, steps
+
+    def recover(self, dfa):
+        """
+        Membangun ulang transaksi terbuka terakhir di `dfa`: isi kaset di awal
+        transaksi dan jam harga dipulihkan, lalu simbolnya diputar ulang lewat
+        step dan setiap langkah dicocokkan dengan jurnal. Mengembalikan pesan output terakhir,
+        atau None jika tidak ada transaksi yang perlu dipulihkan.
+
+        ValueError jika hasil pemutaran ulang berbeda dari yang tercatat; jurnal
+        dibiarkan apa adanya agar transaksinya bisa diperiksa operator.
+        """
+        cassette, hour, steps = self.open_transaction()
+        if not steps:
+            self.end()
+            return None
+        if (hour is None) != (dfa.pricer is None):
+            raise ValueError(f"Pemulihan jurnal {self.path} tidak cocok: transaksi dicatat "
+                             f"{'tanpa' if hour is None else 'dengan'} aturan harga. Transaksi tidak dilanjutkan.")
+        dfa.reset()
+        if hour is not None:
+            dfa.pricer.reset(hour)
+        if cassette is not None and dfa.inventory is not None:
+            dfa.inventory.counts = cassette
+            dfa.inventory.escrow = []
+        event = None
+        for number, (symbol, state, money_inserted, rejected) in enumerate(steps, 1):
+            event = dfa.step(symbol)
+            was_rejected = event.__class__ is events.PaymentRejected
+            if dfa.current_state != state or dfa.money_inserted != money_inserted or was_rejected != rejected:
+                raise ValueError(
+                    f"Pemulihan jurnal {self.path} tidak cocok pada langkah {number} ({symbol!r}): "
+                    f"state {dfa.current_state} vs {state}, uang Rp {dfa.money_inserted} vs Rp {money_inserted}, "
+                    f"ditolak {was_rejected} vs {rejected}. Transaksi tidak dilanjutkan.")
+        if dfa.current_state == 'Idle':
+            self.end()
+            return None
+        return str(event)
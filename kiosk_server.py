@@ -0,0 +1,261 @@
+# kiosk_server.py
+"""
+Server asyncio yang menampung banyak sesi VendingMachineDFA sekaligus.
+
+Protokol: satu objek JSON per baris lewat TCP.
+    -> {"id": 1, "session": "panel-1", "symbol": "Vanilla Scoop"}
+    -> {"id": 2, "session": "panel-1", "op": "reset"}
+    <- {"id": 1, "session": "panel-1", "state": "IceCreamSelection", "message": "...", ...}
+
+Contoh:
+    python kiosk_server.py serve --port 8765
+    python kiosk_server.py loadtest --spawn --sessions 2000 --connections 32
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from compiled_dfa import CompiledVendingMachineDFA
+from replay import generate_transactions, percentile
+
+
+class Session:
+    __slots__ = ('dfa', 'queue', 'last_seen', 'worker')
+
+    def __init__(self, dfa, queue_size):
+        self.dfa = dfa
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.last_seen = time.monotonic()
+        self.worker = None
+
+
+class KioskServer:
+    """
+    Setiap sesi punya DFA sendiri dan antrian perintah terbatas yang diproses
+    berurutan oleh satu task. Jika antrian sesi penuh, pembacaan dari koneksi
+    pengirim ditahan (backpressure) sampai ada ruang. Sesi yang menganggur
+    lebih lama dari idle_timeout dihapus.
+    """
+
+    def __init__(self, idle_timeout=300.0, queue_size=16, max_in_flight=64, dfa_factory=CompiledVendingMachineDFA):
+        self.idle_timeout = idle_timeout
+        self.queue_size = queue_size
+        self.max_in_flight = max_in_flight  # permintaan yang belum dijawab per koneksi
+        self.dfa_factory = dfa_factory
+        self.sessions = {}
+        self.stats = {'requests': 0, 'sessions_created': 0, 'sessions_evicted': 0, 'errors': 0}
+        self._server = None
+        self._evictor = None
+        self._clients = {}  # task handler koneksi -> writer
+
+    async def start(self, host='127.0.0.1', port=8765):
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self._evictor = asyncio.create_task(self._evict_idle())
+        return self._server
+
+    async def close(self):
+        if self._evictor is not None:
+            self._evictor.cancel()
+        # Menutup koneksi klien agar handler-nya selesai dengan normal (EOF)
+        for writer in self._clients.values():
+            writer.close()
+        if self._clients:
+            await asyncio.wait(list(self._clients), timeout=1)
+        for session in self.sessions.values():
+            session.worker.cancel()
+        self.sessions.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = Session(self.dfa_factory(), self.queue_size)
+            session.worker = asyncio.create_task(self._run_session(session))
+            self.stats['sessions_created'] += 1
+        session.last_seen = time.monotonic()
+        return session
+
+    async def _run_session(self, session):
+        dfa = session.dfa
+        while True:
+            request, future = await session.queue.get()
+            try:
+                if request.get('op') == 'reset':
+                    dfa.reset()
+                    message = ""
+                else:
+                    message = str(dfa.step(request.get('symbol')))
+                result = {
+                    'state': dfa.current_state,
+                    'message': message,
+                    'total_price': dfa.total_price,
+                    'money_inserted': dfa.money_inserted,
+                    'change_to_return': dfa.change_to_return,
+                }
+            except Exception as e:
+                self.stats['errors'] += 1
+                result = {'error': str(e)}
+            session.last_seen = time.monotonic()
+            if not future.cancelled():
+                future.set_result(result)
+
+    async def _evict_idle(self):
+        while True:
+            await asyncio.sleep(min(self.idle_timeout / 2, 30))
+            now = time.monotonic()
+            idle = [sid for sid, s in self.sessions.items()
+                    if now - s.last_seen > self.idle_timeout and s.queue.empty()]
+            for sid in idle:
+                self.sessions.pop(sid).worker.cancel()
+            self.stats['sessions_evicted'] += len(idle)
+
+    async def _handle_client(self, reader, writer):
+        # Jawaban ditulis sesuai urutan permintaan oleh task terpisah
+        pending = asyncio.Queue(maxsize=self.max_in_flight)
+        responder = asyncio.create_task(self._respond(pending, writer))
+        self._clients[asyncio.current_task()] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    session_id = str(request['session'])
+                except (ValueError, KeyError, TypeError) as e:
+                    self.stats['errors'] += 1
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result({'error': f"Permintaan tidak valid: {e}"})
+                    await pending.put((None, None, future))
+                    continue
+                self.stats['requests'] += 1
+                future = asyncio.get_running_loop().create_future()
+                # put() menunggu jika antrian sesi penuh: inilah backpressure per sesi
+                await self._session(session_id).queue.put((request, future))
+                await pending.put((request.get('id'), session_id, future))
+        finally:
+            self._clients.pop(asyncio.current_task(), None)
+            await pending.put(None)
+            try:
+                await responder
+            except ConnectionError:
+                pass
+            writer.close()
+
+    async def _respond(self, pending, writer):
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            request_id, session_id, future = item
+            response = await future
+            response['id'] = request_id
+            response['session'] = session_id
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            if pending.empty():
+                await writer.drain()
+
+
+async def load_test(host, port, n_sessions, n_connections, seed=0):
+    """
+    Menjalankan n_sessions transaksi sintetis (satu sesi per transaksi) lewat
+    n_connections koneksi paralel dan mengukur latensi tiap permintaan.
+    """
+    scripts = list(generate_transactions(n_sessions, seed))
+    latencies = []
+
+    async def client(index):
+        reader, writer = await asyncio.open_connection(host, port)
+        request_id = 0
+
+        async def send(payload):
+            nonlocal request_id
+            request_id += 1
+            payload['id'] = request_id
+            start = time.perf_counter_ns()
+            writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter_ns() - start)
+            return response
+
+        for n in range(index, n_sessions, n_connections):
+            session_id = f"load-{seed}-{n}"
+            response = {}
+            for symbol in scripts[n][1]:
+                response = await send({'session': session_id, 'symbol': symbol})
+            if response.get('state') == 'DispensingItem':
+                await send({'session': session_id, 'symbol': None})
+            await send({'session': session_id, 'op': 'reset'})
+        writer.close()
+        await writer.wait_closed()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(n_connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'sessions': n_sessions,
+        'connections': n_connections,
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'sessions_per_sec': round(n_sessions / elapsed, 1),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'latency_p50_us': round(percentile(latencies, 50) / 1000, 1),
+        'latency_p95_us': round(percentile(latencies, 95) / 1000, 1),
+        'latency_p99_us': round(percentile(latencies, 99) / 1000, 1),
+    }
+
+
+async def _serve(args):
+    server = KioskServer(idle_timeout=args.idle_timeout, queue_size=args.queue_size)
+    tcp = await server.start(args.host, args.port)
+    print(f"Kiosk server berjalan di {args.host}:{args.port}")
+    async with tcp:
+        await tcp.serve_forever()
+
+
+async def _load_test(args):
+    server = None
+    if args.spawn:
+        server = KioskServer()
+        await server.start(args.host, args.port)
+    try:
+        results = await load_test(args.host, args.port, args.sessions, args.connections, args.seed)
+    finally:
+        if server is not None:
+            await server.close()
+    print(json.dumps(results, indent=2))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server multi-sesi VendingMachineDFA berbasis asyncio.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve = sub.add_parser('serve')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--idle-timeout', type=float, default=300.0)
+    serve.add_argument('--queue-size', type=int, default=16)
+
+    load = sub.add_parser('loadtest')
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=8765)
+    load.add_argument('--sessions', type=int, default=2000)
+    load.add_argument('--connections', type=int, default=32)
+    load.add_argument('--seed', type=int, default=0)
+    load.add_argument('--spawn', action='store_true', help="Menjalankan server di proses yang sama.")
+
+    args = parser.parse_args(argv)
+    asyncio.run(_serve(args) if args.command == 'serve' else _load_test(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,52 +2,257 @@
 
 import customtkinter as ctk
 import tkinter as tk
-from PIL import Image
 from vending_machine_dfa import VendingMachineDFA
-import simpleaudio as sa
-from threading import Thread
+from change_maker import make_change
+from cassette import CassetteInventory
+from audio import AudioEngine
+from assets import AssetManager
+from animation import AnimationScheduler
+from journal import Journal
+from virtual_grid import VirtualGrid
+from controller import MachineController
+from cart import format_items
+from analytics import SalesStore, SalesWriter
+from payment_paths import PaymentPaths
+from pricing import PricingEngine
+from catalog import default_catalog
+from metrics import Registry, Instrumentation, SamplingProfiler, serve_metrics
+import os
+import platform
+import time
 from itertools import count
+from collections import deque
 
 class App(ctk.CTk):
+    # Jumlah pesan maksimum yang disimpan di area status (buffer melingkar)
+    NOTIFICATION_LIMIT = 200
+    PRODUCT_IMAGE_SIZE = (100, 80)
+    MONEY_IMAGE_SIZE = (120, 50)
+    # Animasi dispenser: kecepatan jatuh (piksel/detik) dan batas waktu untuk pesanan besar
+    SCOOP_FALL_SPEED = 400
+    TOPPING_FALL_SPEED = 330
+    DISPENSE_STAGGER = 0.35  # jeda antar item untuk pesanan kecil (detik)
+    DISPENSE_BUDGET = 4.0  # batas total jeda antar item, berapa pun jumlah item
+    MAX_ANIMATED_ITEMS = 24
+    JOURNAL_PATH = "kiosk.journal"
+    PRODUCT_ROW_HEIGHT = 150
+    # Gambar di memori (LRU AssetManager): sekitar 4 layar sel grid (~14 sel terlihat) plus gambar uang
+    IMAGE_CACHE_SIZE = 64
+    PREFETCH_PER_CATEGORY = 8  # gambar awal tiap kategori yang disiapkan di latar belakang
+    # Metrik aktif jika salah satu variabel lingkungan ini diisi (atau ditekan F8 saat berjalan)
+    METRICS_FILE_ENV = "VM_METRICS_FILE"
+    METRICS_PORT_ENV = "VM_METRICS_PORT"
+    METRICS_EXPORT_MS = 10000
+    PROFILE_OUTPUT = "profile.folded"
+    POLL_MS = 16  # interval Tk mengambil snapshot terbaru dari controller
+    # Riwayat penjualan kolumnar (lihat analytics.py), ditulis oleh thread SalesWriter. Chunk ditulis
+    # setiap SALES_CHUNK_SIZE penjualan atau paling lambat SALES_MAX_AGE detik setelah penjualan tertua
+    # di buffer; crash kehilangan penjualan yang belum ditulis (jurnal hanya menyimpan transaksi terbuka)
+    SALES_DIR = "sales_data"
+    SALES_CHUNK_SIZE = 256
+    SALES_MAX_AGE = 3600
+    MACHINE_NAME = platform.node() or "kiosk"
+    PAYMENT_SUGGESTION_CEILING = 500000  # sisa tagihan di atasnya dihitung dengan pecahan terbesar dulu
+    PRICING_PATH = "pricing.json"  # aturan promosi opsional (lihat pricing.py); tanpa file = harga katalog
+
     def __init__(self):
+        self._started_at = time.perf_counter()
         super().__init__()
 
-        self.vm_dfa = VendingMachineDFA()
+        # Kaset uang kembalian diisi awal, lalu bertambah dari uang yang dimasukkan pelanggan.
+        # Log urutan keranjang dibutuhkan list pesanan dan animasi dispenser.
+        self.vm_dfa = VendingMachineDFA(inventory=CassetteInventory({2000: 20, 5000: 20, 10000: 10, 20000: 5}),
+                                        pricing=self._load_pricing(), order_log=True)
+        # Setiap input dicatat ke jurnal; transaksi yang terputus (mis. aplikasi crash) dipulihkan di sini
+        self.journal = Journal(self.JOURNAL_PATH)
+        try:
+            recovered = self.journal.recover(self.vm_dfa)
+        except ValueError as e:
+            # Uang pelanggan tidak bisa dipastikan; jangan lanjutkan dengan state yang salah
+            print(f"Error: {e}\nPindahkan {self.JOURNAL_PATH} setelah transaksi diselesaikan secara manual.")
+            self.journal.close()
+            raise SystemExit(1)
+        # Sejak titik ini DFA dan jurnal hanya disentuh oleh thread controller; GUI membaca snapshot
+        self.controller = MachineController(self.vm_dfa, self.journal)
+        self.sales = SalesWriter(SalesStore(self.SALES_DIR, chunk_size=self.SALES_CHUNK_SIZE,
+                                            max_age=self.SALES_MAX_AGE))
+        self.controller.dispense_observer = self._record_sale
+        self._snapshot = self.controller.snapshot
+        # Saran lembar uang untuk sisa tagihan; tabel dibangun sekali, query saat render cukup indeks array
+        self.payment_paths = PaymentPaths([s for s in self.vm_dfa.alphabet if isinstance(s, int)],
+                                          ceiling=self.PAYMENT_SUGGESTION_CEILING)
         self.title("Vending Machine Es Krim")
         self.geometry("1000x720")
         self.minsize(800, 600) # Menetapkan ukuran minimum jendela
         ctk.set_appearance_mode("dark")
 
-        self.item_types = {
-            'Vanilla Scoop': 'scoop', 'Chocolate Scoop': 'scoop',
-            'Caramel': 'topping', 'Sprinkles': 'topping'
-        }
-        self.item_colors = {
-            'Vanilla Scoop': '#FFFACD', # LemonChiffon
-            'Chocolate Scoop': '#8B4513', # SaddleBrown
-            'Caramel': '#D2691E', # Chocolate
-            'Sprinkles': '#FF69B4'  # HotPink (sebagai representasi)
-        }
-        self.dispenser_item_queue = []
+        # Katalog bersama dengan DFA: jenis, harga, warna dan gambar per produk
+        self.catalog = self.vm_dfa.catalog
+        # Snapshot render terakhir, agar update_gui hanya menyentuh widget yang berubah
+        self._rendered = {}
+        self._button_states = {}
+        self._order_rows = {}  # id produk -> jumlah yang sedang ditampilkan
+        self._order_placeholder = False
+        self._order_generation = None  # generasi keranjang yang sedang ditampilkan (berganti saat cart.clear)
+        self._order_seen = 0  # jumlah entri log yang sudah diterapkan ke list pesanan
+        self._notification_lines = deque()  # jumlah baris per pesan di area status
+        self._missing_images = set()  # produk yang gambarnya gagal dimuat (tidak dicoba lagi)
 
         # self.animation_frames = []
         # self.animation_job = None
 
         self.load_assets()
         self.setup_ui()
+        self._setup_metrics()
         self.update_gui("Selamat datang! Silakan pilih es krim.")
+        if recovered is not None:
+            self._resume_transaction(recovered)
+        self._poll_controller()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        # Gambar baris pertama tiap kategori (mis. topping) disiapkan di latar belakang
+        self.assets.prefetch([(self._product_image_path(name), self.PRODUCT_IMAGE_SIZE)
+                              for category in self.catalog.categories
+                              for name in self.catalog.category(category)[:self.PREFETCH_PER_CATEGORY]])
+        self.after_idle(self._report_startup)
 
     def load_assets(self):
         try:
-            self.product_images = {name: ctk.CTkImage(Image.open(f"assets/images/{name}.png"), size=(100, 80)) for name in self.vm_dfa.menu_prices}
-            self.money_images = {val: ctk.CTkImage(Image.open(f"assets/images/{val}.png"), size=(120, 50)) for val in [2000, 5000, 10000, 20000]}
-            self.clicked_sound = sa.WaveObject.from_wave_file("assets/sounds/clicked.wav")
-            self.take_change_sound = sa.WaveObject.from_wave_file("assets/sounds/take_change.wav")
-            self.ice_cream_sound = sa.WaveObject.from_wave_file("assets/sounds/ice_cream.wav")
+            # Gambar produk dimuat saat tombolnya pertama kali terlihat (lihat _bind_product_cell)
+            self.assets = AssetManager(widget=self, max_images=self.IMAGE_CACHE_SIZE)
+            self.money_images = {val: self.assets.image(f"assets/images/{val}.png", self.MONEY_IMAGE_SIZE) for val in [2000, 5000, 10000, 20000]}
+            # Semua suara didekode sekali dan diputar oleh satu thread audio bersama
+            self.audio = AudioEngine.from_files({
+                'clicked': "assets/sounds/clicked.wav",
+                'take_change': "assets/sounds/take_change.wav",
+                'ice_cream': "assets/sounds/ice_cream.wav",
+            }, min_interval={'clicked': 0.08, 'take_change': 0.5, 'ice_cream': 0.5})
         except Exception as e:
             print(f"Error loading assets: {e}")
             self.destroy() # Keluar jika aset gagal dimuat
 
+    def _load_pricing(self):
+        if not os.path.exists(self.PRICING_PATH):
+            return None
+        try:
+            return PricingEngine.load(self.PRICING_PATH, default_catalog())
+        except (OSError, ValueError) as e:
+            print(f"Error loading pricing rules: {e}")
+            return None
+
+    def _product_image_path(self, name):
+        return self.catalog.by_name[name].image
+
+    def _report_startup(self):
+        """Mencetak waktu muat per aset dan waktu sampai jendela pertama kali digambar."""
+        first_paint = time.perf_counter() - self._started_at
+        self._m_startup.set(first_paint)
+        print(f"Waktu sampai tampilan pertama: {first_paint * 1000:.1f} ms\nWaktu muat aset:\n{self.assets.report()}")
+
+    def _record_sale(self, event):
+        """Dipanggil dari thread controller setiap kali pesanan dikeluarkan; hanya mengantrikan ke SalesWriter."""
+        self.sales.record(event, machine=self.MACHINE_NAME)
+
+    def _on_close(self):
+        """Menghentikan controller lalu menulis sisa data penjualan dan jurnal sebelum keluar."""
+        stopped = self.controller.close()
+        if not self.sales.close():
+            print("Error: penulis data penjualan tidak selesai tepat waktu.")
+        if stopped:
+            self.journal.close()
+        else:
+            # Thread controller masih bisa menulis ke jurnal; mmap ditutup oleh proses saat keluar
+            print("Error: controller tidak berhenti tepat waktu; penjualan terakhir mungkin tidak tercatat.")
+        self.audio.close()
+        self.destroy()
+
+    def _resume_transaction(self, message):
+        """Menampilkan transaksi yang dipulihkan dari jurnal dan melanjutkannya."""
+        self.update_gui(f"Transaksi sebelumnya dipulihkan.\n{message}")
+        if self._snapshot.state == 'DispensingItem':
+            self.show_animation()
+        elif self._snapshot.state == 'ReturningChange':
+            self.show_change()
+
+    def _setup_metrics(self):
+        """Mendaftarkan metrik; pengukuran baru dipasang saat metrik diaktifkan (lihat set_metrics_enabled)."""
+        self.metrics = Registry()
+        self._instrumentation = Instrumentation()
+        self._profiler = None
+        self._metrics_export_job = None
+        self.metrics_enabled = False
+        self.metrics_file = os.environ.get(self.METRICS_FILE_ENV)
+        port = os.environ.get(self.METRICS_PORT_ENV)
+
+        self._m_transitions = self.metrics.counter(
+            'vm_transitions_total', "Transisi DFA per state asal dan tujuan.", ('from_state', 'to_state'))
+        self._m_delta = self.metrics.histogram('vm_delta_seconds', "Durasi satu transisi DFA (step).")
+        self._m_handle_input = self.metrics.histogram('vm_handle_input_seconds', "Durasi handle_input termasuk render.")
+        self._m_update_gui = self.metrics.histogram('vm_update_gui_seconds', "Durasi update_gui.")
+        self._m_product_display = self.metrics.histogram(
+            'vm_product_display_seconds', "Durasi _update_product_display (termasuk render grid produk).")
+        self._m_frame = self.metrics.histogram('vm_animation_frame_seconds', "Durasi pemrosesan per frame animasi.")
+        self._m_asset_load = self.metrics.gauge('vm_asset_load_seconds', "Waktu muat per aset.", ('asset',))
+        self._m_startup = self.metrics.gauge('vm_startup_seconds', "Waktu sampai tampilan pertama.")
+        self._m_audio_queue = self.metrics.gauge('vm_audio_queue_depth', "Jumlah suara yang menunggu diputar.")
+        self._m_command_queue = self.metrics.gauge('vm_command_queue_depth', "Jumlah perintah yang menunggu di controller.")
+
+        if port:
+            try:
+                serve_metrics(self.metrics, int(port))
+            except (OSError, ValueError) as e:
+                print(f"Error starting metrics endpoint on port {port}: {e}")
+                port = None
+        self.bind("<F8>", lambda e: self.set_metrics_enabled(not self.metrics_enabled))
+        self.bind("<F9>", lambda e: self.toggle_profiler())
+        if self.metrics_file or port:
+            self.set_metrics_enabled(True)
+
+    def set_metrics_enabled(self, enabled):
+        """Memasang atau melepas pengukuran jalur panas saat aplikasi berjalan."""
+        if enabled == self.metrics_enabled:
+            return
+        self.metrics_enabled = enabled
+        instrumentation = self._instrumentation
+        if enabled:
+            self.controller.step_observer = self._observe_step
+            instrumentation.time_method(self, 'update_gui', self._m_update_gui)
+            instrumentation.time_method(self, '_update_product_display', self._m_product_display)
+            instrumentation.time_method(self, 'handle_input', self._m_handle_input)
+            self.animator.frame_observer = self._m_frame.observe
+            self._export_metrics()
+        else:
+            instrumentation.remove()
+            self.controller.step_observer = None
+            self.animator.frame_observer = None
+            if self._metrics_export_job is not None:
+                self.after_cancel(self._metrics_export_job)
+                self._metrics_export_job = None
+
+    def _export_metrics(self):
+        """Memperbarui gauge dan menulis file metrik secara berkala selama metrik aktif."""
+        for name, seconds in list(self.assets.timings.items()):
+            self._m_asset_load.set(seconds, name)
+        self._m_audio_queue.set(self.audio.queue_depth())
+        self._m_command_queue.set(self.controller.queue_depth())
+        if self.metrics_file:
+            try:
+                self.metrics.write(self.metrics_file)
+            except OSError as e:
+                print(f"Error writing metrics to {self.metrics_file}: {e}")
+        self._metrics_export_job = self.after(self.METRICS_EXPORT_MS, self._export_metrics)
+
+    def toggle_profiler(self):
+        """Menyalakan profiler sampling, atau mematikannya dan menulis hasilnya."""
+        if self._profiler is not None and self._profiler.running:
+            self._profiler.stop()
+            self._profiler.write_collapsed(self.PROFILE_OUTPUT)
+            top = "\n".join(f"  {percent:5.1f}%  {name}" for name, percent in self._profiler.top_functions())
+            print(f"Profil ({self._profiler.samples} sampel) ditulis ke {self.PROFILE_OUTPUT}:\n{top}")
+        else:
+            self._profiler = SamplingProfiler()
+            self._profiler.start()
+
     def setup_ui(self):
         self.grid_columnconfigure(0, weight=2)
         self.grid_columnconfigure(1, weight=1)
@@ -62,17 +267,11 @@ class App(ctk.CTk):
         left_frame.grid_rowconfigure(2, weight=0) # Baris untuk frame dispenser
         left_frame.grid_columnconfigure(0, weight=1)
 
-        # Masalah 2: Menggunakan CTkScrollableFrame untuk produk
-        self.products_scroll_frame = ctk.CTkScrollableFrame(left_frame, label_text="Pilih Item", label_font=("Arial", 20, "bold"))
-        self.products_scroll_frame.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")
-        self.products_scroll_frame.grid_columnconfigure((0, 1), weight=1)
-
-        self.product_buttons = {}
-        for i, (name, price) in enumerate(self.vm_dfa.menu_prices.items()):
-            image = self.product_images.get(name)
-            button = ctk.CTkButton(self.products_scroll_frame, text=f"{name}\nRp{price}", image=image, compound="top", fg_color="#1E1E1E", hover_color="#4A4A4A", font=("Arial", 14), command=lambda p=name: self.handle_input(p))
-            # button.grid(row=i//2, column=i%2, padx=10, pady=10, sticky="ew", ipady=10)
-            self.product_buttons[name] = button
+        # Grid produk tervirtualisasi: hanya baris yang terlihat yang punya tombol, dipakai ulang saat scroll
+        self.product_grid = VirtualGrid(left_frame, make_cell=self._make_product_cell, bind_cell=self._bind_product_cell,
+                                        columns=2, row_height=self.PRODUCT_ROW_HEIGHT,
+                                        label_text="Pilih Item", label_font=("Arial", 20, "bold"))
+        self.product_grid.grid(row=0, column=0, padx=0, pady=0, sticky="nsew")
         
         # PERUBAHAN PADA AREA DISPENSER
         dispenser_title = ctk.CTkLabel(left_frame, text="Area Dispenser", font=("Arial", 20, "bold"))
@@ -96,8 +295,10 @@ class App(ctk.CTk):
 
         self.canvas_dispenser.create_text(
             canvas_width / 2, canvas_height / 2,
-            text="[Area Dispenser]", fill="white", font=("Arial", 16)
+            text="[Area Dispenser]", fill="white", font=("Arial", 16), tags=("static",)
         )
+        # Satu penjadwal animasi untuk canvas dispenser (tick tetap, oval dipakai ulang)
+        self.animator = AnimationScheduler(self, self.canvas_dispenser)
 
         # --- FRAME KANAN (KONTROL) ---
         right_scroll_frame = ctk.CTkScrollableFrame(self, fg_color="transparent")
@@ -125,9 +326,14 @@ class App(ctk.CTk):
         ctk.CTkLabel(info_frame, text="Total Harga:", font=("Arial", 16)).grid(row=0, column=0, padx=10, pady=5, sticky="w")
         self.price_label = ctk.CTkLabel(info_frame, text="Rp0", font=("Arial", 20, "bold"))
         self.price_label.grid(row=0, column=1, padx=10, pady=5, sticky="e")
-        ctk.CTkLabel(info_frame, text="Uang Masuk:", font=("Arial", 16)).grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        # Promosi yang sedang memotong total (kosong tanpa aturan harga)
+        self.discount_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 13), text_color="#FF8C42", wraplength=260, justify="left")
+        self.discount_label.grid(row=1, column=0, columnspan=2, padx=10, pady=0, sticky="w")
+        ctk.CTkLabel(info_frame, text="Uang Masuk:", font=("Arial", 16)).grid(row=2, column=0, padx=10, pady=5, sticky="w")
         self.inserted_money_label = ctk.CTkLabel(info_frame, text="Rp0", font=("Arial", 20, "bold"), text_color="#33FF57")
-        self.inserted_money_label.grid(row=1, column=1, padx=10, pady=5, sticky="e")
+        self.inserted_money_label.grid(row=2, column=1, padx=10, pady=5, sticky="e")
+        self.suggestion_label = ctk.CTkLabel(info_frame, text="", font=("Arial", 14), text_color="#FFC300", wraplength=260, justify="left")
+        self.suggestion_label.grid(row=3, column=0, columnspan=2, padx=10, pady=(0, 5), sticky="w")
 
         # Frame untuk Pembayaran
         payment_frame = ctk.CTkFrame(right_scroll_frame)
@@ -165,112 +371,227 @@ class App(ctk.CTk):
         self.take_change_button.pack(fill='x', padx=5, pady=10)
 
     def handle_input(self, input_symbol):
-        # Mencegah input lain saat animasi sedang berjalan.
-        if self.vm_dfa.current_state == 'DispensingItem':
-            return
-        
         # Putar suara jika item yang valid dan tersedia dipilih.
         # if input_symbol in self.vm_dfa.menu_prices:
         self.play_clicked_sound()
 
-        # Kirim input ke logika DFA dan dapatkan output-nya.
-        output = self.vm_dfa.delta(input_symbol)
+        # Input dikirim ke controller; saat DispensingItem controller menahannya sampai transaksi selesai.
+        # Hasilnya ditampilkan oleh _poll_controller.
+        self.controller.submit(input_symbol)
+
+    def _poll_controller(self):
+        """Mengambil snapshot terbaru dari controller; snapshot di antara dua polling digabung."""
+        snapshot, messages = self.controller.take()
+        if snapshot is not self._snapshot or messages:
+            previous, self._snapshot = self._snapshot, snapshot
+            for message in messages:
+                self._append_notification(message)
+
+            # Periksa state SETELAH input diproses
+            if snapshot.state == 'DispensingItem':
+                if previous.state != 'DispensingItem':
+                    self.show_animation()
+            else:
+                self.update_gui(None)
+                # panggil show_change() untuk menampilkan kembalian.
+                if snapshot.state == 'ReturningChange' and previous.state != 'ReturningChange':
+                    self.show_change()
+        self.after(self.POLL_MS, self._poll_controller)
 
-        # Periksa state SETELAH input diproses
-        if self.vm_dfa.current_state == 'DispensingItem':
-            self.show_animation()
-        else:
-            # Perbarui GUI dengan pesan output
-            self.update_gui(output)
-            # panggil show_change() untuk menampilkan kembalian.
-            if self.vm_dfa.current_state == 'ReturningChange':
-                self.show_change()
+    def _observe_step(self, from_state, to_state, seconds):
+        """Dipanggil dari thread controller untuk setiap transisi saat metrik aktif."""
+        self._m_delta.observe(seconds)
+        self._m_transitions.inc(from_state, to_state)
 
     def update_gui(self, message):
-        self.price_label.configure(text=f"Rp{self.vm_dfa.total_price}")
-        self.inserted_money_label.configure(text=f"Rp{self.vm_dfa.money_inserted}")
+        """Menggambar snapshot terakhir; hanya widget yang nilainya berubah sejak render terakhir yang disentuh."""
+        snapshot = self._snapshot
+        state = snapshot.state
+        rendered = self._rendered
+
+        if rendered.get('total_price') != snapshot.total_price:
+            self.price_label.configure(text=f"Rp{snapshot.total_price}")
+            rendered['total_price'] = snapshot.total_price
+        if rendered.get('discounts') != snapshot.discounts:
+            self.discount_label.configure(text="\n".join(f"{name} -Rp{amount}" for name, amount in snapshot.discounts))
+            rendered['discounts'] = snapshot.discounts
+        if rendered.get('money_inserted') != snapshot.money_inserted:
+            self.inserted_money_label.configure(text=f"Rp{snapshot.money_inserted}")
+            rendered['money_inserted'] = snapshot.money_inserted
+        remaining = snapshot.total_price - snapshot.money_inserted if state == 'WaitingForPayment' else 0
+        if rendered.get('remaining') != remaining:
+            self.suggestion_label.configure(text=self._payment_suggestion_text(remaining, snapshot))
+            rendered['remaining'] = remaining
+
+        self._render_order_list(snapshot)
 
-        self.order_list_textbox.configure(state="normal")
-        self.order_list_textbox.delete("1.0", "end")
-        order_text = "\n".join(f"- {item}" for item in self.vm_dfa.selected_items) if self.vm_dfa.selected_items else "Belum ada pesanan..."
-        self.order_list_textbox.insert("1.0", order_text)
-        self.order_list_textbox.configure(state="disabled")
-
-        self.notification_textbox.configure(state="normal")
         if message: # Hanya tambahkan jika ada pesan
-            self.notification_textbox.insert("end", f"> {message}\n")
-            self.notification_textbox.see("end")
-        self.notification_textbox.configure(state="disabled")
-
-        state = self.vm_dfa.current_state
+            self._append_notification(message)
 
         # PERBAIKAN: Logika untuk menampilkan tombol produk yang sesuai
         self._update_product_display(state)
 
         # PERBAIKAN: Logika untuk mengaktifkan/menonaktifkan tombol aksi
         for button in self.money_buttons.values():
-            button.configure(state="normal" if state == 'WaitingForPayment' else "disabled")
+            self._set_button_state(button, state == 'WaitingForPayment')
+
+        self._set_button_state(self.next_button, state == 'IceCreamSelection' and snapshot.order_length > 0)
+        self._set_button_state(self.checkout_button, state == 'ToppingSelection')
+        self._set_button_state(self.cancel_button, state not in ['Idle', 'ReturningChange', 'DispensingItem'])
+        self._set_button_state(self.take_change_button, state == 'ReturningChange')
+
+    def _payment_suggestion_text(self, remaining, snapshot):
+        if snapshot.inventory is None:
+            suggestion = self.payment_paths.suggest(remaining)
+        else:
+            # Kaset terbatas: hanya saran yang setiap lembarnya akan diterima mesin
+            suggestion = self.payment_paths.suggest_accepted(remaining, snapshot.inventory,
+                                                             snapshot.money_inserted, snapshot.total_price)
+        if suggestion is None:
+            return ""
+        bills = " + ".join(f"Rp{bill}" for bill in suggestion.bills)
+        text = f"Saran: {bills}"
+        if suggestion.change:
+            text += f" (kembali Rp{suggestion.change})"
+        return text
+
+    def _set_button_state(self, button, enabled):
+        """Mengubah state tombol hanya jika berbeda dari yang terakhir diterapkan."""
+        new_state = "normal" if enabled else "disabled"
+        if self._button_states.get(button) != new_state:
+            button.configure(state=new_state)
+            self._button_states[button] = new_state
+
+    def _render_order_list(self, snapshot):
+        """
+        Memperbarui list pesanan secara bertahap: satu baris per produk (urutan pertama
+        kali dipilih), produk baru ditambahkan di akhir dan hanya baris yang jumlahnya
+        berubah yang ditulis ulang.
+        """
+        rows = self._order_rows
+        textbox = self.order_list_textbox
+        order, length = snapshot.order, snapshot.order_length
+
+        if snapshot.cart_generation != self._order_generation:
+            # Keranjang dikosongkan sejak render terakhir: mulai lagi dari awal log
+            self._order_generation = snapshot.cart_generation
+            self._order_seen = 0
+            if rows:
+                textbox.configure(state="normal")
+                textbox.delete("1.0", "end")
+                textbox.configure(state="disabled")
+                rows.clear()
+                self._order_placeholder = False
+
+        if not length:
+            if rows or not self._order_placeholder:
+                textbox.configure(state="normal")
+                textbox.delete("1.0", "end")
+                textbox.insert("1.0", "Belum ada pesanan...")
+                textbox.configure(state="disabled")
+                rows.clear()
+                self._order_placeholder = True
+            return
 
-        self.next_button.configure(state="normal" if state == 'IceCreamSelection' and self.vm_dfa.selected_items else "disabled")
-        self.checkout_button.configure(state="normal" if state == 'ToppingSelection' else "disabled")
-        self.cancel_button.configure(state="normal" if state not in ['Idle', 'ReturningChange', 'DispensingItem'] else "disabled")
-        self.take_change_button.configure(state="normal" if state == 'ReturningChange' else "disabled")
+        # Hanya produk yang muncul di log sejak render terakhir yang berubah jumlahnya
+        added = {}
+        for product_id in order[self._order_seen:length]:
+            added[product_id] = added.get(product_id, 0) + 1
+        self._order_seen = length
+        changed = [(product_id, rows.get(product_id, 0) + count) for product_id, count in added.items()]
+        if not changed:
+            return
+
+        textbox.configure(state="normal")
+        if self._order_placeholder:
+            textbox.delete("1.0", "end")
+            self._order_placeholder = False
+        for product_id, count in changed:
+            line = f"- {format_items(((snapshot.products[product_id], count),))}"
+            if product_id in rows:
+                # Baris ke-n di Text widget = posisi produk di dict (urutan penyisipan) + 1
+                row = list(rows).index(product_id) + 1
+                textbox.delete(f"{row}.0", f"{row}.end")
+                textbox.insert(f"{row}.0", line)
+            else:
+                textbox.insert("end", line if not rows else f"\n{line}")
+            rows[product_id] = count
+        textbox.configure(state="disabled")
+
+    def _append_notification(self, message):
+        """Menambahkan pesan ke area status; baris paling lama dibuang jika melebihi batas."""
+        textbox = self.notification_textbox
+        textbox.configure(state="normal")
+        textbox.insert("end", f"> {message}\n")
+        self._notification_lines.append(message.count("\n") + 1)
+        if len(self._notification_lines) > self.NOTIFICATION_LIMIT:
+            removed = self._notification_lines.popleft()
+            textbox.delete("1.0", f"{removed + 1}.0")
+        textbox.see("end")
+        textbox.configure(state="disabled")
+
+    def _clear_notifications(self):
+        self.notification_textbox.configure(state="normal")
+        self.notification_textbox.delete("1.0", "end")
+        self.notification_textbox.configure(state="disabled")
+        self._notification_lines.clear()
 
     def _update_product_display(self, current_state):
-        """Menampilkan/menyembunyikan tombol produk berdasarkan state."""
-        scoop_count = 0
-        topping_count = 0
-        
+        """Menampilkan produk kategori aktif di grid virtual (hanya jika kategorinya berubah)."""
         if current_state in ['Idle', 'IceCreamSelection']:
-            self.products_scroll_frame.configure(label_text="Pilih Es Krim")
+            category, title = 'scoop', "Pilih Es Krim"
         elif current_state == 'ToppingSelection':
-            self.products_scroll_frame.configure(label_text="Pilih Topping")
+            category, title = 'topping', "Pilih Topping"
         else:
             # Judul default saat tidak dalam fase pemilihan
-            self.products_scroll_frame.configure(label_text="Item Pilihan")
-            
-        for name, button in self.product_buttons.items():
-            item_type = self.vm_dfa.item_types.get(name)
-            
-            if current_state in ['Idle', 'IceCreamSelection'] and item_type == 'scoop':
-                row, col = divmod(scoop_count, 2)
-                button.grid(row=row, column=col, padx=10, pady=10, sticky="ew", ipady=10)
-                button.configure(state="normal")
-                scoop_count += 1
-            elif current_state == 'ToppingSelection' and item_type == 'topping':
-                row, col = divmod(topping_count, 2)
-                button.grid(row=row, column=col, padx=10, pady=10, sticky="ew", ipady=10)
-                button.configure(state="normal")
-                topping_count += 1
-            else:
-                button.grid_remove() 
+            category, title = None, "Item Pilihan"
+
+        if self._rendered.get('category', '') == category:
+            return
+        self._rendered['category'] = category
+        self.product_grid.configure(label_text=title)
+        self.product_grid.set_items(self.catalog.category(category) if category is not None else ())
+        self.product_grid.set_enabled(True)
+
+    def _make_product_cell(self, parent):
+        return ctk.CTkButton(parent, text="", compound="top", fg_color="#1E1E1E", hover_color="#4A4A4A", font=("Arial", 14))
+
+    def _bind_product_cell(self, button, name):
+        """Mengisi tombol (yang mungkin dipakai ulang) untuk produk `name`; gambar dimuat saat dibutuhkan."""
+        product = self.catalog.by_name[name]
+        button.configure(text=f"{name}\nRp{product.price}", image=self._product_image(name),
+                         command=lambda p=name: self.handle_input(p))
+
+    def _product_image(self, name):
+        if name in self._missing_images:
+            return None
+        try:
+            return self.assets.image(self._product_image_path(name), self.PRODUCT_IMAGE_SIZE)
+        except Exception as e:
+            self._missing_images.add(name)
+            print(f"Error loading asset for {name}: {e}")
+            return None
 
     def play_clicked_sound(self):
-        if self.clicked_sound:
-            Thread(target=lambda: self.clicked_sound.play(), daemon=True).start()
+        self.audio.play('clicked')
 
     def play_take_change_sound(self):
-        if self.take_change_sound:
-            Thread(target=lambda: self.take_change_sound.play(), daemon=True).start()
+        self.audio.play('take_change')
 
     def play_ice_cream_sound(self):
-        if self.ice_cream_sound:
-            Thread(target=lambda: self.ice_cream_sound.play(), daemon=True).start()
+        self.audio.play('ice_cream')
 
     def show_animation(self):
         """Mempersiapkan dan memulai animasi dispenser."""
         # Nonaktifkan semua tombol
-        for button in self.product_buttons.values(): button.configure(state="disabled")
-        for button in self.money_buttons.values(): button.configure(state="disabled")
-        self.checkout_button.configure(state="disabled")
-        self.cancel_button.configure(state="disabled")
+        self.product_grid.set_enabled(False)
+        for button in self.money_buttons.values(): self._set_button_state(button, False)
+        self._set_button_state(self.checkout_button, False)
+        self._set_button_state(self.cancel_button, False)
         
         self.update_gui("Pesanan sedang diproses...")
         self.play_ice_cream_sound()
         
-        # Siapkan antrian item untuk dianimasikan
-        self.dispenser_item_queue = self.vm_dfa.selected_items.copy()
-        
         # Mulai animasi
         self.animate_dispenser_start()
 
@@ -281,133 +602,101 @@ class App(ctk.CTk):
         
         self.canvas_dispenser.create_polygon(
             x_c - w/2, y_b - h, x_c + w/2, y_b - h, x_c, y_b,
-            fill="#FFA07A", outline="#CD853F", width=2
+            fill="#FFA07A", outline="#CD853F", width=2, tags=("static",)
         )
         self.canvas_dispenser.create_oval(
             x_c - w/2, y_b - h - 10, x_c + w/2, y_b - h + 10,
-            fill="#CD853F", outline="#CD853F", width=2
+            fill="#CD853F", outline="#CD853F", width=2, tags=("static",)
         )
+        # Oval animasi (dari pool) selalu di atas cone
+        self.canvas_dispenser.tag_raise("pooled")
         # Reset posisi Y untuk scoop pertama
         self.last_scoop_y = self.cone_y_bottom - self.cone_height + 5
 
     def animate_dispenser_start(self):
-        """Membersihkan canvas dan memulai urutan animasi."""
-        self.canvas_dispenser.delete("all")
+        """Membersihkan canvas dan menjadwalkan animasi semua item pesanan sekaligus."""
+        self._clear_dispenser()
         self.draw_cone()
-        self.after(500, self._animate_next_item)
-
-    def _animate_next_item(self):
-        """Memproses item berikutnya dalam antrian untuk dianimasikan."""
-        if not self.dispenser_item_queue:
-            # Jika semua item sudah dianimasikan
-            self.canvas_dispenser.create_text(
-                self.cone_x_center, 50,
-                text="✨ Siap Diambil! ✨", fill="#FFC107", font=("Arial", 24, "bold")
-            )
-            self.after(1000, self.finish_transaction) # Tunggu 1 detik sebelum selesai
-            return
-        
-        item_name = self.dispenser_item_queue.pop(0)
-        item_type = self.item_types.get(item_name)
-        color = self.item_colors.get(item_name, 'gray')
-        
-        if item_type == 'scoop':
-            self._animate_scoop(color)
-        elif item_type == 'topping':
-            self._animate_topping(color)
 
-    def _animate_scoop(self, color):
+        items = self._dispense_sample()
+        # Jeda antar item dipersingkat untuk pesanan besar agar total durasinya tetap terbatas
+        stagger = min(self.DISPENSE_STAGGER, self.DISPENSE_BUDGET / max(len(items), 1))
+        self._pending_items = len(items)
+        delay = 0.5
+        for item_name in items:
+            item_type = self.catalog.types.get(item_name)
+            color = self.catalog.colors.get(item_name, 'gray')
+            if item_type == 'scoop':
+                self._animate_scoop(color, delay)
+            elif item_type == 'topping':
+                self._animate_topping(color, delay)
+            else:
+                self._pending_items -= 1
+            delay += stagger
+
+        if self._pending_items == 0:
+            self.animator.call_later(delay, self._animation_done)
+
+    def _dispense_sample(self):
+        """Item yang dianimasikan: semua item, atau sampel merata dari log pesanan jika terlalu banyak."""
+        snapshot = self._snapshot
+        order, length, products = snapshot.order, snapshot.order_length, snapshot.products
+        if length <= self.MAX_ANIMATED_ITEMS:
+            return [products[product_id] for product_id in order[:length]]
+        step = length / self.MAX_ANIMATED_ITEMS
+        return [products[order[int(i * step)]] for i in range(self.MAX_ANIMATED_ITEMS)]
+
+    def _clear_dispenser(self):
+        """Menghapus gambar statis (cone, teks) dan mengembalikan oval animasi ke pool."""
+        self.canvas_dispenser.delete("static")
+        self.animator.release_all()
+
+    def _item_landed(self):
+        self._pending_items -= 1
+        if self._pending_items == 0:
+            self.animator.call_later(0.3, self._animation_done) # Jeda setelah item terakhir
+
+    def _animation_done(self):
+        """Dipanggil saat semua item sudah mendarat."""
+        self.canvas_dispenser.create_text(
+            self.cone_x_center, 50,
+            text="✨ Siap Diambil! ✨", fill="#FFC107", font=("Arial", 24, "bold"), tags=("static",)
+        )
+        self.animator.call_later(1.0, self.finish_transaction) # Tunggu 1 detik sebelum selesai
+
+    def _animate_scoop(self, color, delay):
         """Menganimasikan satu scoop es krim jatuh."""
         x_c = self.cone_x_center
         start_y = -30
         scoop_radius = 30
-        
-        item_id = self.canvas_dispenser.create_oval(
-            x_c - scoop_radius, start_y, x_c + scoop_radius, start_y + 2 * scoop_radius,
-            fill=color, outline=color
-        )
-        
-        # Tentukan posisi target Y, menumpuk di atas scoop sebelumnya
-        target_y_center = self.last_scoop_y - scoop_radius
-        
+
+        # Tentukan posisi target, menumpuk di atas scoop sebelumnya (dibatasi tepi atas canvas)
+        target_y = max(self.last_scoop_y - 2 * scoop_radius, 10)
         # Update posisi Y untuk scoop berikutnya
-        self.last_scoop_y -= scoop_radius * 1.5
-
-        def move_scoop():
-            coords = self.canvas_dispenser.coords(item_id)
-            if not coords: return
-            
-            current_y_center = coords[1] + scoop_radius
-            if current_y_center < target_y_center:
-                self.canvas_dispenser.move(item_id, 0, 8) # Kecepatan jatuh
-                self.after(20, move_scoop)
-            else:
-                self.after(300, self._animate_next_item) # Jeda sebelum item berikutnya
-        move_scoop()
-        
-    def _animate_topping(self, color):
+        self.last_scoop_y = max(self.last_scoop_y - scoop_radius * 1.5, 2 * scoop_radius + 10)
+
+        item_id = self.animator.acquire(color)
+        duration = (target_y - start_y) / self.SCOOP_FALL_SPEED
+        self.animator.move(item_id, x_c - scoop_radius, start_y, target_y, 2 * scoop_radius, 2 * scoop_radius,
+                           duration, delay, on_done=self._item_landed)
+
+    def _animate_topping(self, color, delay):
         """Menganimasikan topping jatuh (sebagai titik-titik kecil)."""
         x_c, y_start = self.cone_x_center, -20
-        # Buat beberapa partikel topping
-        particles = [self.canvas_dispenser.create_oval(x_c-20+i*5, y_start, x_c-15+i*5, y_start+5, fill=color, outline=color) for i in range(10)]
         target_y = self.last_scoop_y
-
-        def move_particles():
-            all_done = True
-            for p_id in particles:
-                coords = self.canvas_dispenser.coords(p_id)
-                if not coords: continue
-                
-                if coords[1] < target_y:
-                    all_done = False
-                    # Gerakan acak agar terlihat seperti taburan
-                    self.canvas_dispenser.move(p_id, 0, 10 + (-1)**p_id)
-            
-            if not all_done:
-                self.after(30, move_particles)
-            else:
-                self.after(300, self._animate_next_item)
-        move_particles()
+        # Partikel dengan kecepatan sedikit berbeda agar terlihat seperti taburan
+        for i in range(10):
+            speed = self.TOPPING_FALL_SPEED * (1.1 if i % 2 else 0.9)
+            item_id = self.animator.acquire(color)
+            self.animator.move(item_id, x_c - 20 + i * 5, y_start, target_y, 5, 5,
+                               (target_y - y_start) / speed, delay,
+                               # Partikel yang paling lambat menandai topping selesai
+                               on_done=self._item_landed if i == 0 else None)
 
     def finish_transaction(self):
         """Dipanggil setelah semua animasi selesai."""
-        output = self.vm_dfa.delta(None)
-        self.update_gui(output)
-        self.show_change()
-
-    def _calculate_change(self, amount, denominations):
-        """
-        Menghitung kombinasi uang kembalian menggunakan rekursi dan backtracking.
-        Fungsi ini akan menemukan kombinasi yang pas.
-        """
-        # Base case 1: Jika jumlahnya 0, kita berhasil.
-        if amount == 0:
-            return []
-        # Base case 2: Jika tidak ada denominasi lagi tapi jumlah masih > 0, jalur ini gagal.
-        if not denominations:
-            return None
-
-        # Ambil denominasi terbesar saat ini
-        current_denom = denominations[0]
-        # Sisa denominasi untuk rekursi berikutnya
-        remaining_denoms = denominations[1:]
-
-        # Coba gunakan denominasi saat ini sebanyak mungkin
-        max_count = amount // current_denom
-        for count in range(max_count, -1, -1):
-            # Hitung sisa amount
-            remainder = amount - count * current_denom
-            
-            # Panggil fungsi rekursif untuk sisa amount dan sisa denominasi
-            result = self._calculate_change(remainder, remaining_denoms)
-            
-            # Jika rekursi berhasil (menemukan solusi untuk sisa)
-            if result is not None:
-                # Gabungkan hasilnya: (jumlah denom saat ini) + (hasil dari sisa)
-                return [current_denom] * count + result
-                
-        # Jika tidak ada kombinasi yang berhasil dari loop di atas, jalur ini gagal.
-        return None
+        # Hasilnya (ReturningChange + kembalian) ditampilkan oleh _poll_controller
+        self.controller.finish()
 
     # Ganti fungsi show_change Anda dengan ini
     def show_change(self):
@@ -416,23 +705,24 @@ class App(ctk.CTk):
         for widget in self.change_frame.winfo_children():
             widget.destroy()
 
-        amount = self.vm_dfa.change_to_return
+        amount = self._snapshot.change_to_return
         if amount <= 0:
             return
         
         denominations = sorted([k for k in self.money_images.keys()], reverse=True)
         
-        # Tahap 1: Coba temukan kombinasi yang pas menggunakan backtracking
-        bills_to_return = self._calculate_change(amount, denominations)
+        # Tahap 1: Pakai lembar yang sudah dikeluarkan dari kaset, atau cari kombinasi pas
+        # dengan lembar paling sedikit (tabel DP + cache) jika persediaan tidak dibatasi
+        if self.vm_dfa.inventory is not None:
+            bills_to_return = self._snapshot.change_bills
+        else:
+            bills_to_return = make_change(amount, denominations)
         
         change_images = []
         
         # Tahap 2: Jika tidak ada kombinasi pas, gunakan algoritma greedy sebagai fallback
         if bills_to_return is None:
-            self.notification_textbox.configure(state="normal")
-            self.notification_textbox.insert("end", f"> PERINGATAN: Tidak dapat memberikan kembalian pas. Mencoba memberikan kembalian terdekat.\n")
-            self.notification_textbox.see("end")
-            self.notification_textbox.configure(state="disabled")
+            self._append_notification("PERINGATAN: Tidak dapat memberikan kembalian pas. Mencoba memberikan kembalian terdekat.")
 
             # Algoritma greedy untuk memberikan kembalian semaksimal mungkin
             temp_amount = amount
@@ -445,10 +735,7 @@ class App(ctk.CTk):
                     returned_amount += d
 
             if returned_amount < amount:
-                self.notification_textbox.configure(state="normal")
-                self.notification_textbox.insert("end", f"> PERINGATAN: Hanya dapat mengembalikan Rp {returned_amount}. Sisa Rp {amount - returned_amount} tidak dapat dikembalikan.\n")
-                self.notification_textbox.see("end")
-                self.notification_textbox.configure(state="disabled")
+                self._append_notification(f"PERINGATAN: Hanya dapat mengembalikan Rp {returned_amount}. Sisa Rp {amount - returned_amount} tidak dapat dikembalikan.")
 
             change_images = [self.money_images[bill] for bill in bills_to_return_greedy]
         else:
@@ -464,26 +751,23 @@ class App(ctk.CTk):
             label.grid(row=row, column=col, padx=2, pady=2)
 
     def take_change(self):
-        self.vm_dfa.reset()
+        # Reset DFA dan penutupan jurnal dilakukan oleh controller
+        self.controller.take_change()
         self.play_take_change_sound()
         for widget in self.change_frame.winfo_children(): widget.destroy()
-        # 1. Hapus semua gambar dari canvas
-        self.canvas_dispenser.delete("all")
+        # 1. Hapus semua gambar dari canvas (oval animasi disembunyikan untuk dipakai lagi)
+        self._clear_dispenser()
         
         # 2. Gambar ulang teks default di tengah canvas
         canvas_width = self.canvas_dispenser.winfo_width()
         canvas_height = self.canvas_dispenser.winfo_height()
         self.canvas_dispenser.create_text(
             canvas_width / 2, canvas_height / 2,
-            text="[Area Dispenser]", fill="white", font=("Arial", 16)
+            text="[Area Dispenser]", fill="white", font=("Arial", 16), tags=("static",)
         )
-        self.notification_textbox.configure(state="normal")
-        self.notification_textbox.delete("1.0", "end")
-        self.notification_textbox.configure(state="disabled")
+        self._clear_notifications()
         self.update_gui("Selamat datang! Silakan pilih es krim.")
 
-        self.vm_dfa.current_state = 'Idle'
-
 if __name__ == "__main__":
     app = App()
     app.mainloop()
\ No newline at end of file
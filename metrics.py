@@ -0,0 +1,232 @@
+# metrics.py
+"""
+Instrumentasi ringan untuk DFA dan GUI: counter, gauge, dan histogram dengan
+ekspor format teks Prometheus (ke file atau endpoint HTTP), serta profiler
+sampling yang bisa dinyalakan/dimatikan saat aplikasi berjalan.
+
+Pengukuran dipasang dengan membungkus method pada instance (Instrumentation),
+sehingga saat metrik dimatikan pembungkusnya dilepas dan jalur panas sama
+sekali tidak membayar biaya pengukuran.
+"""
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter as _Tally
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Batas bucket default (detik), cocok untuk latensi transisi DFA sampai frame GUI
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.0167, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Counter:
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in list(self.values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Gauge(Counter):
+    def set(self, value, *labels):
+        self.values[labels] = value
+
+
+class Histogram:
+    """Histogram dengan bucket tetap; observe() cukup satu bisect dan dua penjumlahan."""
+
+    def __init__(self, name, help, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # bucket terakhir = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), list(self.counts)):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            yield f"{self.name}_bucket", _format_labels((), (), [('le', le)]), cumulative
+        yield f"{self.name}_sum", "", self.sum
+        yield f"{self.name}_count", "", self.count
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = {}
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metrik '{metric.name}' sudah terdaftar.")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, buckets))
+
+    def render(self):
+        """Semua metrik dalam format teks Prometheus (exposition format 0.0.4)."""
+        kinds = {Counter: 'counter', Gauge: 'gauge', Histogram: 'histogram'}
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {kinds[type(metric)]}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Menulis metrik ke file secara atomik (untuk textfile collector node_exporter)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+def serve_metrics(registry, port, host='127.0.0.1'):
+    """Menjalankan endpoint HTTP /metrics di thread latar belakang; mengembalikan server-nya."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+class Instrumentation:
+    """Memasang dan melepas pembungkus pengukuran pada method milik instance."""
+
+    def __init__(self):
+        self._patched = []
+
+    def patch(self, obj, name, replacement):
+        setattr(obj, name, replacement)
+        self._patched.append((obj, name))
+
+    def time_method(self, obj, name, histogram):
+        original = getattr(obj, name)
+        clock = time.perf_counter
+        observe = histogram.observe
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                observe(clock() - start)
+
+        self.patch(obj, name, timed)
+
+    def remove(self):
+        """Melepas semua pembungkus sehingga method kelas asli dipakai lagi."""
+        for obj, name in reversed(self._patched):
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+        self._patched = []
+
+
+class SamplingProfiler:
+    """
+    Profiler sampling untuk satu thread (default: thread yang membuatnya, yaitu
+    thread Tk). Thread latar belakang membaca stack lewat sys._current_frames()
+    setiap `interval` detik dan menghitung stack yang sama.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None, max_depth=32):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.max_depth = max_depth
+        self.stacks = _Tally()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def top_functions(self, limit=10):
+        """Fungsi paling sering berada di puncak stack: list (nama, persen sampel)."""
+        leaves = _Tally()
+        for stack, count in self.stacks.items():
+            leaves[stack[-1]] += count
+        total = self.samples or 1
+        return [(name, 100.0 * count / total) for name, count in leaves.most_common(limit)]
+
+    def write_collapsed(self, path):
+        """Menulis stack dalam format 'collapsed' (input flamegraph.pl / speedscope)."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
@@ -0,0 +1,246 @@
+# model_checker.py
+"""
+Penjelajah ruang state VendingMachineDFA dan pemeriksa properti.
+
+Konfigurasi mesin disederhanakan menjadi bentuk kanonik
+(state, jumlah per produk, total, uang masuk, kembalian): urutan item di
+keranjang tidak memengaruhi transisi, sehingga semua urutan pemilihan yang
+menghasilkan multiset item yang sama dianggap satu konfigurasi. Penjelajahan
+berupa BFS per level dengan himpunan visited; tiap level bisa diekspansi
+paralel oleh beberapa proses. Karena BFS, jejak pelanggaran yang dilaporkan
+adalah jejak terpendek dari Idle.
+
+Aturan harga promosi (pricing.py) di luar cakupan: DFA dibuat tanpa
+PricingEngine, sehingga total selalu jumlah harga katalog. Dengan aturan harga,
+total bergantung juga pada jam dan state Pricer yang tidak ada di konfigurasi
+kanonik, dan properti total_matches_cart tidak lagi berlaku.
+
+Contoh:
+    python model_checker.py --max-items 6 --max-amount 100000 --workers 4
+"""
+
+import argparse
+import json
+import time
+from multiprocessing import Pool
+
+import events
+from catalog import Catalog
+from compiled_dfa import CompiledVendingMachineDFA
+from vending_machine_dfa import VendingMachineDFA
+
+ENGINES = {'base': VendingMachineDFA, 'compiled': CompiledVendingMachineDFA}
+
+
+# --- Properti: fungsi (sebelum, simbol, sesudah, event) -> pesan pelanggaran atau None ---
+# Konfigurasi berbentuk (state, counts, total, inserted, change).
+
+def _change_not_negative(pre, symbol, post, event):
+    if post[4] < 0:
+        return f"Kembalian negatif: Rp {post[4]}"
+
+
+def _cancel_refunds_inserted(pre, symbol, post, event):
+    if pre[0] == 'WaitingForPayment' and symbol == 'Cancel':
+        refund = getattr(event, 'refund', None)
+        if post[0] != 'ReturningChange' or post[4] != pre[3] or refund != pre[3]:
+            return f"Cancel saat WaitingForPayment mengembalikan Rp {post[4]} (event: {refund}), seharusnya Rp {pre[3]}"
+
+
+def _total_matches_cart(prices):
+    def check(pre, symbol, post, event):
+        expected = sum(count * price for count, price in zip(post[1], prices))
+        if post[2] != expected:
+            return f"Total Rp {post[2]} tidak sama dengan isi keranjang (Rp {expected})"
+    return check
+
+
+def _dispense_change_exact(pre, symbol, post, event):
+    if isinstance(event, events.Dispensed) and event.change != event.inserted - event.total:
+        return f"Kembalian Rp {event.change} != Rp {event.inserted} - Rp {event.total}"
+
+
+def _money_only_while_paying(pre, symbol, post, event):
+    if post[3] != pre[3] and pre[0] != 'WaitingForPayment' and post[3] != 0:
+        return f"Uang masuk berubah dari Rp {pre[3]} ke Rp {post[3]} di state {pre[0]}"
+
+
+def default_properties(prices):
+    return (
+        ('change_not_negative', _change_not_negative),
+        ('cancel_refunds_inserted', _cancel_refunds_inserted),
+        ('total_matches_cart', _total_matches_cart(prices)),
+        ('dispense_change_exact', _dispense_change_exact),
+        ('money_only_while_paying', _money_only_while_paying),
+    )
+
+
+# --- Ekspansi konfigurasi (dipakai di proses utama maupun worker) ---
+
+class Explorer:
+    """Satu DFA yang dipakai ulang untuk menghitung semua successor sebuah konfigurasi."""
+
+    def __init__(self, engine='compiled', catalog_path=None, max_items=6, max_amount=100000):
+        catalog = Catalog.load(catalog_path) if catalog_path else None
+        # Sengaja tanpa pricing: load() dan total_matches_cart mengandalkan harga katalog
+        self.dfa = ENGINES[engine](catalog=catalog)
+        self.max_items = max_items
+        self.max_amount = max_amount
+        self.products = self.dfa.cart.products
+        prices = [self.dfa.menu_prices[name] for name in self.products]
+        self.properties = default_properties(prices)
+        # Simbol yang dicoba di setiap state; None = transisi otomatis DispensingItem
+        money = sorted(s for s in self.dfa.alphabet if isinstance(s, int))
+        self.symbols = list(self.products) + ['Next', 'Checkout', 'Cancel'] + money + [None]
+
+    def initial(self):
+        self.dfa.reset()
+        return self.snapshot()
+
+    def snapshot(self):
+        dfa = self.dfa
+        return (dfa.current_state, tuple(dfa.cart.counts), dfa.total_price, dfa.money_inserted, dfa.change_to_return)
+
+    def load(self, config):
+        state, counts, total, inserted, change = config
+        dfa = self.dfa
+        dfa.reset()
+        dfa.current_state = state
+        # Di tempat: step versi tabel mengikat counts dan log keranjang sekali saat dikompilasi
+        dfa.cart.load(counts)
+        dfa.total_price = total
+        dfa.money_inserted = inserted
+        dfa.change_to_return = change
+
+    def expand(self, config):
+        """Successor dalam batas: list (simbol, konfigurasi, [(properti, pesan)])."""
+        if config[0] == 'ReturningChange':
+            return []  # transaksi selesai; GUI memanggil reset
+        result = []
+        for symbol in self.symbols:
+            self.load(config)
+            event = self.dfa.step(symbol)
+            child = self.snapshot()
+            violations = []
+            for name, check in self.properties:
+                message = check(config, symbol, child, event)
+                if message:
+                    violations.append((name, message))
+            if child == config and not violations:
+                continue
+            if sum(child[1]) > self.max_items or child[3] > self.max_amount:
+                continue
+            result.append((symbol, child, violations))
+        return result
+
+
+_worker_explorer = None
+
+
+def _init_worker(options):
+    global _worker_explorer
+    _worker_explorer = Explorer(**options)
+
+
+def _expand_chunk(chunk):
+    return [(config, _worker_explorer.expand(config)) for config in chunk]
+
+
+# --- BFS ---
+
+def check_model(engine='compiled', catalog_path=None, max_items=6, max_amount=100000,
+                workers=1, chunk_size=256, max_violations=20):
+    """
+    Menjelajahi semua konfigurasi yang terjangkau dalam batas dan memeriksa
+    properti. Mengembalikan ringkasan beserta pelanggaran dengan jejak terpendek.
+    """
+    options = {'engine': engine, 'catalog_path': catalog_path, 'max_items': max_items, 'max_amount': max_amount}
+    explorer = Explorer(**options)
+    root = explorer.initial()
+    parents = {root: None}  # konfigurasi -> (konfigurasi induk, simbol); juga himpunan visited
+    frontier = [root]
+    violations = []
+    seen_violations = set()
+    transitions = 0
+    depth = 0
+    start = time.perf_counter()
+
+    pool = Pool(workers, initializer=_init_worker, initargs=(options,)) if workers > 1 else None
+    try:
+        while frontier:
+            if pool is not None:
+                chunks = [frontier[i:i + chunk_size] for i in range(0, len(frontier), chunk_size)]
+                expanded = [item for part in pool.imap(_expand_chunk, chunks) for item in part]
+            else:
+                expanded = [(config, explorer.expand(config)) for config in frontier]
+
+            next_frontier = []
+            for config, successors in expanded:
+                for symbol, child, found in successors:
+                    transitions += 1
+                    for name, message in found:
+                        # Satu laporan per (properti, state asal, simbol) agar ringkasan tetap terbaca
+                        key = (name, config[0], symbol)
+                        if key not in seen_violations and len(violations) < max_violations:
+                            seen_violations.add(key)
+                            violations.append({
+                                'property': name,
+                                'message': message,
+                                'trace': _trace(parents, config) + [_symbol_json(symbol)],
+                            })
+                    if child not in parents:
+                        parents[child] = (config, symbol)
+                        next_frontier.append(child)
+            frontier = next_frontier
+            if frontier:
+                depth += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return {
+        'engine': engine,
+        'max_items': max_items,
+        'max_amount': max_amount,
+        'workers': workers,
+        'configurations': len(parents),
+        'transitions': transitions,
+        'depth': depth,
+        'seconds': round(time.perf_counter() - start, 3),
+        'states_reached': sorted({config[0] for config in parents}),
+        'violations': violations,
+    }
+
+
+def _symbol_json(symbol):
+    return symbol if symbol is not None else "(otomatis)"
+
+
+def _trace(parents, config):
+    """Simbol dari Idle sampai `config` (terpendek, karena parents diisi oleh BFS)."""
+    symbols = []
+    while parents[config] is not None:
+        config, symbol = parents[config]
+        symbols.append(_symbol_json(symbol))
+    symbols.reverse()
+    return symbols
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pemeriksa properti VendingMachineDFA secara menyeluruh.")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='compiled')
+    parser.add_argument('--catalog', help="File katalog (default: catalog.json).")
+    parser.add_argument('--max-items', type=int, default=6, help="Batas jumlah item di keranjang.")
+    parser.add_argument('--max-amount', type=int, default=100000, help="Batas uang yang dimasukkan.")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=256)
+    args = parser.parse_args(argv)
+
+    result = check_model(args.engine, args.catalog, args.max_items, args.max_amount, args.workers, args.chunk_size)
+    print(json.dumps(result, indent=2))
+    return 1 if result['violations'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+# payment_paths.py
+
+from array import array
+from collections import namedtuple
+from functools import reduce
+from math import gcd
+
+PaymentSuggestion = namedtuple('PaymentSuggestion', ['bills', 'change'])
+
+
+class PaymentPaths:
+    """
+    Tabel saran pembayaran untuk sisa tagihan: untuk setiap sisa (dibulatkan ke
+    atas ke satuan FPB pecahan) sampai `ceiling`, kombinasi uang dengan lembar
+    paling sedikit yang menutup sisa tersebut, lalu kelebihan bayar paling kecil.
+    Hanya kombinasi yang kembaliannya bisa dibayar pas yang dipertimbangkan.
+
+    Tabel dibangun sekali dalam array ringkas; suggest() cukup satu indeks array
+    ditambah penelusuran lembar (jumlah lembar kecil dan terbatas). suggestions()
+    mengurutkan semua kandidat dengan kriteria yang sama, untuk pemanggil yang
+    masih harus menyaring saran (mis. dengan isi kaset kembalian).
+    """
+
+    def __init__(self, denominations, ceiling=200000):
+        self.denominations = tuple(sorted(set(denominations), reverse=True))
+        if not self.denominations or self.denominations[-1] <= 0:
+            raise ValueError("Pecahan uang harus bilangan positif.")
+        self.unit = reduce(gcd, self.denominations)
+        self.largest = self.denominations[0]
+        self.ceiling = ceiling
+        self._build_tables()
+
+    def _build_tables(self):
+        unit = self.unit
+        steps = [d // unit for d in self.denominations]
+        largest, smallest = steps[0], steps[-1]
+        n = -(-self.ceiling // unit) + 1
+        # Setiap jumlah di atas F (bilangan Frobenius, < smallest x largest satuan) bisa dibayar pas.
+        # Kelebihan bayar >= F + 1 + pecahan terbesar tidak pernah minimal: satu lembar bisa dibuang
+        # dan kembaliannya tetap bisa dibayar, jadi cukup mencari s dalam [r, r + window)
+        top = n + largest + smallest * largest
+        impossible = top + 1
+
+        # best[s] = lembar minimal untuk membayar tepat s satuan, last[s] = pecahan terakhir (dalam satuan)
+        best = array('l', [0] + [impossible] * (top - 1))
+        last = array('l', [0] * top)
+        for s in range(1, top):
+            for step in steps:
+                if step <= s and best[s - step] + 1 < best[s]:
+                    best[s] = best[s - step] + 1
+                    last[s] = step
+        frobenius = max((s for s in range(smallest * largest) if best[s] >= impossible), default=0)
+        window = largest + frobenius + 1
+        self._best, self._last, self._impossible, self._window = best, last, impossible, window
+
+        # pay[r] = jumlah yang disarankan (satuan) untuk sisa r satuan; 0 = tidak ada saran
+        self._pay = pay = array('l', [0] * n)
+        for r in range(1, n):
+            choice, choice_key = 0, None
+            for s in range(r, r + window):
+                if best[s] >= impossible or best[s - r] >= impossible:
+                    continue  # tidak bisa dibayar, atau kembaliannya tidak bisa diberikan pas
+                key = (best[s], s - r)
+                if choice_key is None or key < choice_key:
+                    choice, choice_key = s, key
+            pay[r] = choice
+
+    def _bills(self, units):
+        bills = []
+        last = self._last
+        while units:
+            step = last[units]
+            bills.append(step * self.unit)
+            units -= step
+        bills.sort(reverse=True)
+        return bills
+
+    def _split(self, remaining):
+        """Sisa dalam satuan yang masuk tabel, beserta lembar terbesar yang dibayar lebih dulu."""
+        units = -(-remaining // self.unit)
+        extra = []
+        limit = len(self._pay) - 1
+        if units > limit:
+            # Di atas batas tabel: bayar dulu dengan pecahan terbesar sampai sisanya masuk tabel
+            count = -(-(units - limit) * self.unit // self.largest)
+            extra = [self.largest] * count
+            units -= count * self.largest // self.unit
+        return units, extra
+
+    def _suggestion(self, remaining, extra, pay):
+        bills = extra + self._bills(pay)
+        return PaymentSuggestion(tuple(bills), sum(bills) - remaining)
+
+    def suggest(self, remaining):
+        """
+        Saran (lembar yang dimasukkan, kembalian) untuk sisa tagihan `remaining`,
+        atau None jika tidak ada sisa atau tidak ada kombinasi yang kembaliannya pas.
+        """
+        if remaining <= 0:
+            return None
+        units, extra = self._split(remaining)
+        pay = self._pay[units]
+        if not pay:
+            return None
+        return self._suggestion(remaining, extra, pay)
+
+    def suggestions(self, remaining):
+        """
+        Semua saran untuk `remaining` (satu kombinasi per jumlah bayar), urut dari
+        yang terbaik seperti suggest(): lembar paling sedikit, lalu kembalian terkecil.
+        """
+        if remaining <= 0:
+            return
+        units, extra = self._split(remaining)
+        best, impossible = self._best, self._impossible
+        candidates = sorted((best[s], s - units, s) for s in range(units, units + self._window)
+                            if best[s] < impossible and best[s - units] < impossible)
+        for _, _, pay in candidates:
+            yield self._suggestion(remaining, extra, pay)
+
+    def suggest_accepted(self, remaining, inventory, money_inserted, total_price):
+        """
+        Saran terbaik yang setiap lembarnya lolos inventory.can_accept (CassetteInventory),
+        diperiksa berurutan seperti DFA menerima uang; lembar yang kembaliannya tidak bisa
+        dibayar dari kaset akan ditolak mesin, jadi kandidat berikutnya yang dipakai.
+        None jika tidak ada kandidat yang diterima.
+        """
+        for suggestion in self.suggestions(remaining):
+            held = inventory.copy()
+            inserted = money_inserted
+            for bill in suggestion.bills:
+                if not held.can_accept(bill, inserted, total_price):
+                    break
+                held.hold(bill)
+                inserted += bill
+            else:
+                return suggestion
+        return None
@@ -0,0 +1,323 @@
+# pricing.py
+"""
+Aturan harga promosi di atas harga katalog: diskon paket (combo), harga
+happy hour, dan batas jumlah yang ditagih per topping.
+
+Aturan dikompilasi sekali menjadi "term" sederhana yang masing-masing hanya
+bergantung pada beberapa grup produk (jumlah unit dan nilai per grup), plus
+indeks id produk -> term untuk setiap jam. Saat item ditambahkan, Pricer
+hanya memperbarui grup milik produk tersebut dan menghitung ulang term yang
+menyentuhnya, bukan semua aturan terhadap seluruh keranjang.
+
+Format file (mis. pricing.json):
+    {"rules": [
+      {"type": "combo", "name": "Paket Duo", "requires": {"scoop": 2, "topping": 1}, "discount": 3000},
+      {"type": "happy_hour", "name": "Sore Ceria", "items": "scoop", "percent": 20, "start": 14, "end": 16},
+      {"type": "cap", "name": "Topping Puas", "items": "topping", "max_units": 2}
+    ]}
+`items` / kunci `requires` berupa nama kategori, nama produk, atau list keduanya.
+"""
+
+import json
+import time
+from abc import ABC, abstractmethod
+
+
+# --- Term hasil kompilasi: evaluate(units, value) -> penyesuaian harga (<= 0) ---
+
+class _ComboTerm:
+    """Diskon `amount` untuk setiap paket lengkap (min atas unit grup // kebutuhan)."""
+    __slots__ = ('groups', 'needs', 'amount')
+
+    def __init__(self, groups, needs, amount):
+        self.groups = groups
+        self.needs = needs
+        self.amount = amount
+
+    def evaluate(self, units, value):
+        sets = min(units[g] // need for g, need in zip(self.groups, self.needs))
+        return -self.amount * sets
+
+
+class _PercentTerm:
+    """Potongan `percent` persen dari nilai grup."""
+    __slots__ = ('groups', 'percent')
+
+    def __init__(self, group, percent):
+        self.groups = (group,)
+        self.percent = percent
+
+    def evaluate(self, units, value):
+        return -(value[self.groups[0]] * self.percent // 100)
+
+
+class _CapTerm:
+    """Unit satu produk di atas `max_units` tidak ditagih."""
+    __slots__ = ('groups', 'max_units', 'price')
+
+    def __init__(self, group, max_units, price):
+        self.groups = (group,)
+        self.max_units = max_units
+        self.price = price
+
+    def evaluate(self, units, value):
+        extra = units[self.groups[0]] - self.max_units
+        return -extra * self.price if extra > 0 else 0
+
+
+# --- Aturan (konfigurasi) ---
+
+class Rule(ABC):
+    """Aturan promosi; subclass mengompilasi dirinya menjadi term lewat compile(engine)."""
+    __slots__ = ('name', 'hours')
+
+    def __init__(self, name, hours=None):
+        self.name = name
+        # (jam mulai, jam selesai) atau None = berlaku sepanjang hari; boleh melewati tengah malam
+        self.hours = hours
+
+    def active(self, hour):
+        if self.hours is None:
+            return True
+        start, end = self.hours
+        return start <= hour < end if start <= end else hour >= start or hour < end
+
+    @abstractmethod
+    def compile(self, engine):
+        """List term (_ComboTerm / _PercentTerm / _CapTerm) untuk aturan ini pada `engine`."""
+
+
+class ComboDiscount(Rule):
+    __slots__ = ('requires', 'discount')
+
+    def __init__(self, name, requires, discount, hours=None):
+        super().__init__(name, hours)
+        self.requires = dict(requires)
+        self.discount = int(discount)
+
+    def compile(self, engine):
+        groups = tuple(engine.group(selector) for selector in self.requires)
+        return [_ComboTerm(groups, tuple(self.requires.values()), self.discount)]
+
+
+class HappyHour(Rule):
+    __slots__ = ('items', 'percent')
+
+    def __init__(self, name, items, percent, start, end):
+        super().__init__(name, (start, end))
+        self.items = items
+        self.percent = int(percent)
+
+    def compile(self, engine):
+        return [_PercentTerm(engine.group(self.items), self.percent)]
+
+
+class ToppingCap(Rule):
+    __slots__ = ('items', 'max_units')
+
+    def __init__(self, name, items, max_units, hours=None):
+        super().__init__(name, hours)
+        self.items = items
+        self.max_units = int(max_units)
+
+    def compile(self, engine):
+        # Satu term per produk agar menambah satu topping hanya menghitung ulang batas topping itu
+        return [_CapTerm(engine.group(name), self.max_units, engine.prices[engine.product_ids[name]])
+                for name in engine.resolve(self.items)]
+
+
+RULE_TYPES = {
+    'combo': lambda r: ComboDiscount(r['name'], r['requires'], r['discount'], _hours(r)),
+    'happy_hour': lambda r: HappyHour(r['name'], r['items'], r['percent'], r['start'], r['end']),
+    'cap': lambda r: ToppingCap(r['name'], r['items'], r['max_units'], _hours(r)),
+}
+
+
+def _hours(row):
+    return (row['start'], row['end']) if 'start' in row else None
+
+
+# --- Engine ---
+
+class PricingEngine:
+    """
+    Aturan yang sudah dikompilasi untuk satu katalog. Total selalu dibulatkan
+    ke kelipatan `rounding` (potongan dibulatkan ke bawah) agar tetap bisa
+    dibayar dan dikembalikan dengan pecahan uang yang ada, dan tidak pernah
+    negatif.
+    """
+
+    def __init__(self, rules, catalog, rounding=1000):
+        self.rules = tuple(rules)
+        self.catalog = catalog
+        self.rounding = rounding
+        # Urutan produk = urutan katalog = id produk di Cart
+        self.products = tuple(catalog.prices)
+        self.product_ids = {name: i for i, name in enumerate(self.products)}
+        self.prices = [catalog.prices[name] for name in self.products]
+
+        self._group_ids = {}  # frozenset id produk -> id grup
+        self.product_groups = [[] for _ in self.products]  # id produk -> id grup yang memuatnya
+        self.terms = []
+        self.term_rules = []  # id term -> aturan asal
+        for rule in self.rules:
+            for term in rule.compile(self):
+                self.terms.append(term)
+                self.term_rules.append(rule)
+        self.n_groups = len(self._group_ids)
+        self._indexes = {}
+
+    @classmethod
+    def load(cls, path, catalog, rounding=1000):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        rows = data['rules'] if isinstance(data, dict) else data
+        try:
+            rules = [RULE_TYPES[row['type']](row) for row in rows]
+            return cls(rules, catalog, rounding)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Aturan harga {path} tidak valid: {e!r}") from e
+
+    def resolve(self, selector):
+        """Nama produk untuk kategori, nama produk, atau list keduanya."""
+        if isinstance(selector, (list, tuple)):
+            return tuple(dict.fromkeys(name for part in selector for name in self.resolve(part)))
+        if selector in self.catalog.by_category:
+            return self.catalog.category(selector)
+        if selector in self.product_ids:
+            return (selector,)
+        raise ValueError(f"'{selector}' bukan kategori atau produk di katalog.")
+
+    def group(self, selector):
+        """Id grup untuk selector; grup dengan produk yang sama dipakai bersama."""
+        members = frozenset(self.product_ids[name] for name in self.resolve(selector))
+        group = self._group_ids.get(members)
+        if group is None:
+            group = self._group_ids[members] = len(self._group_ids)
+            for product_id in members:
+                self.product_groups[product_id].append(group)
+        return group
+
+    def index(self, hour):
+        """id produk -> tuple id term aktif pada `hour` yang bergantung pada produk itu (di-cache per jam)."""
+        index = self._indexes.get(hour)
+        if index is None:
+            by_group = {}
+            for term_id, term in enumerate(self.terms):
+                if self.term_rules[term_id].active(hour):
+                    for group in term.groups:
+                        by_group.setdefault(group, []).append(term_id)
+            index = self._indexes[hour] = tuple(
+                tuple(dict.fromkeys(term_id for group in groups for term_id in by_group.get(group, ())))
+                for groups in self.product_groups)
+        return index
+
+    def finish(self, base, adjustment):
+        rounding = self.rounding
+        return max(base - (-adjustment // rounding * rounding), 0)
+
+    def price(self, counts, hour):
+        """Total untuk jumlah per produk `counts`, dihitung penuh dari awal (acuan dan pembanding)."""
+        units = [0] * self.n_groups
+        value = [0] * self.n_groups
+        base = 0
+        for product_id, count in enumerate(counts):
+            if count:
+                price = self.prices[product_id]
+                base += count * price
+                for group in self.product_groups[product_id]:
+                    units[group] += count
+                    value[group] += count * price
+        adjustment = sum(term.evaluate(units, value) for term, rule in zip(self.terms, self.term_rules)
+                         if rule.active(hour))
+        return self.finish(base, adjustment)
+
+    def pricer(self):
+        return Pricer(self)
+
+
+class Pricer:
+    """
+    Harga satu keranjang yang diperbarui per item. Jam yang dipakai aturan
+    happy hour dikunci saat item pertama ditambahkan, sehingga harga tidak
+    berubah di tengah pesanan.
+
+    reset() dipanggil di setiap transaksi, jadi dibuat murah: akumulator
+    dinolkan di tempat (hanya jika keranjang sempat berisi) dan jam lokal hanya
+    dibaca ulang setelah batas jam berikutnya lewat.
+    """
+    __slots__ = ('engine', 'hour', 'base', 'adjustment', 'units', 'value', 'term_values', '_index', 'total',
+                 '_fixed_hour', '_local_hour', '_hour_ends', '_zero_groups', '_zero_terms', '_dirty')
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._zero_groups = (0,) * engine.n_groups
+        self._zero_terms = (0,) * len(engine.terms)
+        self.units = list(self._zero_groups)
+        self.value = list(self._zero_groups)
+        self.term_values = list(self._zero_terms)
+        self.hour = None
+        self._index = None
+        self._local_hour = None
+        self._hour_ends = 0.0
+        self._dirty = False
+        self.reset()
+
+    def reset(self, hour=None):
+        """Mengosongkan keranjang; `hour` mengunci jam aturan (mis. saat pemulihan), None = jam lokal."""
+        self._fixed_hour = hour
+        if self._dirty:
+            self.units[:] = self._zero_groups
+            self.value[:] = self._zero_groups
+            self.term_values[:] = self._zero_terms
+            self._dirty = False
+        self.base = 0
+        self.adjustment = 0
+        self.total = 0
+
+    def _start(self):
+        """Item pertama pesanan: mengunci jam dan indeks term yang dipakai sampai reset()."""
+        hour = self._fixed_hour
+        if hour is None:
+            now = time.time()
+            if now >= self._hour_ends:
+                local = time.localtime(now)
+                self._local_hour = local.tm_hour
+                # Awal jam lokal berikutnya; sebelum itu jam tidak perlu dibaca ulang
+                self._hour_ends = now - now % 60 - local.tm_min * 60 + 3600
+            hour = self._local_hour
+        self.hour = hour
+        self._index = self.engine.index(hour)
+        self._dirty = True
+
+    def add(self, product_id):
+        """Menambahkan satu unit produk dan mengembalikan total baru."""
+        if not self._dirty:
+            self._start()
+        engine = self.engine
+        price = engine.prices[product_id]
+        self.base += price
+        units, value = self.units, self.value
+        for group in engine.product_groups[product_id]:
+            units[group] += 1
+            value[group] += price
+        term_ids = self._index[product_id]
+        if term_ids:
+            terms, term_values = engine.terms, self.term_values
+            adjustment = self.adjustment
+            for term_id in term_ids:
+                new = terms[term_id].evaluate(units, value)
+                adjustment += new - term_values[term_id]
+                term_values[term_id] = new
+            self.adjustment = adjustment
+        self.total = engine.finish(self.base, self.adjustment)
+        return self.total
+
+    def applied(self):
+        """Pasangan (nama aturan, potongan) yang sedang berlaku, untuk ditampilkan."""
+        applied = {}
+        for term_id, amount in enumerate(self.term_values):
+            if amount:
+                name = self.engine.term_rules[term_id].name
+                applied[name] = applied.get(name, 0) - amount
+        return tuple(applied.items())
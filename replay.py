@@ -0,0 +1,293 @@
+# replay.py
+"""
+Replay dan benchmark VendingMachineDFA tanpa GUI.
+
+Contoh:
+    python replay.py generate transaksi.vmr -n 100000
+    python replay.py run transaksi.vmr --engine compiled
+    python replay.py run --generate 100000 --baseline benchmarks/replay_baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import resource
+import struct
+import sys
+import time
+from array import array
+
+from vending_machine_dfa import VendingMachineDFA
+from compiled_dfa import CompiledVendingMachineDFA
+
+ENGINES = {'base': VendingMachineDFA, 'compiled': CompiledVendingMachineDFA}
+
+# Format biner: MAGIC, offset tabel simbol (uint32), lalu record
+# (id mesin uint32, panjang uint16, kode simbol uint8 x panjang),
+# dan di akhir file tabel simbol + nama mesin dalam JSON.
+MAGIC = b'VMR1'
+_HEADER = struct.Struct('<4sI')
+_RECORD = struct.Struct('<IH')
+
+# Metrik yang dibandingkan dengan baseline: (nama, True jika makin besar makin baik)
+COMPARED_METRICS = (
+    ('transactions_per_sec', True),
+    ('symbols_per_sec', True),
+    ('latency_p50_ns', False),
+    ('latency_p99_ns', False),
+)
+
+
+def generate_transactions(n, seed=0, n_machines=16):
+    """Menghasilkan n transaksi sintetis berupa pasangan (mesin, list simbol)."""
+    rng = random.Random(seed)
+    dfa = VendingMachineDFA()
+    scoops = [name for name, kind in dfa.item_types.items() if kind == 'scoop']
+    toppings = [name for name, kind in dfa.item_types.items() if kind == 'topping']
+    bills = sorted(s for s in dfa.alphabet if isinstance(s, int))
+    for _ in range(n):
+        symbols = [rng.choice(scoops) for _ in range(rng.randint(1, 3))] + ['Next']
+        symbols += [rng.choice(toppings) for _ in range(rng.randint(0, 2))] + ['Checkout']
+        if rng.random() < 0.1:
+            symbols.append('Cancel')
+        else:
+            symbols += [rng.choice(bills) for _ in range(rng.randint(1, 4))]
+        yield f"mesin-{rng.randrange(n_machines)}", symbols
+
+
+def iter_jsonl(path):
+    """Membaca transaksi dari JSONL: {"machine": ..., "symbols": [...]} atau list simbol per baris."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, list):
+                yield None, record
+            else:
+                yield record.get('machine'), record['symbols']
+
+
+def write_jsonl(path, transactions):
+    with open(path, 'w', encoding='utf-8') as f:
+        for machine, symbols in transactions:
+            f.write(json.dumps({'machine': machine, 'symbols': symbols}) + '\n')
+
+
+def read_binary_table(path):
+    """Membaca tabel simbol dan nama mesin dari file replay biner."""
+    with open(path, 'rb') as f:
+        magic, table_offset = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} bukan file replay biner.")
+        f.seek(table_offset)
+        return json.loads(f.read().decode('utf-8'))
+
+
+def iter_binary_records(path):
+    """Membaca record mentah (id mesin, kode simbol dalam bytes) secara streaming."""
+    with open(path, 'rb') as f:
+        magic, table_offset = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} bukan file replay biner.")
+        while f.tell() < table_offset:
+            machine_id, length = _RECORD.unpack(f.read(_RECORD.size))
+            yield machine_id, f.read(length)
+
+
+def iter_binary(path):
+    """Membaca transaksi dari format biner ringkas secara streaming."""
+    table = read_binary_table(path)
+    symbols, machines = table['symbols'], table['machines']
+    for machine_id, codes in iter_binary_records(path):
+        yield machines[machine_id], [symbols[code] for code in codes]
+
+
+def write_binary(path, transactions):
+    symbol_ids, machine_ids = {}, {}
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, 0))
+        for machine, symbols in transactions:
+            codes = bytearray()
+            for symbol in symbols:
+                code = symbol_ids.setdefault(symbol, len(symbol_ids))
+                if code > 255:
+                    raise ValueError("Format biner mendukung paling banyak 256 simbol berbeda.")
+                codes.append(code)
+            f.write(_RECORD.pack(machine_ids.setdefault(machine, len(machine_ids)), len(codes)))
+            f.write(codes)
+        table_offset = f.tell()
+        f.write(json.dumps({'symbols': list(symbol_ids), 'machines': list(machine_ids)}).encode('utf-8'))
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, table_offset))
+
+
+def load_transactions(path):
+    """Memilih pembaca berdasarkan ekstensi file (.jsonl atau biner)."""
+    return iter_jsonl(path) if path.endswith('.jsonl') else iter_binary(path)
+
+
+def replay(transactions, dfa, api='step'):
+    """
+    Menjalankan setiap transaksi dari awal (reset) sampai selesai; transaksi yang
+    berhenti di 'DispensingItem' diselesaikan seperti App.finish_transaction.
+    Mengembalikan (jumlah transaksi, jumlah simbol).
+    """
+    n_transactions = n_symbols = 0
+    # 'step' hanya membuat event; 'delta' juga merender teks seperti yang dilakukan GUI
+    delta = dfa.step if api == 'step' else dfa.delta
+    # finish() menyelesaikan DispensingItem tanpa membaca nama state; teksnya ikut dirender untuk 'delta'
+    finish, render = dfa.finish, api == 'delta'
+    for _, symbols in transactions:
+        dfa.reset()
+        for symbol in symbols:
+            delta(symbol)
+        event = finish()
+        if render and event is not None:
+            str(event)
+        n_transactions += 1
+        n_symbols += len(symbols)
+    return n_transactions, n_symbols
+
+
+def measure_latency(transactions, dfa, max_symbols, api='step'):
+    """Mengukur latensi per simbol (ns) untuk paling banyak max_symbols simbol."""
+    samples = array('q')
+    clock = time.perf_counter_ns
+    delta = dfa.step if api == 'step' else dfa.delta
+    finish, render = dfa.finish, api == 'delta'
+    for _, symbols in transactions:
+        dfa.reset()
+        for symbol in symbols:
+            start = clock()
+            delta(symbol)
+            samples.append(clock() - start)
+        event = finish()
+        if render and event is not None:
+            str(event)
+        if len(samples) >= max_symbols:
+            break
+    return sorted(samples)
+
+
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0
+    return sorted_samples[min(len(sorted_samples) - 1, int(q / 100 * len(sorted_samples)))]
+
+
+def run_benchmark(source, engine='compiled', api='step', latency_symbols=200_000, repeat=3):
+    """Menjalankan replay (throughput) lalu pengukuran latensi; source adalah path atau fungsi pembuat iterator."""
+    open_source = (lambda: load_transactions(source)) if isinstance(source, str) else source
+    dfa = ENGINES[engine]()
+
+    # Throughput diambil dari putaran tercepat agar gangguan sesaat di mesin tidak terhitung
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_transactions, n_symbols = replay(open_source(), dfa, api)
+        elapsed = min(elapsed, time.perf_counter() - start)
+
+    samples = measure_latency(open_source(), dfa, latency_symbols, api)
+    return {
+        'engine': engine,
+        'api': api,
+        'python': platform.python_version(),
+        'transactions': n_transactions,
+        'symbols': n_symbols,
+        'seconds': round(elapsed, 4),
+        'transactions_per_sec': round(n_transactions / elapsed, 1) if elapsed else 0.0,
+        'symbols_per_sec': round(n_symbols / elapsed, 1) if elapsed else 0.0,
+        'latency_p50_ns': percentile(samples, 50),
+        'latency_p99_ns': percentile(samples, 99),
+        # ru_maxrss dalam KiB di Linux
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def baseline_key(results):
+    return f"{results['engine']}/{results['api']}"
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Mengembalikan daftar regresi terhadap baseline untuk engine dan API yang sama."""
+    reference = baseline.get(baseline_key(results))
+    if reference is None:
+        return []
+    regressions = []
+    for name, higher_is_better in COMPARED_METRICS:
+        old, new = reference.get(name), results.get(name)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append(f"{name}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay dan benchmark VendingMachineDFA tanpa GUI.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    gen = sub.add_parser('generate', help="Membuat file transaksi sintetis (.jsonl atau biner).")
+    gen.add_argument('output')
+    gen.add_argument('-n', '--count', type=int, default=100_000)
+    gen.add_argument('--seed', type=int, default=0)
+    gen.add_argument('--machines', type=int, default=16)
+
+    run = sub.add_parser('run', help="Menjalankan replay dan melaporkan throughput/latensi.")
+    run.add_argument('input', nargs='?', help="File .jsonl atau biner hasil 'generate'.")
+    run.add_argument('--generate', type=int, metavar='N', help="Pakai N transaksi sintetis, tanpa file.")
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--engine', choices=sorted(ENGINES), default='compiled')
+    run.add_argument('--api', choices=('step', 'delta'), default='step',
+                     help="'step' (event saja) atau 'delta' (event + teks seperti GUI).")
+    run.add_argument('--latency-symbols', type=int, default=200_000)
+    run.add_argument('--repeat', type=int, default=3, help="Jumlah putaran throughput (diambil yang tercepat).")
+    run.add_argument('--baseline', help="File JSON baseline untuk mendeteksi regresi.")
+    run.add_argument('--tolerance', type=float, default=0.2, help="Batas regresi relatif (default 0.2).")
+    run.add_argument('--save-baseline', action='store_true', help="Menyimpan hasil ke file --baseline.")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        transactions = generate_transactions(args.count, args.seed, args.machines)
+        writer = write_jsonl if args.output.endswith('.jsonl') else write_binary
+        writer(args.output, transactions)
+        return 0
+
+    if args.generate:
+        # Transaksi dibuat di memori dulu agar waktu pembuatannya tidak ikut terukur
+        transactions = list(generate_transactions(args.generate, args.seed))
+        source = lambda: iter(transactions)
+    elif args.input:
+        source = args.input
+    else:
+        parser.error("Berikan file input atau --generate N.")
+
+    results = run_benchmark(source, args.engine, args.api, args.latency_symbols, args.repeat)
+    print(json.dumps(results, indent=2))
+
+    if args.baseline and args.save_baseline:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            baseline = {}
+        baseline[baseline_key(results)] = results
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+    elif args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("REGRESI terhadap baseline:", *regressions, sep='\n  ', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
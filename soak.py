@@ -0,0 +1,270 @@
+# soak.py
+"""
+Soak test GUI kiosk: menjalankan App dengan aliran input acak ber-seed
+(handle_input / take_change) dalam waktu lama, mengambil sampel pemakaian
+sumber daya secara berkala, dan gagal jika pertumbuhannya melewati batas.
+
+Yang disampel: RSS proses, jumlah widget Tk, jumlah item di semua canvas,
+jumlah thread, jumlah callback after() yang tertunda, dan jumlah baris di
+area status. Pertumbuhan dihitung dari sampel pertama setelah pemanasan
+sampai sampel terakhir.
+
+Animasi memakai jam yang dipercepat (--time-scale) agar berjam-jam pemakaian
+bisa disimulasikan dalam hitungan menit. Jurnal dan data penjualan ditulis ke
+direktori sementara, bukan milik kiosk sebenarnya.
+
+Contoh:
+    xvfb-run -a python soak.py --steps 20000 --seed 7 --output soak.json
+
+Tanpa display, skrip mencoba menjalankan ulang dirinya lewat xvfb-run; jika
+tidak tersedia, skrip keluar dengan kode SKIP_EXIT_CODE (77, kode "skipped"
+automake/ctest), bukan 0, agar CI tidak menganggap soak test lulus.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tkinter as tk
+
+_XVFB_ENV = "VM_SOAK_XVFB"
+SKIP_EXIT_CODE = 77  # tidak ada display: dilewati, bukan lulus
+
+# Batas pertumbuhan default (sampel terakhir - sampel dasar)
+DEFAULT_LIMITS = {
+    'rss_mb': 64.0,
+    'widgets': 40,
+    'canvas_items': 100,
+    'threads': 2,
+    'after_jobs': 10,
+    'status_lines': 400,
+}
+
+
+# --- Pengukuran ---
+
+def rss_bytes():
+    """RSS proses saat ini; di luar Linux memakai puncak RSS dari getrusage."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _walk(widget):
+    stack = [widget]
+    while stack:
+        widget = stack.pop()
+        yield widget
+        stack.extend(widget.winfo_children())
+
+
+def sample(app, step, clock_start):
+    widgets = 0
+    canvas_items = 0
+    for widget in _walk(app):
+        widgets += 1
+        if isinstance(widget, tk.Canvas):
+            canvas_items += len(widget.find_all())
+    return {
+        'step': step,
+        'seconds': round(time.perf_counter() - clock_start, 2),
+        'rss_mb': round(rss_bytes() / (1024 * 1024), 2),
+        'widgets': widgets,
+        'canvas_items': canvas_items,
+        'threads': threading.active_count(),
+        'after_jobs': len(app.tk.splitlist(app.tk.call('after', 'info'))),
+        'status_lines': int(app.notification_textbox.index("end-1c").split('.')[0]),
+    }
+
+
+def check_growth(baseline, final, limits):
+    """Daftar (metrik, pertumbuhan, batas) yang melewati batas."""
+    failures = []
+    for name, limit in limits.items():
+        growth = final[name] - baseline[name]
+        if growth > limit:
+            failures.append((name, round(growth, 2), limit))
+    return failures
+
+
+# --- Penggerak input ---
+
+class InputDriver:
+    """
+    Memilih input berikutnya berdasarkan state snapshot: sebagian besar input
+    yang masuk akal untuk state tersebut, sisanya (`noise`) simbol acak apa pun
+    termasuk yang tidak valid.
+    """
+
+    def __init__(self, app, rng, noise=0.05, max_cart=8):
+        self.app = app
+        self.rng = rng
+        self.noise = noise
+        self.max_cart = max_cart
+        catalog = app.catalog
+        self.scoops = catalog.category('scoop')
+        self.toppings = catalog.category('topping')
+        self.money = sorted(s for s in app.vm_dfa.alphabet if isinstance(s, int))
+        self.everything = list(catalog.by_name) + self.money + ['Next', 'Checkout', 'Cancel', 'Bogus']
+
+    def next_symbol(self, snapshot):
+        rng = self.rng
+        if rng.random() < self.noise:
+            return rng.choice(self.everything)
+        state = snapshot.state
+        roll = rng.random()
+        if state == 'WaitingForPayment':
+            if roll < 0.03:
+                return 'Cancel'
+            suggestion = self.app.payment_paths.suggest(snapshot.total_price - snapshot.money_inserted)
+            if suggestion is not None and roll < 0.7:
+                return suggestion.bills[0]
+            return rng.choice(self.money)
+        if roll < 0.02:
+            return 'Cancel'
+        full = snapshot.order_length >= self.max_cart
+        if state == 'ToppingSelection':
+            return 'Checkout' if full or roll > 0.7 else rng.choice(self.toppings)
+        # Idle / IceCreamSelection
+        if snapshot.order_length and (full or roll > 0.75):
+            return 'Next'
+        return rng.choice(self.scoops)
+
+
+def pump(app, timeout=5.0):
+    """Memproses event Tk sampai GUI sudah menggambar snapshot terbaru dari controller."""
+    app.controller.wait_idle(timeout)
+    deadline = time.monotonic() + timeout
+    while True:
+        app.update()
+        if app._snapshot is app.controller.snapshot or time.monotonic() > deadline:
+            return
+        time.sleep(0.001)
+
+
+def scaled_clock(scale):
+    origin = time.perf_counter()
+    return lambda: origin + (time.perf_counter() - origin) * scale
+
+
+# --- Runner ---
+
+def run_soak(steps=20000, seed=0, sample_every=500, warmup=1000, time_scale=20.0,
+             noise=0.05, limits=None, log=print):
+    from main import App
+
+    limits = dict(DEFAULT_LIMITS if limits is None else limits)
+    with tempfile.TemporaryDirectory(prefix="vm-soak-") as workdir:
+        class SoakApp(App):
+            JOURNAL_PATH = os.path.join(workdir, "kiosk.journal")
+            SALES_DIR = os.path.join(workdir, "sales_data")
+            POLL_MS = 1
+
+        app = SoakApp()
+        app.animator.clock = scaled_clock(time_scale)
+        driver = InputDriver(app, random.Random(seed), noise=noise)
+        clock_start = time.perf_counter()
+        samples = []
+        baseline = None
+        transactions = 0
+        try:
+            pump(app)
+            for step in range(1, steps + 1):
+                snapshot = app._snapshot
+                if snapshot.state == 'ReturningChange':
+                    app.take_change()
+                    transactions += 1
+                elif snapshot.state == 'DispensingItem':
+                    time.sleep(0.001)  # animasi berjalan di tick Tk; tunggu sampai selesai
+                else:
+                    app.handle_input(driver.next_symbol(snapshot))
+                pump(app)
+
+                if step % sample_every == 0 or step == steps:
+                    current = sample(app, step, clock_start)
+                    current['transactions'] = transactions
+                    samples.append(current)
+                    if baseline is None and step >= warmup:
+                        baseline = current
+                    log(" ".join(f"{key}={value}" for key, value in current.items()))
+        finally:
+            app._on_close()
+
+    baseline = baseline or samples[0]
+    failures = check_growth(baseline, samples[-1], limits)
+    return {
+        'steps': steps,
+        'seed': seed,
+        'time_scale': time_scale,
+        'transactions': transactions,
+        'seconds': samples[-1]['seconds'],
+        'limits': limits,
+        'baseline': baseline,
+        'final': samples[-1],
+        'failures': [{'metric': name, 'growth': growth, 'limit': limit} for name, growth, limit in failures],
+        'samples': samples,
+    }
+
+
+def _parse_limit(text):
+    name, _, value = text.partition('=')
+    if name not in DEFAULT_LIMITS or not value:
+        raise argparse.ArgumentTypeError(f"Format: metrik=nilai, metrik salah satu dari {', '.join(DEFAULT_LIMITS)}")
+    return name, float(value)
+
+
+def _has_display():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return False
+    root.destroy()
+    return True
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    parser = argparse.ArgumentParser(description="Soak test GUI kiosk dengan input acak ber-seed.")
+    parser.add_argument('--steps', type=int, default=20000, help="Jumlah langkah (input / ambil kembalian).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sample-every', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=1000, help="Langkah sebelum sampel dasar diambil.")
+    parser.add_argument('--time-scale', type=float, default=20.0, help="Percepatan jam animasi.")
+    parser.add_argument('--noise', type=float, default=0.05, help="Peluang input acak/tidak valid.")
+    parser.add_argument('--limit', type=_parse_limit, action='append', default=[],
+                        help="Batas pertumbuhan, mis. --limit rss_mb=32 (boleh berulang).")
+    parser.add_argument('--output', help="Tulis ringkasan dan semua sampel sebagai JSON.")
+    args = parser.parse_args(argv)
+
+    if not _has_display():
+        if not os.environ.get(_XVFB_ENV) and shutil.which('xvfb-run'):
+            env = dict(os.environ, **{_XVFB_ENV: "1"})
+            return subprocess.call(['xvfb-run', '-a', sys.executable, os.path.abspath(__file__)] + argv, env=env)
+        print(f"Tidak ada display untuk Tk dan xvfb-run tidak tersedia; soak test dilewati "
+              f"(kode keluar {SKIP_EXIT_CODE}).", file=sys.stderr)
+        return SKIP_EXIT_CODE
+
+    limits = dict(DEFAULT_LIMITS)
+    limits.update(args.limit)
+    result = run_soak(args.steps, args.seed, args.sample_every, args.warmup, args.time_scale, args.noise, limits)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+    summary = {key: value for key, value in result.items() if key != 'samples'}
+    print(json.dumps(summary, indent=2))
+    return 1 if result['failures'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
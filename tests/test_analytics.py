@@ -0,0 +1,85 @@
+# tests/test_analytics.py
+# Jalankan dari root repo: python -m pytest tests
+
+import os
+
+import numpy as np
+
+import analytics
+from analytics import ROLLUP_COLUMNS, SalesStore, SalesWriter, daily_totals
+from vending_machine_dfa import VendingMachineDFA
+
+DAY = 86400
+
+
+def _sale(dfa, symbols):
+    dfa.reset()
+    for symbol in symbols:
+        dfa.step(symbol)
+    return dfa.finish()
+
+
+def _fill(store, rows, start=20000 * DAY):
+    for i in range(rows):
+        items = [('Vanilla Scoop', 1 + i % 3)] + ([('Caramel', 1)] if i % 2 else [])
+        store.append(items, 5000 + i % 7, 10000, 5000 - i % 7, timestamp=start + i * 3000, machine=f"m{i % 2}")
+
+
+def _assert_same_rollup(a, b):
+    for name in ROLLUP_COLUMNS:
+        assert np.array_equal(a[name], b[name]), name
+
+
+def test_incremental_rollup_matches_full_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, 'COMPACT_EVERY', 4)
+    directory = str(tmp_path / 'sales')
+    store = SalesStore(directory, chunk_size=16, utc_offset=0)
+    store.rollup()
+    _fill(store, 16 * 9 + 5)
+    store.flush()
+    # 10 chunk: dipadatkan di chunk ke-4 dan ke-8, dua chunk terakhir hanya sebagai ringkasan per chunk
+    assert len(store.chunks) == 10 and store._compacted == 8
+
+    reopened = SalesStore(directory)
+    _assert_same_rollup(store.rollup(), reopened.rollup())
+    assert sum(count for _, count, _, _ in daily_totals(reopened)) == 16 * 9 + 5
+
+    os.remove(os.path.join(directory, 'rollup_daily.npz'))
+    _assert_same_rollup(store.rollup(), SalesStore(directory).rollup())
+
+
+def test_flush_does_not_rewrite_rollup_between_compactions(tmp_path):
+    directory = str(tmp_path / 'sales')
+    store = SalesStore(directory, chunk_size=8, utc_offset=0)
+    _fill(store, 8 * 4)
+    assert int(store.rollup()['count'].sum()) == 32
+    _fill(store, 8 * 3)
+    # Belum COMPACT_EVERY chunk: ringkasan hanya ada per chunk, rollup_daily.npz belum ditulis
+    assert not os.path.exists(os.path.join(directory, 'rollup_daily.npz'))
+    assert int(store.rollup()['count'].sum()) == 56
+
+
+def test_max_age_flushes_on_next_append(tmp_path):
+    store = SalesStore(str(tmp_path / 'sales'), chunk_size=1000, utc_offset=0, max_age=0)
+    _fill(store, 1)
+    assert len(store.chunks) == 1 and store.rows() == 1
+
+
+def test_writer_records_off_thread_and_flushes_on_close(tmp_path):
+    directory = str(tmp_path / 'sales')
+    writer = SalesWriter(SalesStore(directory, chunk_size=1000, utc_offset=0), poll_interval=0.01)
+    dfa = VendingMachineDFA()
+    for _ in range(5):
+        writer.record(_sale(dfa, ['Vanilla Scoop', 'Next', 'Caramel', 'Checkout', 20000]), machine='kiosk')
+    assert writer.close()
+    store = SalesStore(directory)
+    assert store.rows() == 5 and len(store.chunks) == 1
+    assert int(store.rollup()['revenue'].sum()) == 5 * dfa.menu_prices['Vanilla Scoop'] + 5 * dfa.menu_prices['Caramel']
+
+
+def test_generate_writes_exactly_days_times_per_day(tmp_path):
+    store = analytics.generate(str(tmp_path / 'sales'), days=10, per_day=500, start='2026-01-01')
+    assert store.rows() == 5000
+    days = daily_totals(store)
+    assert [day for day, _, _, _ in days] == [f"2026-01-{d:02d}" for d in range(1, 11)]
+    assert {count for _, count, _, _ in days} == {500}
@@ -0,0 +1,32 @@
+# tests/test_assets.py
+# Jalankan dari root repo: python -m pytest tests
+
+from PIL import Image
+
+from assets import AssetManager
+
+SIZE = (20, 16)
+
+
+def _images(tmp_path, n):
+    paths = []
+    for i in range(n):
+        path = str(tmp_path / f"produk-{i}.png")
+        Image.new("RGBA", (40, 32), (i * 40, 0, 0, 255)).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_lru_keeps_recently_used_images(tmp_path):
+    a, b, c = _images(tmp_path, 3)
+    assets = AssetManager(str(tmp_path / 'cache'), max_images=2)
+    first = assets.image(a, SIZE)
+    assets.image(b, SIZE)
+    assert assets.image(a, SIZE) is first  # a dipakai lagi, jadi b yang paling lama
+    assets.image(c, SIZE)
+    assert set(key[0] for key in assets._ctk_images) == {a, c}
+    assert len(assets._scaled) == 2
+    # Gambar yang dibuang dimuat ulang dari cache disk dengan isi yang sama
+    reloaded = assets.image(b, SIZE)
+    assert reloaded.cget('light_image').size == SIZE
+    assert len(assets._ctk_images) == 2 and assets.stats['hits'] == 1 and assets.stats['loads'] == 4
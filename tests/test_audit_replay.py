@@ -0,0 +1,42 @@
+# tests/test_audit_replay.py
+# Jalankan dari root repo: python -m pytest tests
+
+import json
+
+import pytest
+
+from audit_replay import audit_log
+from replay import generate_transactions, write_binary, write_jsonl
+
+# Kunci yang bergantung pada cara audit dijalankan, bukan pada isi log
+RUN_KEYS = ('workers', 'seconds', 'transactions_per_sec')
+
+
+def _result(totals):
+    return {key: value for key, value in totals.items() if key not in RUN_KEYS}
+
+
+@pytest.fixture(scope='module')
+def transactions():
+    return list(generate_transactions(3000, seed=5))
+
+
+@pytest.mark.parametrize('suffix', ['.jsonl', '.bin'])
+def test_sharded_audit_matches_single_process(tmp_path, transactions, suffix):
+    path = str(tmp_path / f"transaksi{suffix}")
+    (write_jsonl if suffix == '.jsonl' else write_binary)(path, transactions)
+    single = audit_log(path, n_workers=1)
+    assert single['transactions'] == len(transactions) and single['completed'] > 0
+    for n_workers, chunk_size in ((3, 50), (4, 7)):
+        assert _result(audit_log(path, n_workers=n_workers, chunk_size=chunk_size)) == _result(single)
+
+
+def test_malformed_records_are_counted_in_every_shard_layout(tmp_path, transactions):
+    path = str(tmp_path / 'transaksi.jsonl')
+    write_jsonl(path, transactions[:500])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"machine": "mesin-1", "symbols": \n')
+        f.write(json.dumps({'machine': 'mesin-2'}) + '\n')
+    single = audit_log(path, n_workers=1)
+    assert single['malformed'] == 2 and single['transactions'] == 500
+    assert _result(audit_log(path, n_workers=3, chunk_size=16)) == _result(single)
@@ -0,0 +1,60 @@
+# tests/test_cassette.py
+# Jalankan dari root repo: python -m pytest tests
+
+import pytest
+
+from cassette import CassetteInventory
+
+EMPTY = {2000: 0, 5000: 0, 10000: 0, 20000: 0}
+
+
+def test_exact_payment_always_accepted_when_empty():
+    inventory = CassetteInventory(EMPTY)
+    assert inventory.can_accept(10000, 0, 10000)
+    assert inventory.can_accept(5000, 0, 10000)  # belum lunas, belum ada kembalian
+
+
+def test_refuses_bill_when_change_is_depleted():
+    inventory = CassetteInventory(EMPTY)
+    # Tagihan 8000 dibayar 10000: kembalian 2000 tidak ada di kaset
+    assert not inventory.can_accept(10000, 0, 8000)
+    inventory.counts[2000] = 1
+    assert inventory.can_accept(10000, 0, 8000)
+    # Lembar 2000 terakhir habis untuk kembalian transaksi sebelumnya
+    inventory.hold(10000)
+    assert inventory.settle(2000) == [2000]
+    assert inventory.counts == {2000: 0, 5000: 0, 10000: 1, 20000: 0}
+    assert not inventory.can_accept(10000, 0, 8000)
+
+
+def test_escrow_and_incoming_bill_count_as_change():
+    inventory = CassetteInventory(EMPTY)
+    inventory.hold(2000)
+    # Sudah masuk 2000 untuk tagihan 10000; 10000 lagi berarti kembalian 2000 dari escrow
+    assert inventory.can_accept(10000, 2000, 10000)
+    # Tanpa escrow, kembalian 2000 tidak bisa dibayar
+    assert not CassetteInventory(EMPTY).can_accept(10000, 2000, 10000)
+
+
+def test_refuses_bill_when_its_slot_is_full():
+    inventory = CassetteInventory({2000: 2, 5000: 0, 10000: 0, 20000: 0}, capacity=3)
+    assert inventory.can_accept(2000, 0, 10000)
+    inventory.hold(2000)
+    # Kaset 2000 berisi 2 + 1 di escrow = kapasitas
+    assert not inventory.can_accept(2000, 2000, 10000)
+    assert inventory.can_accept(5000, 2000, 10000)
+
+
+def test_settle_refuses_impossible_change():
+    inventory = CassetteInventory(EMPTY)
+    inventory.hold(10000)
+    with pytest.raises(ValueError):
+        inventory.settle(3000)
+
+
+def test_bounded_change_respects_counts():
+    inventory = CassetteInventory({2000: 5, 5000: 1, 10000: 0, 20000: 0})
+    # Tanpa batas jumlah: 5000 + 5000; hanya ada satu lembar 5000, jadi 2000 x 5
+    assert inventory.make_change(10000) == [2000, 2000, 2000, 2000, 2000]
+    assert inventory.make_change(9000) == [5000, 2000, 2000]
+    assert inventory.make_change(20000) is None
@@ -0,0 +1,57 @@
+# tests/test_change_maker.py
+# Jalankan dari root repo: python -m pytest tests
+
+from itertools import combinations_with_replacement
+
+import pytest
+
+from change_maker import ChangeMaker, make_change
+
+DENOMINATION_SETS = [
+    (2000, 5000, 10000, 20000),
+    (1000, 4000, 6000),  # greedy salah: 8000 = 4000 + 4000, bukan 6000 + 1000 + 1000
+    (3000, 7000),
+    (5000,),
+]
+
+
+def _brute_force(amount, denominations):
+    """Jumlah lembar minimal untuk `amount` dengan mencoba semua multiset lembar, atau None."""
+    if amount == 0:
+        return 0
+    for n in range(1, amount // min(denominations) + 1):
+        if any(sum(bills) == amount for bills in combinations_with_replacement(denominations, n)):
+            return n
+    return None
+
+
+@pytest.mark.parametrize('denominations', DENOMINATION_SETS)
+def test_dp_matches_brute_force(denominations):
+    maker = ChangeMaker(denominations)
+    for amount in range(0, 40001, 1000):
+        bills = maker.make_change(amount)
+        expected = _brute_force(amount, denominations)
+        if expected is None:
+            assert bills is None, amount
+        else:
+            assert sum(bills) == amount and len(bills) == expected, amount
+            assert bills == sorted(bills, reverse=True)
+            assert set(bills) <= set(denominations)
+
+
+def test_amounts_above_table_limit():
+    maker = ChangeMaker((1000, 4000, 6000))
+    amount = maker.limit + 17000
+    bills = maker.make_change(amount)
+    assert sum(bills) == amount
+    # Di atas batas tabel, sisanya diisi pecahan terbesar; tetap minimal (6000 x n + 4000 + 4000 + 1000 ...)
+    assert len(bills) == len(ChangeMaker((1000, 4000, 6000)).make_change(amount - 6000)) + 1
+
+
+def test_cached_make_change_returns_fresh_lists():
+    first = make_change(8000, [1000, 4000, 6000])
+    assert first == [4000, 4000]
+    first.append(1)
+    assert make_change(8000, (6000, 4000, 1000)) == [4000, 4000]
+    assert make_change(500, [1000]) is None
+    assert make_change(-1000, [1000]) is None
@@ -0,0 +1,63 @@
+# tests/test_compiled_dfa.py
+# Jalankan dari root repo: python -m pytest tests
+
+import pytest
+
+import events
+from catalog import default_catalog
+from compiled_dfa import CompiledVendingMachineDFA, check_parity
+from pricing import ComboDiscount, HappyHour, PricingEngine, ToppingCap
+
+BOUNDED_CASSETTE = {2000: 3, 5000: 1, 10000: 1, 20000: 0}
+
+
+def _pricing():
+    return PricingEngine([
+        ComboDiscount("Paket Duo", {'scoop': 2, 'topping': 1}, 3000),
+        HappyHour("Sepanjang Hari", 'scoop', 20, 0, 24),
+        ToppingCap("Topping Puas", 'topping', 2),
+    ], default_catalog())
+
+
+@pytest.mark.parametrize('api', ['delta', 'step'])
+def test_parity_default(api):
+    check_parity(api=api)
+
+
+@pytest.mark.parametrize('api', ['delta', 'step'])
+def test_parity_order_log(api):
+    check_parity(api=api, order_log=True)
+
+
+@pytest.mark.parametrize('api', ['delta', 'step'])
+def test_parity_bounded_cassette(api):
+    check_parity(cassette_counts=BOUNDED_CASSETTE, api=api)
+
+
+@pytest.mark.parametrize('api', ['delta', 'step'])
+def test_parity_pricing(api):
+    check_parity(pricing=_pricing(), api=api)
+
+
+def test_parity_pricing_with_bounded_cassette():
+    check_parity(cassette_counts=BOUNDED_CASSETTE, pricing=_pricing(), seed=1)
+
+
+def test_current_state_round_trip_and_finish():
+    dfa = CompiledVendingMachineDFA()
+    assert dfa.current_state == 'Idle'
+    for symbol in ['Vanilla Scoop', 'Next', 'Checkout', 20000]:
+        dfa.step(symbol)
+    assert dfa.current_state == 'DispensingItem'
+    # Tabel disusun ulang tanpa kehilangan state yang sedang berjalan
+    dfa.compile()
+    assert dfa.current_state == 'DispensingItem'
+    assert isinstance(dfa.finish(), events.Dispensed)
+    assert dfa.current_state == 'ReturningChange'
+    assert dfa.finish() is None
+    # Menyetel state dari luar (seperti model_checker) memindahkan baris tabel
+    dfa.reset()
+    dfa.current_state = 'ToppingSelection'
+    assert dfa.step('Caramel').total == 2000
+    dfa.reset()
+    assert dfa.current_state == 'Idle'
@@ -0,0 +1,81 @@
+# tests/test_controller.py
+# Jalankan dari root repo: python -m pytest tests
+
+import pytest
+
+import events
+from cassette import CassetteInventory
+from controller import MachineController
+from vending_machine_dfa import VendingMachineDFA
+
+ORDER = ['Vanilla Scoop', 'Next', 'Caramel', 'Checkout', 20000]
+
+
+@pytest.fixture
+def controller():
+    dfa = VendingMachineDFA(inventory=CassetteInventory({2000: 5, 5000: 5, 10000: 5, 20000: 5}), order_log=True)
+    controller = MachineController(dfa)
+    yield controller
+    assert controller.close()
+
+
+def _submit(controller, symbols):
+    for symbol in symbols:
+        controller.submit(symbol)
+    assert controller.wait_idle()
+    return controller.take()
+
+
+def test_requires_order_log():
+    with pytest.raises(ValueError):
+        MachineController(VendingMachineDFA())
+
+
+def test_input_is_held_while_dispensing_and_replayed_after_take_change(controller):
+    sales = []
+    controller.dispense_observer = sales.append
+    snapshot, messages = _submit(controller, ORDER)
+    assert snapshot.state == 'DispensingItem' and snapshot.money_inserted == 20000
+    paying = snapshot
+
+    # Input selama pengeluaran ditahan, bukan diproses atau dibuang
+    snapshot, messages = _submit(controller, ['Chocolate Scoop', 'Next'])
+    assert snapshot.state == 'DispensingItem' and snapshot.held == 2 and messages == []
+
+    controller.finish()
+    assert controller.wait_idle()
+    snapshot, messages = controller.take()
+    assert snapshot.state == 'ReturningChange' and snapshot.change_to_return == 8000
+    assert snapshot.change_bills == (2000, 2000, 2000, 2000)  # dengan 5000 sisanya 3000, tidak bisa pas
+    assert len(sales) == 1 and isinstance(sales[0], events.Dispensed)
+    assert messages == [str(sales[0])]
+    generation = snapshot.cart_generation
+
+    controller.take_change()
+    assert controller.wait_idle()
+    snapshot, messages = controller.take()
+    # Input yang ditahan menjadi awal transaksi berikutnya
+    assert snapshot.state == 'ToppingSelection' and snapshot.held == 0
+    assert snapshot.cart_generation != generation
+    assert [snapshot.products[i] for i in snapshot.order[:snapshot.order_length]] == ['Chocolate Scoop']
+    assert len(messages) == 2 and 'Chocolate Scoop' in messages[0]
+
+    # Snapshot lama tidak pernah berubah setelah dipublikasikan
+    assert paying.state == 'DispensingItem' and paying.money_inserted == 20000 and paying.held == 0
+
+
+def test_held_input_is_bounded(controller):
+    _submit(controller, ORDER)
+    snapshot, _ = _submit(controller, ['Next'] * (MachineController.HOLD_LIMIT + 3))
+    assert snapshot.held == MachineController.HOLD_LIMIT
+    assert controller.stats['dropped'] == 3
+
+
+def test_snapshot_carries_cassette_copy_only_while_paying(controller):
+    snapshot, _ = _submit(controller, ORDER[:-1])
+    assert snapshot.state == 'WaitingForPayment'
+    assert snapshot.inventory is not None and snapshot.inventory is not controller.dfa.inventory
+    snapshot, _ = _submit(controller, [10000])
+    assert snapshot.inventory.escrow == [10000]
+    snapshot, _ = _submit(controller, [10000])
+    assert snapshot.state == 'DispensingItem' and snapshot.inventory is None
@@ -0,0 +1,26 @@
+# tests/test_fleet.py
+# Jalankan dari root repo: python -m pytest tests
+
+import pytest
+
+from cassette import CassetteInventory
+from catalog import default_catalog
+from compiled_dfa import CompiledVendingMachineDFA
+from fleet import VendingMachineFleet, check_parity
+from pricing import PricingEngine, ToppingCap
+
+
+def test_parity_small():
+    check_parity(n=200, unknown_run=300)
+
+
+def test_rejects_pricing_dfa():
+    engine = PricingEngine([ToppingCap("Topping Puas", 'topping', 2)], default_catalog())
+    with pytest.raises(ValueError):
+        VendingMachineFleet(4, CompiledVendingMachineDFA(pricing=engine))
+
+
+def test_rejects_cassette_dfa():
+    inventory = CassetteInventory({2000: 5, 5000: 5, 10000: 5, 20000: 5})
+    with pytest.raises(ValueError):
+        VendingMachineFleet(4, CompiledVendingMachineDFA(inventory))
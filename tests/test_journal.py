@@ -0,0 +1,96 @@
+# tests/test_journal.py
+# Jalankan dari root repo: python -m pytest tests
+
+import pytest
+
+import events
+from cassette import CassetteInventory
+from catalog import Catalog, Product, default_catalog
+from journal import HEADER_SIZE, RECORD, Journal
+from pricing import HappyHour, PricingEngine
+from vending_machine_dfa import VendingMachineDFA
+
+FULL_CASSETTE = {2000: 20, 5000: 20, 10000: 10, 20000: 5}
+EMPTY_CASSETTE = {2000: 0, 5000: 0, 10000: 0, 20000: 0}
+
+
+def _run(journal, dfa, symbols):
+    for symbol in symbols:
+        event = dfa.step(symbol)
+        journal.record(symbol, dfa, event)
+    return event
+
+
+def test_recover_keeps_rejected_bill_rejected(tmp_path):
+    path = str(tmp_path / 'kiosk.journal')
+    journal = Journal(path)
+    dfa = VendingMachineDFA(inventory=CassetteInventory(EMPTY_CASSETTE))
+    # Kaset kosong: kembalian Rp 10000 tidak bisa dibayar, jadi Rp 20000 ditolak
+    event = _run(journal, dfa, ['Vanilla Scoop', 'Next', 'Checkout', 20000])
+    assert isinstance(event, events.PaymentRejected)
+    journal.close()  # crash: transaksi masih terbuka
+
+    journal = Journal(path)
+    restarted = VendingMachineDFA(inventory=CassetteInventory(FULL_CASSETTE))
+    message = journal.recover(restarted)
+    assert message == str(events.PaymentRejected(20000))
+    assert restarted.current_state == 'WaitingForPayment'
+    assert restarted.money_inserted == 0
+    assert restarted.inventory.counts == EMPTY_CASSETTE
+    journal.close()
+
+
+def test_recover_refuses_divergent_replay(tmp_path):
+    path = str(tmp_path / 'kiosk.journal')
+    journal = Journal(path)
+    dfa = VendingMachineDFA()
+    _run(journal, dfa, ['Vanilla Scoop', 'Next', 'Checkout', 5000])
+    # Ubah money_inserted pada record terakhir seolah uang yang tercatat berbeda
+    offset = HEADER_SIZE + (journal.head - 1) * RECORD.size
+    fields = list(RECORD.unpack_from(journal._mm, offset))
+    fields[-1] = 20000
+    RECORD.pack_into(journal._mm, offset, *fields)
+    journal.close()
+
+    journal = Journal(path)
+    with pytest.raises(ValueError):
+        journal.recover(VendingMachineDFA())
+    assert journal.open_start >= 0  # transaksi tetap terbuka untuk diperiksa
+    journal.close()
+
+
+def test_symbol_table_grows_past_header_and_survives_wrap(tmp_path):
+    names = [f"Produk dengan nama cukup panjang nomor {i}" for i in range(600)]
+    catalog = Catalog([Product(name, 'scoop', 1000) for name in names] + [Product("Caramel", 'topping', 1000)])
+    path = str(tmp_path / 'kiosk.journal')
+    journal = Journal(path, capacity=1024)
+    dfa = VendingMachineDFA(catalog=catalog)
+    for name in names:
+        _run(journal, dfa, [name, 'Cancel'])
+    assert journal.stats['wraps'] > 0
+    _run(journal, dfa, [names[-1], 'Next', "Caramel", "Bogus"])
+    journal.close()
+
+    journal = Journal(path)
+    assert set(names) <= set(journal.symbols)
+    restarted = VendingMachineDFA(catalog=catalog)
+    assert journal.recover(restarted) == str(events.INVALID_TOPPING_INPUT)
+    assert restarted.selected_items == [names[-1], "Caramel"]
+    journal.close()
+
+
+def test_recover_keeps_pricing_hour(tmp_path):
+    engine = PricingEngine([HappyHour("Sore Ceria", 'scoop', 50, 14, 16)], default_catalog())
+    path = str(tmp_path / 'kiosk.journal')
+    journal = Journal(path)
+    dfa = VendingMachineDFA(pricing=engine)
+    dfa.pricer.reset(15)  # pesanan dimulai saat happy hour
+    _run(journal, dfa, ['Vanilla Scoop', 'Next', 'Checkout'])
+    journal.close()
+
+    journal = Journal(path)
+    restarted = VendingMachineDFA(pricing=engine)
+    restarted.pricer.reset(20)  # restart di luar happy hour; jam dari jurnal yang dipakai
+    journal.recover(restarted)
+    assert restarted.total_price == dfa.total_price == 5000
+    journal.close()
@@ -0,0 +1,65 @@
+# tests/test_payment_paths.py
+# Jalankan dari root repo: python -m pytest tests
+
+from itertools import combinations_with_replacement
+
+import pytest
+
+from cassette import CassetteInventory
+from change_maker import make_change
+from payment_paths import PaymentPaths
+
+BILLS = (2000, 5000, 10000, 20000)
+
+
+def _brute_force(remaining, denominations, max_bills=14):
+    """(jumlah lembar, kembalian) terbaik dengan mencoba semua multiset lembar."""
+    for n in range(1, max_bills + 1):
+        overpay = [sum(bills) - remaining for bills in combinations_with_replacement(denominations, n)
+                   if sum(bills) >= remaining and make_change(sum(bills) - remaining, denominations) is not None]
+        if overpay:
+            return n, min(overpay)
+    return None
+
+
+@pytest.mark.parametrize('denominations', [BILLS, (3000, 7000), (5000, 20000, 50000)])
+def test_suggest_uses_fewest_bills(denominations):
+    paths = PaymentPaths(denominations, ceiling=40000)
+    for remaining in range(paths.unit, 40001, paths.unit):
+        suggestion = paths.suggest(remaining)
+        expected = _brute_force(remaining, denominations)
+        if expected is None:
+            assert suggestion is None, remaining
+            continue
+        assert (len(suggestion.bills), suggestion.change) == expected, remaining
+        assert sum(suggestion.bills) - remaining == suggestion.change
+
+
+def test_suggestions_start_with_suggest_and_stay_ordered():
+    paths = PaymentPaths(BILLS, ceiling=60000)
+    for remaining in (1000, 7000, 13000, 58000, 150000):
+        suggestions = list(paths.suggestions(remaining))
+        assert suggestions[0] == paths.suggest(remaining)
+        keys = [(len(s.bills), s.change) for s in suggestions]
+        assert keys == sorted(keys)
+
+
+def test_suggest_accepted_skips_bills_the_cassette_would_reject():
+    paths = PaymentPaths(BILLS)
+    # Tagihan 8000: saran terbaik Rp10000 (kembali 2000), tetapi kaset kosong tidak bisa membayar 2000
+    empty = CassetteInventory({2000: 0, 5000: 0, 10000: 0, 20000: 0})
+    assert paths.suggest(8000).bills == (10000,)
+    suggestion = paths.suggest_accepted(8000, empty, 0, 8000)
+    assert suggestion.bills == (2000, 2000, 2000, 2000) and suggestion.change == 0
+    # Dengan satu lembar 2000 di kaset, saran terbaik kembali dipakai
+    stocked = CassetteInventory({2000: 1, 5000: 0, 10000: 0, 20000: 0})
+    assert paths.suggest_accepted(8000, stocked, 0, 8000) == paths.suggest(8000)
+    assert stocked.escrow == []  # kaset asli tidak diubah
+
+
+def test_suggest_accepted_counts_escrow_as_change():
+    paths = PaymentPaths(BILLS)
+    inventory = CassetteInventory({2000: 0, 5000: 0, 10000: 0, 20000: 0})
+    inventory.hold(2000)
+    # Tagihan 10000, sudah masuk 2000: kembalian 2000 dari Rp10000 bisa dibayar dengan lembar di escrow
+    assert paths.suggest_accepted(8000, inventory, 2000, 10000) == paths.suggest(8000)
@@ -0,0 +1,58 @@
+# tests/test_pricing.py
+# Jalankan dari root repo: python -m pytest tests
+
+import random
+
+import pytest
+
+from catalog import default_catalog
+from pricing import ComboDiscount, HappyHour, PricingEngine, Rule, ToppingCap
+
+
+def _engine():
+    return PricingEngine([
+        ComboDiscount("Paket Duo", {'scoop': 2, 'topping': 1}, 3000),
+        # Melewati tengah malam: aktif 22:00-01:59
+        HappyHour("Malam Ceria", 'scoop', 15, 22, 2),
+        ToppingCap("Topping Puas", 'topping', 2),
+    ], default_catalog())
+
+
+def test_rule_is_abstract():
+    with pytest.raises(TypeError):
+        Rule("Tanpa compile")
+
+    class Incomplete(Rule):
+        __slots__ = ()
+
+    with pytest.raises(TypeError):
+        Incomplete("Tanpa compile")
+
+
+def test_happy_hour_wraps_past_midnight_and_rounds_discount_down():
+    engine = _engine()
+    scoop = [1, 0, 0, 0]  # Vanilla Scoop Rp10000; 15% = 1500, dibulatkan ke bawah ke 1000
+    assert [engine.price(scoop, hour) for hour in (21, 22, 23, 0, 1, 2)] == \
+        [10000, 9000, 9000, 9000, 9000, 10000]
+
+
+def test_combo_and_cap():
+    engine = _engine()
+    # 2 scoop + 4 Caramel pada siang hari: 1 paket (-3000), 2 Caramel di atas batas gratis (-4000)
+    assert engine.price([1, 1, 4, 0], 12) == 20000 + 8000 - 3000 - 4000
+    # Dua paket lengkap
+    assert engine.price([2, 2, 1, 1], 12) == 40000 + 4000 - 2 * 3000
+
+
+@pytest.mark.parametrize('hour', range(24))
+def test_incremental_add_matches_full_price(hour):
+    engine = _engine()
+    pricer = engine.pricer()
+    rng = random.Random(hour)
+    for _ in range(200):
+        pricer.reset(hour)
+        counts = [0] * len(engine.products)
+        for _ in range(rng.randint(1, 12)):
+            product_id = rng.randrange(len(counts))
+            counts[product_id] += 1
+            assert pricer.add(product_id) == engine.price(counts, hour), (hour, counts)
@@ -1,106 +1,173 @@
 # vending_machine_dfa.py
 
+import events
+from cart import Cart
+from catalog import default_catalog
+
+
 class VendingMachineDFA:
-    def __init__(self):
+    __slots__ = (
+        'inventory', 'catalog', 'pricer', 'states', 'item_types', 'menu_prices', 'alphabet', 'cart',
+        'current_state', 'total_price', 'money_inserted', 'change_to_return', 'change_bills', '_add_item'
+    )
+
+    def __init__(self, inventory=None, catalog=None, pricing=None, order_log=False):
+        # Persediaan uang kembalian (CassetteInventory); None berarti persediaan tak terbatas
+        self.inventory = inventory
         self.states = {
             'Idle', 'IceCreamSelection', 'ToppingSelection', 'WaitingForPayment',
             'DispensingItem', 'ReturningChange'
         }
-        self.item_types = {
-            'Vanilla Scoop': 'scoop', 'Chocolate Scoop': 'scoop',
-            'Caramel': 'topping', 'Sprinkles': 'topping'
-        }
-        self.menu_prices = {
-            'Vanilla Scoop': 10000,
-            'Chocolate Scoop': 10000,
-            'Caramel': 2000,
-            'Sprinkles': 2000
-        }
+        # Jenis dan harga produk berasal dari katalog bersama (lihat catalog.json)
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.item_types = self.catalog.types
+        self.menu_prices = self.catalog.prices
         self.alphabet = set(self.menu_prices.keys()) | {'Next', 'Checkout', 'Cancel'} | {2000, 5000, 10000, 20000}
-        
+        # Keranjang disimpan sebagai jumlah per produk (id produk = urutan di menu_prices);
+        # log urutan pilihan hanya disimpan jika diminta (order_log=True, untuk animasi GUI)
+        self.cart = Cart(self.menu_prices, order_log)
+        # Aturan promosi opsional (PricingEngine); None berarti total = jumlah harga katalog
+        self.pricer = None
+        if pricing is not None:
+            if pricing.products != self.cart.products:
+                raise ValueError("Aturan harga dikompilasi untuk katalog yang berbeda.")
+            self.pricer = pricing.pricer()
+        # Jalur tambah item dipilih sekali di sini, bukan diperiksa setiap item
+        self._add_item = self._bind_add_item()
+
         self.reset()
 
     def reset(self):
         """Mengembalikan mesin ke kondisi awal untuk transaksi baru."""
         self.current_state = 'Idle'
-        self.selected_items = []
+        self.cart.clear()
+        if self.pricer is not None:
+            self.pricer.reset()
         self.total_price = 0
         self.money_inserted = 0
         self.change_to_return = 0
+        self.change_bills = []
+
+    @property
+    def selected_items(self):
+        """Daftar nama item sesuai urutan dipilih (dibuat dari log keranjang, O(jumlah item))."""
+        return self.cart.names()
+
+    def _bind_add_item(self):
+        """
+        Fungsi tambah item untuk step: isi keranjang dan harga diikat sekali di sini
+        (Cart.clear mengosongkan di tempat), sehingga satu item cukup satu pemanggilan.
+        """
+        cart = self.cart
+        product_ids, counts = cart.product_ids, cart.counts
+        append_order = cart.order.append if cart.order is not None else None
+
+        if self.pricer is None:
+            prices = self.menu_prices
+
+            def add_item(name):
+                product_id = product_ids[name]
+                counts[product_id] += 1
+                if append_order is not None:
+                    append_order(product_id)
+                cart.filled = True
+                self.total_price += prices[name]
+        else:
+            price_add = self.pricer.add
+
+            def add_item(name):
+                product_id = product_ids[name]
+                counts[product_id] += 1
+                if append_order is not None:
+                    append_order(product_id)
+                cart.filled = True
+                self.total_price = price_add(product_id)
+        return add_item
+
+    def finish(self):
+        """
+        Menyelesaikan DispensingItem jika sedang menunggu (seperti App.finish_transaction).
+        Mengembalikan event Dispensed, atau None jika tidak ada yang perlu diselesaikan.
+        """
+        if self.current_state == 'DispensingItem':
+            return self.step(None)
+        return None
 
     def delta(self, input_symbol):
+        """Memproses satu simbol dan mengembalikan pesan output untuk GUI."""
+        return str(self.step(input_symbol))
+
+    def step(self, input_symbol):
+        """Memproses satu simbol dan mengembalikan event transisi (teks dibuat saat str(event))."""
         state = self.current_state
-        output = ""
+        event = events.IGNORED
 
         # PERBAIKAN: Logika untuk state 'Idle'
         if state == 'Idle':
             if self.item_types.get(input_symbol) == 'scoop':
-                self.selected_items.append(input_symbol)
-                self.total_price += self.menu_prices[input_symbol]
+                self._add_item(input_symbol)
                 self.current_state = 'IceCreamSelection'
-                output = f"'{input_symbol}' ditambahkan. Pilih scoop lagi atau tekan 'Next'."
+                event = events.ItemAdded(input_symbol, self.total_price, True)
             else:
-                output = "Silakan pilih es krim terlebih dahulu."
+                event = events.CHOOSE_ICE_CREAM_FIRST
 
         # PERBAIKAN: Logika untuk state 'IceCreamSelection'
         elif state == 'IceCreamSelection':
             if self.item_types.get(input_symbol) == 'scoop':
-                self.selected_items.append(input_symbol)
-                self.total_price += self.menu_prices[input_symbol]
-                output = f"'{input_symbol}' ditambahkan. Total: Rp {self.total_price}."
+                self._add_item(input_symbol)
+                event = events.ItemAdded(input_symbol, self.total_price, False)
             elif input_symbol == 'Next':
                 self.current_state = 'ToppingSelection'
-                output = "Pilih topping atau langsung 'Checkout'."
+                event = events.CHOOSE_TOPPING
             elif input_symbol == 'Cancel':
-                output = "Pesanan dibatalkan."
+                event = events.ORDER_CANCELLED
                 self.reset()
             else:
-                output = "Input tidak valid. Pilih scoop, 'Next', atau 'Cancel'."
+                event = events.INVALID_SCOOP_INPUT
 
         # PERBAIKAN: Logika untuk state 'ToppingSelection'
         elif state == 'ToppingSelection':
             if self.item_types.get(input_symbol) == 'topping':
-                self.selected_items.append(input_symbol)
-                self.total_price += self.menu_prices[input_symbol]
-                output = f"'{input_symbol}' ditambahkan. Total: Rp {self.total_price}."
+                self._add_item(input_symbol)
+                event = events.ItemAdded(input_symbol, self.total_price, False)
             elif input_symbol == 'Checkout':
-                if not self.selected_items:
-                    output = "Keranjang kosong. Pesanan dibatalkan."
+                if not self.cart.filled:
+                    event = events.EMPTY_CART_CANCELLED
                     self.reset()
                 else:
                     self.current_state = 'WaitingForPayment'
-                    output = f"Pesanan dikonfirmasi. Total: Rp {self.total_price}. Silakan masukkan uang."
+                    event = events.OrderConfirmed(self.total_price)
             elif input_symbol == 'Cancel':
-                output = "Pesanan dibatalkan."
+                event = events.ORDER_CANCELLED
                 self.reset()
             else:
-                output = "Input tidak valid. Pilih topping, 'Checkout', atau 'Cancel'."
+                event = events.INVALID_TOPPING_INPUT
 
         # PERBAIKAN: Logika untuk state 'WaitingForPayment'
         elif state == 'WaitingForPayment':
-            if isinstance(input_symbol, int):
+            if isinstance(input_symbol, int) and self.inventory is not None and \
+                    not self.inventory.can_accept(input_symbol, self.money_inserted, self.total_price):
+                event = events.PaymentRejected(input_symbol)
+            elif isinstance(input_symbol, int):
+                if self.inventory is not None:
+                    self.inventory.hold(input_symbol)
                 self.money_inserted += input_symbol
-                output = f"Uang Rp {input_symbol} diterima. Total dimasukkan: Rp {self.money_inserted}."
                 if self.money_inserted >= self.total_price:
                     self.current_state = 'DispensingItem'
-                    output += "\nPembayaran cukup. Memproses pesanan..."
-                else:
-                    needed = self.total_price - self.money_inserted
-                    output += f" Masih kurang Rp {needed}."
+                event = events.PaymentReceived(input_symbol, self.money_inserted, self.total_price)
             elif input_symbol == 'Cancel':
                 self.change_to_return = self.money_inserted
+                if self.inventory is not None:
+                    self.change_bills = self.inventory.release()
                 self.current_state = 'ReturningChange' # Langsung ke state pengembalian
-                output = f"Pembayaran dibatalkan. Uang Anda sebesar Rp {self.change_to_return} dikembalikan."
+                event = events.PaymentCancelled(self.change_to_return)
 
         # PERBAIKAN: Logika untuk state 'DispensingItem' (transisi otomatis)
         if state == 'DispensingItem':
             self.change_to_return = self.money_inserted - self.total_price
+            if self.inventory is not None:
+                self.change_bills = self.inventory.settle(self.change_to_return)
             self.current_state = 'ReturningChange' # Langsung ke state pengembalian
-            items_str = ", ".join(self.selected_items)
-            output = f"Mengeluarkan [{items_str}].\n"
-            if self.change_to_return > 0:
-                output += f"Silakan ambil kembalian Anda: Rp {self.change_to_return}.\nTerima Kasih"
-            else:
-                output += "Tidak ada kembalian."
-        
-        return output
\ No newline at end of file
+            event = events.Dispensed(self.cart.products, tuple(self.cart.counts), self.total_price, self.money_inserted, self.change_to_return)
+
+        return event
@@ -0,0 +1,170 @@
+# virtual_grid.py
+
+import tkinter as tk
+
+import customtkinter as ctk
+
+
+class VirtualGrid(ctk.CTkFrame):
+    """
+    Grid yang bisa di-scroll untuk daftar item yang panjang. Hanya baris yang
+    terlihat (ditambah beberapa baris `overscan`) yang punya widget; widget
+    dipakai ulang saat di-scroll, sehingga jumlah widget dan waktu layout tidak
+    bergantung pada jumlah item.
+
+    make_cell(parent) membuat satu widget sel kosong; bind_cell(widget, item)
+    mengisi widget tersebut untuk item tertentu (teks, gambar, command).
+    """
+
+    def __init__(self, master, make_cell, bind_cell, columns=2, row_height=130, overscan=1,
+                 label_text=None, label_font=None, cell_padding=10, **kwargs):
+        super().__init__(master, **kwargs)
+        self.make_cell = make_cell
+        self.bind_cell = bind_cell
+        self.columns = columns
+        self.row_height = row_height
+        self.overscan = overscan
+        self.cell_padding = cell_padding
+        self.items = ()
+        self.enabled = True
+        self.stats = {'cells_created': 0, 'binds': 0, 'renders': 0}
+        self._live = {}  # indeks item -> (widget, id window canvas)
+        self._free = []
+        self._cell_width = 1
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self.label = ctk.CTkLabel(self, text=label_text or "", font=label_font)
+        if label_text is not None:
+            self.label.grid(row=0, column=0, columnspan=2, pady=(5, 0))
+        fg_color = self.cget("fg_color")
+        bg = self._apply_appearance_mode(fg_color if fg_color != "transparent" else self.cget("bg_color"))
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, bg=bg, yscrollincrement=max(1, row_height // 4))
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.bind("<Configure>", self._on_configure)
+        # Seperti CTkScrollableFrame: handler roda mouse ditambahkan (add) ke binding global,
+        # bukan menggantinya, dan hanya bereaksi jika kursor berada di atas grid ini
+        self._wheel_bindings = [(sequence, self.canvas.bind_all(sequence, self._on_wheel, add="+"))
+                                for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>")]
+
+    def configure(self, require_redraw=False, **kwargs):
+        if "label_text" in kwargs:
+            self.label.configure(text=kwargs.pop("label_text"))
+        super().configure(require_redraw=require_redraw, **kwargs)
+
+    # --- Data ---
+
+    def set_items(self, items):
+        """Mengganti isi grid dan kembali ke posisi paling atas."""
+        self.items = tuple(items)
+        for index in list(self._live):
+            self._recycle(index)
+        rows = -(-len(self.items) // self.columns)
+        self.canvas.configure(scrollregion=(0, 0, self._cell_width * self.columns, rows * self.row_height))
+        self.canvas.yview_moveto(0)
+        self.render()
+
+    def set_enabled(self, enabled):
+        """Mengaktifkan/menonaktifkan semua sel (berlaku juga untuk sel yang dipakai ulang nanti)."""
+        if enabled == self.enabled:
+            return
+        self.enabled = enabled
+        state = "normal" if enabled else "disabled"
+        for widget, _ in self._live.values():
+            widget.configure(state=state)
+
+    def cells(self):
+        """Pasangan (item, widget) untuk sel yang sedang hidup."""
+        return [(self.items[index], widget) for index, (widget, _) in self._live.items()]
+
+    def scroll_to(self, fraction):
+        self.canvas.yview_moveto(fraction)
+        self.render()
+
+    # --- Render ---
+
+    def visible_range(self):
+        """Rentang indeks item yang perlu punya widget (baris terlihat + overscan)."""
+        if not self.items:
+            return range(0)
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.row_height)
+        first_row = max(0, int(top // self.row_height) - self.overscan)
+        last_row = int((top + height) // self.row_height) + self.overscan
+        return range(first_row * self.columns, min(len(self.items), (last_row + 1) * self.columns))
+
+    def render(self):
+        self.stats['renders'] += 1
+        needed = self.visible_range()
+        for index in [i for i in self._live if i not in needed]:
+            self._recycle(index)
+        pad = self.cell_padding
+        for index in needed:
+            if index in self._live:
+                continue
+            widget, window = self._acquire()
+            self.bind_cell(widget, self.items[index])
+            self.stats['binds'] += 1
+            row, col = divmod(index, self.columns)
+            self.canvas.coords(window, col * self._cell_width + pad, row * self.row_height + pad)
+            self.canvas.itemconfigure(window, state="normal")
+            self._live[index] = (widget, window)
+
+    def _acquire(self):
+        if self._free:
+            widget, window = self._free.pop()
+        else:
+            widget = self.make_cell(self.canvas)
+            window = self.canvas.create_window(0, 0, window=widget, anchor="nw", state="hidden",
+                                               width=max(1, self._cell_width - 2 * self.cell_padding),
+                                               height=self.row_height - 2 * self.cell_padding)
+            self.stats['cells_created'] += 1
+        widget.configure(state="normal" if self.enabled else "disabled")
+        return widget, window
+
+    def _recycle(self, index):
+        widget, window = self._live.pop(index)
+        self.canvas.itemconfigure(window, state="hidden")
+        self._free.append((widget, window))
+
+    def _on_configure(self, event):
+        cell_width = max(1, event.width // self.columns)
+        if cell_width != self._cell_width:
+            self._cell_width = cell_width
+            pad = self.cell_padding
+            for index, (_, window) in self._live.items():
+                row, col = divmod(index, self.columns)
+                self.canvas.coords(window, col * cell_width + pad, row * self.row_height + pad)
+            for _, window in list(self._live.values()) + self._free:
+                self.canvas.itemconfigure(window, width=max(1, cell_width - 2 * pad))
+            rows = -(-len(self.items) // self.columns)
+            self.canvas.configure(scrollregion=(0, 0, cell_width * self.columns, rows * self.row_height))
+        self.render()
+
+    # --- Scroll ---
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def _on_wheel(self, event):
+        path, canvas = str(event.widget), str(self.canvas)
+        if path != canvas and not path.startswith(canvas + "."):
+            return  # roda mouse di atas widget lain (mis. CTkScrollableFrame di sebelahnya)
+        if event.num == 4 or event.delta > 0:
+            self._yview("scroll", -1, "units")
+        elif event.num == 5 or event.delta < 0:
+            self._yview("scroll", 1, "units")
+
+    def destroy(self):
+        # Hanya handler milik grid ini yang dilepas; handler global lain (customtkinter) tetap ada
+        for sequence, funcid in self._wheel_bindings:
+            script = self.tk.call("bind", "all", sequence)
+            kept = "\n".join(line for line in script.split("\n") if funcid not in line)
+            self.tk.call("bind", "all", sequence, kept)
+        self._wheel_bindings = []
+        super().destroy()